@@ -0,0 +1,235 @@
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from Model import Workshop, Exhibition, Attendee, Ticket, Config, SalesStats, ExhibitionRegistry
+from Storage import DataManager
+from Service import ConferenceService
+from Database import SQLiteDataManager, import_pickles
+
+# =============================================================================
+#                                 BENCHMARK
+# =============================================================================
+# Times the service operations behind the GUI on a synthetic conference of a chosen size.
+# Runs headless (no tkinter) and prints the results as JSON, so runs of different versions can be compared:
+#
+#     python Benchmark.py --attendees 100000 --workshops 1000 --exhibitions 50 --output before.json
+#
+# With --group-commit every write is fsynced and "booking_burst" measures durable bookings per second
+# for one client at a time and for --threads clients at once (as concurrent requests reach Server.py).
+
+
+def build_conference(data_dir, n_attendees, n_workshops, n_exhibitions, seed=1):
+    """
+    Writes a synthetic conference into 'data_dir': exhibitions, workshops and attendees, where about
+    two thirds of the attendees hold a ticket (bought over the last 30 days) and one or two reservations.
+    Every attendee's password equals their email.
+    """
+    rng = random.Random(seed)  # Fixed seed so every run builds the same data
+    today = datetime.date.today()
+
+    exhibitions = ExhibitionRegistry(
+        [Exhibition(f"Exhibition {i}", f"Synthetic exhibition number {i}") for i in range(n_exhibitions)])
+    names = [e.name for e in exhibitions]
+    workshops = [Workshop(101 + i, f"Workshop {i}", "10:00 AM", n_attendees + 1000, names[i % n_exhibitions])
+                 for i in range(n_workshops)]  # Capacity large enough that the benchmark never fills one up
+
+    attendees = []
+    for i in range(n_attendees):
+        email = f"user{i}@bench.test"
+        a = Attendee(f"User {i}", email, email, f"05{i:08d}")
+        if i % 3:  # Two out of three attendees bought a ticket
+            if i % 2:
+                a.ticket = Ticket("All-Access", 250, all_access=True, ticket_id=Ticket.make_id("All-Access", i))
+            else:
+                a.ticket = Ticket("Exhibition Pass", 100, 1 << rng.randrange(n_exhibitions),
+                                  ticket_id=Ticket.make_id("Exhibition Pass", i))  # A single exhibition
+            a.ticket.purchase_date = today - datetime.timedelta(days=rng.randrange(30))
+            in_scope = [w for w in rng.sample(workshops, min(4, n_workshops))
+                        if a.ticket.allows(exhibitions.bit(w.exhibition_name))]
+            for w in in_scope[:2]:  # Book up to two sessions covered by the ticket
+                w.booked += 1
+                a.add_reservation(w.w_id)
+        attendees.append(a)
+
+    dm = DataManager(data_dir=data_dir)
+    dm.save("config", Config())
+    dm.save("exhibitions", exhibitions)
+    dm.save("workshops", workshops)
+    dm.save("attendees", attendees)
+    dm.save("stats", SalesStats.from_data(attendees, workshops))
+
+
+def time_calls(fn, calls):
+    """Runs fn(*args) for every argument tuple in 'calls' and summarizes the per-call times in microseconds."""
+    times = []
+    for args in calls:
+        started = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - started) * 1e6)
+    if not times:
+        return {"calls": 0}
+    times.sort()
+    return {
+        "calls": len(times),
+        "total_s": round(sum(times) / 1e6, 6),
+        "mean_us": round(statistics.fmean(times), 2),
+        "p50_us": round(times[len(times) // 2], 2),
+        "p95_us": round(times[min(len(times) - 1, int(len(times) * 0.95))], 2),
+        "max_us": round(times[-1], 2),
+    }
+
+
+def time_once(fn):
+    started = time.perf_counter()
+    fn()
+    return {"calls": 1, "total_s": round(time.perf_counter() - started, 6)}
+
+
+def booking_burst(service, bookings, clients):
+    """
+    Reserves and then cancels every (user, w_id) in 'bookings' from 'clients' concurrent threads.
+    As in Server.py the operations run on one service thread and each client waits until its change is
+    on disk before sending the next one. Returns the durable operations per second.
+    """
+    service_thread = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def client(ops):
+        for op, args in ops:
+            service_thread.submit(op, *args).result()
+            service.dm.sync()  # Acknowledged only once committed
+
+    ops = [(service.reserve_workshop, b) for b in bookings] + [(service.cancel_workshop, b) for b in bookings]
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client, [ops[i::clients] for i in range(clients)]))
+    elapsed = time.perf_counter() - started
+    service_thread.shutdown()
+    return {"clients": clients, "calls": len(ops), "total_s": round(elapsed, 6), "ops_per_s": round(len(ops) / elapsed, 1)}
+
+
+def memory_per_attendee(dm):
+    """Bytes allocated per attendee (with ticket and reservations) when the attendee list is loaded."""
+    tracemalloc.start()
+    attendees = dm.load("attendees", [])
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return round(used / max(len(attendees), 1), 1)
+
+
+def run(n_attendees, n_workshops, n_exhibitions, ops, write_behind=True, seed=1, sqlite=False, group_commit=False,
+        threads=32):
+    """
+    Builds a conference in a temporary folder, runs every benchmark on it and returns the results dictionary.
+    """
+    data_dir = tempfile.mkdtemp(prefix="greenwave-bench-")
+    try:
+        results = {}
+        results["build_data"] = time_once(
+            lambda: build_conference(data_dir, n_attendees, n_workshops, n_exhibitions, seed))
+
+        if sqlite:  # Move the generated pickle files into a database
+            results["import_sqlite"] = time_once(lambda: import_pickles(data_dir).close())
+
+        # Same storage set-up as the application
+        started = time.perf_counter()
+        if sqlite:
+            service = ConferenceService(SQLiteDataManager(data_dir=data_dir))
+        else:
+            service = ConferenceService(DataManager(journal=True, write_behind=write_behind, data_dir=data_dir,
+                                                    group_commit=group_commit))
+        results["service_start"] = {"calls": 1, "total_s": round(time.perf_counter() - started, 6)}
+
+        rng = random.Random(seed)
+        existing = [f"user{rng.randrange(n_attendees)}@bench.test" for _ in range(ops)]
+        new = [("New Attendee", f"new{i}@bench.test", "pass", "0500000000") for i in range(ops)]
+
+        results["register_user"] = time_calls(service.register_user, new)
+        results["login"] = time_calls(service.login, [(email, email) for email in existing])
+
+        # The newly registered attendees buy an All-Access pass, then book and cancel one session each
+        users = [service.login(email, pw) for _, email, pw, _ in new]
+        all_names = [e.name for e in service.exhibitions]
+        purchase = {'action': 'new_ticket', 'type': 'All-Access', 'price': service.config.price_all_access,
+                    'access': all_names}
+        results["process_payment"] = time_calls(service.process_payment, [(u, dict(purchase)) for u in users])
+
+        bookings = [(u, service.workshops[i % len(service.workshops)].w_id) for i, u in enumerate(users)]
+        results["reserve_workshop"] = time_calls(service.reserve_workshop, bookings)
+        results["cancel_workshop"] = time_calls(service.cancel_workshop, bookings)
+        if group_commit:  # The same bookings again, one client at a time (one fsync each) and all at once
+            single = booking_burst(service, bookings, 1)
+            burst = booking_burst(service, bookings, threads)
+            results["booking_burst"] = {"single_client": single, "concurrent": burst,
+                                        "speedup": round(burst["ops_per_s"] / single["ops_per_s"], 2)}
+
+        # Admin pages
+        def dashboard():
+            stats = service.dashboard_stats()  # What AdminDashboard.update_data reads
+            return stats.tickets_sold, stats.revenue, stats.load_percent()
+
+        today = datetime.date.today()
+        results["dashboard_stats"] = time_calls(dashboard, [()] * ops)
+        results["sales_report_day"] = time_calls(service.sales_report, [(today,)] * min(ops, 100))
+        results["sales_report_30_days"] = time_calls(
+            service.sales_report, [(today - datetime.timedelta(days=29), today)] * min(ops, 100))
+
+        # Storage
+        service.dm.close()  # Drain the write-behind queue before timing full saves and loads
+        dm = SQLiteDataManager(data_dir=data_dir) if sqlite else DataManager(data_dir=data_dir)
+        results["save_attendees"] = time_once(lambda: dm.save("attendees", service.attendees))
+        results["load_attendees"] = time_once(lambda: dm.load("attendees", []))
+        results["save_workshops"] = time_once(lambda: dm.save("workshops", service.workshops))
+        results["load_workshops"] = time_once(lambda: dm.load("workshops", []))
+        results["memory_per_attendee_bytes"] = memory_per_attendee(dm)
+        if sqlite:
+            dm.close()
+            results["database_bytes"] = os.path.getsize(dm.path)
+        else:
+            results["attendees_file_bytes"] = sum(os.path.getsize(p) for p in dm.paths("attendees"))  # All shards
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the GreenWave service operations.")
+    parser.add_argument("--attendees", type=int, default=10000, help="number of synthetic attendees")
+    parser.add_argument("--workshops", type=int, default=100, help="number of synthetic workshops")
+    parser.add_argument("--exhibitions", type=int, default=10, help="number of synthetic exhibitions")
+    parser.add_argument("--ops", type=int, default=1000, help="calls per timed operation")
+    parser.add_argument("--sync", action="store_true", help="write to disk on the calling thread (no write-behind)")
+    parser.add_argument("--sqlite", action="store_true", help="store the data in SQLite instead of pickle files")
+    parser.add_argument("--group-commit", action="store_true", help="fsync every write, in groups (adds booking_burst)")
+    parser.add_argument("--threads", type=int, default=32, help="concurrent clients for booking_burst")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the synthetic data")
+    parser.add_argument("--label", default="", help="free text stored with the results (e.g. a version)")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "label": args.label,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"attendees": args.attendees, "workshops": args.workshops, "exhibitions": args.exhibitions,
+                   "ops": args.ops, "write_behind": not args.sync, "sqlite": args.sqlite, "seed": args.seed,
+                   "group_commit": args.group_commit, "threads": args.threads},
+        "results": run(args.attendees, args.workshops, args.exhibitions, args.ops, not args.sync, args.seed,
+                       args.sqlite, args.group_commit, args.threads),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
@@ -0,0 +1,253 @@
+import bisect
+import contextlib
+import math
+import mmap
+import os
+import struct
+from collections import namedtuple
+from Model import DaySales, Ticket
+from Storage import FileLock
+
+# =============================================================================
+#                              COLUMNAR TICKET STORE
+# =============================================================================
+# The ticket data the admin reports need (purchase date, price, type and ID) kept in one memory-mapped
+# file as fixed-width columns, one row per ticket in purchase order:
+#
+#     header | price (float64) | date ordinal (uint32) | ID number (uint32) | type code (uint8) | ID code (uint8)
+#
+# Reports find the rows of a date range with a binary search on the date column and add up the price
+# and type columns slice by slice, so they never touch the Attendee objects and the memory they use does
+# not grow with the number of tickets (the operating system pages the file in and out).
+# The file is derived data in native byte order: when it is missing or does not match the saved totals,
+# ConferenceService rebuilds it from the attendees.
+# When several processes share the data folder (Main.py --shared) every access happens under a file lock,
+# and the file is mapped only for that access: each one sees the rows (and the size) other kiosks left,
+# and no other process holds a mapping while the file is grown or replaced (which Windows would refuse).
+
+TicketRow = namedtuple("TicketRow", "ticket_id ticket_type price")  # One line of the report log
+
+TYPES = ("Exhibition Pass", "All-Access")  # Type code -> ticket type
+ID_CODES = ("EXH", "ALL")  # ID code -> prefix of the ticket ID
+
+_MAGIC = b"GWTC"
+_HEADER = struct.Struct("=4sHHII")  # Magic, version, flags, rows, capacity
+_SORTED = 1  # Flag: the date column never decreases, so date ranges can be found by binary search
+_COLUMNS = (("prices", "d", 8), ("ordinals", "I", 4), ("numbers", "I", 4), ("types", "B", 1), ("codes", "B", 1))
+_HEADER_SIZE = 32  # Header padded so the price column is 8-byte aligned
+
+
+class TicketColumns:
+    """
+    Memory-mapped columnar store of the sold tickets, used by the sales reports through add_ticket(),
+    on_upgrade(), day() and range().
+    """
+
+    def __init__(self, path, capacity=1024, lock_path=None):
+        self.path = path  # File holding the columns
+        self.lock_path = lock_path  # Lock file when other processes use the same file (None: this process only)
+        self._mm = None  # Current mapping (in shared mode, only during an operation)
+        with self._locked():
+            if not os.path.exists(path) or os.path.getsize(path) < _HEADER_SIZE:
+                self._create(0, max(capacity, 1), _SORTED)
+            self._map()  # Reads the header (rows, capacity)
+            if lock_path:
+                self._unmap()
+
+    def _locked(self):
+        return FileLock(self.lock_path) if self.lock_path else contextlib.nullcontext()
+
+    @contextlib.contextmanager
+    def _access(self):
+        """
+        Holds the file for one operation. In shared mode this takes the lock and maps the file until the
+        operation ends; otherwise the mapping made at construction is used.
+        """
+        if not self.lock_path:
+            yield
+            return
+        with FileLock(self.lock_path):
+            self._map()
+            try:
+                yield
+            finally:
+                self._unmap()
+
+    # --- FILE LAYOUT ---
+    def _create(self, rows, capacity, flags, columns=None):
+        """Writes a new file with room for 'capacity' rows, optionally filled with the given column bytes."""
+        temp = self.path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, 1, flags, rows, capacity).ljust(_HEADER_SIZE, b"\0"))
+            for name, _, size in _COLUMNS:
+                data = columns[name] if columns else b""
+                f.write(data)
+                f.write(b"\0" * (size * capacity - len(data)))  # Free rows
+        os.replace(temp, self.path)  # The caller has unmapped the old file (and no other process maps it)
+
+    def _map(self):
+        self._file = open(self.path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        magic, _, self.flags, self.rows, self.capacity = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a ticket column file")
+        view = memoryview(self._mm)
+        offset = _HEADER_SIZE
+        for name, code, size in _COLUMNS:  # One typed view per column
+            setattr(self, name, view[offset:offset + size * self.capacity].cast(code))
+            offset += size * self.capacity
+        view.release()
+
+    def _unmap(self):
+        for name, _, _ in _COLUMNS:
+            getattr(self, name).release()  # Views must be released before the map can be closed
+        self._mm.close()
+        self._mm = None
+        self._file.close()
+
+    def _write_header(self):
+        _HEADER.pack_into(self._mm, 0, _MAGIC, 1, self.flags, self.rows, self.capacity)
+
+    def _snapshot(self):
+        """The used part of every column as bytes."""
+        return {name: getattr(self, name)[:self.rows].tobytes() for name, _, _ in _COLUMNS}
+
+    def _grow(self):
+        columns = self._snapshot()
+        self._unmap()
+        self._create(self.rows, self.capacity * 2, self.flags, columns)  # Double the room
+        self._map()
+
+    def close(self):
+        if self._mm:  # Not mapped between operations in shared mode
+            self._mm.flush()
+            self._unmap()
+
+    # --- WRITING ---
+    def rebuild(self, tickets):
+        """Replaces the contents with 'tickets' (any order; they are stored by purchase date)."""
+        tickets = sorted(tickets, key=lambda t: t.purchase_date.toordinal())  # Stable: keeps purchase order per day
+        with self._access():
+            self._unmap()
+            self._create(0, max(len(tickets) * 2, 1024), _SORTED)
+            self._map()
+            for t in tickets:
+                self._append(t)
+            self._mm.flush()
+
+    def add_ticket(self, ticket):
+        with self._access():
+            self._append(ticket)
+
+    def _append(self, ticket):
+        type_code = self._type_code(ticket.ticket_type)  # Before anything is written
+        if self.rows == self.capacity:
+            self._grow()
+        row = self.rows
+        ordinal = ticket.purchase_date.toordinal()
+        if row and ordinal < self.ordinals[row - 1]:  # The clock went backwards: ranges need a full scan
+            self.flags &= ~_SORTED
+        self.prices[row] = ticket.price
+        self.ordinals[row] = ordinal
+        self.numbers[row] = Ticket.id_number(ticket.ticket_id)
+        self.types[row] = type_code
+        self.codes[row] = 1 if str(ticket.ticket_id).startswith("GW-ALL") else 0
+        self.rows += 1
+        self._write_header()  # Publish the row
+
+    def on_upgrade(self, ticket, price, old_type):
+        """Stores the ticket's new price and type (upgrade payments count towards the original purchase day)."""
+        with self._access():
+            row = self._find(ticket, old_type, ticket.price - price)
+            if row is not None:
+                self.prices[row] = ticket.price
+                self.types[row] = self._type_code(ticket.ticket_type)
+
+    @staticmethod
+    def _type_code(ticket_type):
+        if ticket_type not in TYPES:  # Storing it as another type would put its sales under the wrong name
+            raise ValueError(f"Unknown ticket type {ticket_type!r}")
+        return TYPES.index(ticket_type)
+
+    def _find(self, ticket, old_type, old_price):
+        """
+        Row of 'ticket' as it was before the upgrade, found by searching the ID number column for its bytes
+        (no index kept in memory). IDs can repeat (timestamp IDs of older versions; IDs without digits all
+        count as 0), so when several rows match, the one with the ticket's purchase date, old type and old
+        price is taken. If none has them all, None is returned and the columns are left alone; they no longer
+        match the saved totals then, so they are rebuilt at the next start.
+        """
+        code = 1 if str(ticket.ticket_id).startswith("GW-ALL") else 0
+        needle = struct.pack("=I", Ticket.id_number(ticket.ticket_id))
+        start = _HEADER_SIZE + 12 * self.capacity  # Offset of the ID number column
+        end = start + 4 * self.rows
+        rows = []
+        at = self._mm.find(needle, start, end)
+        while at != -1:
+            row, misaligned = divmod(at - start, 4)
+            if not misaligned and self.codes[row] == code:
+                rows.append(row)
+            at = self._mm.find(needle, at + 1, end)
+        if len(rows) < 2:
+            return rows[0] if rows else None
+        ordinal, type_code = ticket.purchase_date.toordinal(), self._type_code(old_type)
+        for row in rows:  # Rows equal in all three are interchangeable for the reports
+            if (self.ordinals[row] == ordinal and self.types[row] == type_code
+                    and math.isclose(self.prices[row], old_price)):
+                return row
+        return None
+
+    # --- REPORTS ---
+    def revenue_total(self):
+        with self._access():
+            return math.fsum(self.prices[:self.rows])  # Sum of every ticket price (compared with the saved totals)
+
+    def _rows(self, start, end):
+        """Row numbers whose purchase date lies in 'start'..'end' (inclusive), as a range or a list."""
+        first, last = start.toordinal(), end.toordinal()
+        dates = self.ordinals[:self.rows]
+        if self.flags & _SORTED:
+            return range(bisect.bisect_left(dates, first), bisect.bisect_right(dates, last))
+        return [i for i, o in enumerate(dates) if first <= o <= last]  # Unsorted file: full scan
+
+    def range(self, start, end, log=True):
+        """
+        Returns one DaySales for all purchase dates from 'start' to 'end' (inclusive). With 'log' its
+        'tickets' list holds a TicketRow per ticket; without it only the totals are computed.
+        """
+        with self._access():
+            return self._range(start, end, log)
+
+    def _range(self, start, end, log):
+        rows = self._rows(start, end)
+        sold = DaySales()
+        if isinstance(rows, range):  # Contiguous rows: work on column slices
+            lo, hi = rows.start, rows.stop
+            prices = self.prices[lo:hi]
+            types = self.types[lo:hi].tobytes()
+            revenue = math.fsum(prices)
+            for code, name in enumerate(TYPES):
+                count = types.count(code)
+                if count:
+                    sold.type_counts[name] = count
+        else:
+            prices = [self.prices[i] for i in rows]
+            revenue = math.fsum(prices)
+            for i in rows:
+                name = TYPES[self.types[i]]
+                sold.type_counts[name] = sold.count(name) + 1
+        sold.revenue = int(revenue) if revenue.is_integer() else revenue
+        if log:
+            sold.tickets = [TicketRow(f"GW-{ID_CODES[self.codes[i]]}-{self.numbers[i]:04d}", TYPES[self.types[i]],
+                                      self._price(self.prices[i])) for i in rows]
+        else:
+            sold.tickets = range(len(rows))  # Only its length is meaningful
+        return sold
+
+    def day(self, date, log=True):
+        sold = self.range(date, date, log)
+        return sold if len(sold.tickets) else None  # None when nothing was sold that day
+
+    @staticmethod
+    def _price(value):
+        return int(value) if value.is_integer() else value  # Whole amounts print without ".0", as before
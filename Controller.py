@@ -3,8 +3,11 @@ from tkinter import messagebox, ttk
 import pickle
 import os
 import datetime
+import time
 from view import StartPage, RegisterPage, LoginPage, AttendeeDashboard,PurchasePassPage, PaymentPage, ManageWorkshopsPage, HistoryPage,UpdateProfilePage, UpgradeTicketPage,AdminDashboard, AdminSalesPage, AdminPricingPage,AdminExhibitionsPage, AdminWorkshopsPage, AdminUserUpgradePage
-from Model import Workshop, DataManager, Exhibition, Admin, Attendee,Ticket, Config
+from Model import Admin
+from Storage import DataManager, FormatError
+from Service import ConferenceService
 
 # =============================================================================
 #                                 CONTROLLER
@@ -17,28 +20,28 @@ class GreenWaveApp(tk.Tk):
     interaction between the Data Model and the View (GUI pages).
     """
 
-    def __init__(self):
+    def __init__(self, lazy_pages=True, prewarm=False, lazy_load=True, dm=None):
+        started = time.perf_counter()  # Start the startup-time measurement
         super().__init__()  # Initialize the parent Tkinter window class
         self.title("GreenWave Conference 2026")  # Set the main window title text
         self.geometry("800x600")  # Set the default dimensions of the application window
 
-        self.dm = DataManager()  # Create an instance of DataManager to handle file I/O operations
-
-        # Load Data
-        self.config = self.dm.load("config", Config())  # Load global settings or create a new Config object if missing
-        self.exhibitions = self.dm.load("exhibitions", [])  # Load the list of exhibitions or start with an empty list
-        self.workshops = self.dm.load("workshops", [])  # Load the list of workshops or start with an empty list
-        self.attendees = self.dm.load("attendees",
-                                      [])  # Load the list of registered attendees or start with an empty list
-
-        # --- DATA REPAIR (Fixes your crash) ---
-        # Checks if loaded exhibitions are missing 'description' (from old save)
-        if self.exhibitions and (
-        not hasattr(self.exhibitions[0], 'description')):  # Detect if data structure is outdated
-            print("Detected old data format. Resetting Exhibitions to defaults...")  # Log a warning to the console
-            self.create_defaults()  # Reset the exhibition data to default values to prevent errors
-        elif not self.exhibitions:  # Check if the exhibition list is completely empty (first run)
-            self.create_defaults()  # Populate the system with initial default data
+        self.protocol("WM_DELETE_WINDOW", self.on_close)  # Flush pending writes before the window closes
+
+        # All data and business logic live in the headless service; this class only handles the window,
+        # navigation and the current session. The attendee file is read on a background thread while the
+        # Start Page is shown (lazy_load), and anything that needs it waits for it inside the service.
+        # 'dm' selects the storage backend (e.g. SQLiteDataManager); the pickle files are the default.
+        if dm is None:
+            dm = DataManager(journal=True, write_behind=True)  # Journal single-record changes; write on a background thread
+        try:
+            self.service = ConferenceService(dm, background_load=lazy_load)
+        except FormatError as e:  # e.g. pickle files of an older version (the message names ConvertData.py)
+            self.withdraw()  # No empty window behind the dialog
+            messagebox.showerror("Data Error", f"The data files could not be loaded:\n\n{e}\n\n"
+                                               f"The application will now close.")
+            self.destroy()
+            raise SystemExit(1)
 
         self.current_user = None  # Initialize the current user session as None (logged out state)
         self.temp_transaction_data = {}  # Initialize a dictionary to temporarily store payment details during checkout
@@ -49,14 +52,69 @@ class GreenWaveApp(tk.Tk):
         self.container.grid_rowconfigure(0, weight=1)  # Configure the grid system to expand vertically
         self.container.grid_columnconfigure(0, weight=1)  # Configure the grid system to expand horizontally
 
-        self.frames = {}  # Initialize a dictionary to store references to all page instances
-        self.register_frames()  # Call the helper method to instantiate and stack all GUI pages
+        self.frames = {}  # Initialize a dictionary to store references to the page instances built so far
+        self.register_frames(lazy_pages)  # Register the GUI pages (built on first use when lazy_pages is True)
         self.show_frame("StartPage")  # Display the initial Start Page to the user
-
-    def register_frames(self):
-        """
-        Instantiates all UI page classes and stores them in the frames dictionary.
-        This sets up the navigation stack so pages can be brought to the front instantly.
+        self.startup_seconds = time.perf_counter() - started  # Time from construction to the first page being ready
+
+        if prewarm:  # Optionally build the remaining pages in the background while the user reads the Start Page
+            self.after_idle(self.prewarm_frames)
+        self._poll_attendee_load()  # Show the loading progress on the Start Page until the attendees are ready
+
+    # --- SERVICE DATA ---
+    # The pages read the data through the controller, so expose the service's data under the old names.
+    @property
+    def dm(self):
+        return self.service.dm
+
+    @property
+    def config(self):
+        return self.service.config
+
+    @property
+    def exhibitions(self):
+        return self.service.exhibitions
+
+    @property
+    def workshops(self):
+        return self.service.workshops
+
+    @property
+    def attendees(self):
+        return self.service.attendees  # Waits for the background loader the first time it is needed
+
+    @property
+    def stats(self):
+        return self.service.dashboard_stats()  # Includes the sales of other kiosks sharing the data folder
+
+    @property
+    def sales(self):
+        return self.service.sales
+
+    def _poll_attendee_load(self):
+        """
+        Periodically updates the Start Page with the loading progress and finishes the load on the main thread.
+        """
+        start = self.frames.get("StartPage")  # The page showing the progress (if built)
+        if self.service.is_loading():  # Still reading
+            if start:
+                start.show_load_progress(self.service.load_progress, False)
+            self.after(100, self._poll_attendee_load)  # Check again shortly
+            return
+        try:
+            self.service.wait_for_attendees()  # Reading finished: build the registry and indexes now
+        except Exception as e:  # e.g. a damaged attendee file: nothing can work without the attendees
+            messagebox.showerror("Data Error", f"The attendee data could not be loaded:\n\n{e}\n\n"
+                                               f"The application will now close.")
+            self.on_close()
+            return
+        if start:
+            start.show_load_progress(100, True)
+
+    def register_frames(self, lazy=True):
+        """
+        Registers all UI page classes so get_frame() can build them on first use.
+        With lazy=False every page is instantiated up front (the original behaviour).
         """
         # List of all page classes
         pages = (StartPage, RegisterPage, LoginPage, AttendeeDashboard,
@@ -65,86 +123,80 @@ class GreenWaveApp(tk.Tk):
                  AdminDashboard, AdminSalesPage, AdminPricingPage,
                  AdminExhibitionsPage, AdminWorkshopsPage, AdminUserUpgradePage)  # Tuple containing all View classes
 
-        for F in pages:  # Iterate through every page class in the tuple
-            page_name = F.__name__  # Extract the class name string (e.g., "StartPage")
+        self.page_classes = {F.__name__: F for F in pages}  # Map each class name string (e.g., "StartPage") to its class
+        if not lazy:
+            for page_name in self.page_classes:  # Build every page immediately
+                self.get_frame(page_name)
+
+    def get_frame(self, page_name):
+        """
+        Returns the page instance for 'page_name', building and caching it the first time it is requested.
+        """
+        frame = self.frames.get(page_name)  # Check the cache of pages built so far
+        if frame is None:
+            F = self.page_classes[page_name]  # Look up the page class
             frame = F(parent=self.container, controller=self)  # Create an instance of the page, passing the controller
             self.frames[page_name] = frame  # Store the created instance in the dictionary using its name as the key
             frame.grid(row=0, column=0,
                        sticky="nsew")  # Place the frame in the grid; all frames stack on top of each other
+        return frame
 
-    def create_defaults(self):
-        """
-        Populates the application with initial seed data.
-        This is run only if the data files are missing or corrupted.
-        """
-        # Default Exhibitions
-        self.exhibitions = [  # Define a list of hardcoded Exhibition objects for the initial setup
-            Exhibition("Climate Tech Innovations",
-                       "Workshops: Intro to Data (10:30), Renewable Energy (12:30), Smart Agri (14:30)"),
-            Exhibition("Green Policy & Governance",
-                       "Workshops: Policy Sim (09:30), Reporting 101 (12:00), Corp Strategy (14:00)"),
-            Exhibition("Community Action & Impact",
-                       "Workshops: Low-Carbon (12:30), Waste Reduction (14:00), Circular Econ (15:30)")
-        ]
-        # Default Workshops
-        self.workshops = [  # Define a list of hardcoded Workshop objects linked to the exhibitions
-            Workshop(101, "Intro to Climate Data Tools", "10:30 AM", 50, "Climate Tech Innovations"),
-            Workshop(102, "Renewable Energy Systems", "12:30 PM", 50, "Climate Tech Innovations"),
-            Workshop(201, "Policy Simulation Lab", "09:30 AM", 50, "Green Policy & Governance"),
-            Workshop(301, "Building Low-Carbon Communities", "12:30 PM", 50, "Community Action & Impact"),
-            Workshop(302, "Circular Economy", "03:30 PM", 50, "Community Action & Impact")
-        ]
-        self.dm.save("exhibitions", self.exhibitions)  # Save the newly created exhibition list to disk
-        self.dm.save("workshops", self.workshops)  # Save the newly created workshop list to disk
+    def prewarm_frames(self):
+        """
+        Builds one not-yet-created page per idle callback, so the UI stays responsive while pages are pre-built.
+        """
+        remaining = [name for name in self.page_classes if name not in self.frames]  # Pages not built yet
+        if remaining:
+            self.get_frame(remaining[0]).lower()  # Build the next page and keep it under the visible one
+            self.after_idle(self.prewarm_frames)  # Continue with the next page when the event loop is idle again
+
+    def on_close(self):
+        """
+        Called when the window is closed: waits for the background writer to finish, then exits.
+        A change the writer could not save is reported before the window goes away.
+        """
+        try:
+            self.dm.close()  # Write everything still queued to disk
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Some changes could not be saved to disk:\n\n{e}\n\n"
+                                               f"Check the data folder before starting the application again.")
+        self.destroy()  # Close the window and end the main loop
 
     def show_frame(self, page_name):
         """
         Navigates to a specific page by bringing its frame to the top of the stack.
         Also calls the page's update_data() method if it exists to refresh content.
         """
-        frame = self.frames[page_name]  # Retrieve the requested page instance from the frames dictionary
+        frame = self.get_frame(page_name)  # Retrieve (or build on first use) the requested page instance
         frame.tkraise()  # Raise the selected frame to the top of the visual stack (making it visible)
         if hasattr(frame, "update_data"):  # Check if the page class has an 'update_data' method defined
             frame.update_data()  # Call the method to refresh dynamic data (like username or ticket status)
 
     # --- LOGIC ---
+    # Thin wrappers that pass the current session to the service and handle navigation.
     def register_user(self, name, email, password, phone):
         """
         Registers a new attendee in the system.
         Returns True if successful, or False if the email is already taken.
+        Raises ValueError with the message to show if a field is invalid.
         """
-        # LOGIC FIX: Normalize email to lowercase
-        email_clean = email.strip().lower()  # Remove whitespace and convert email to lowercase for consistent comparisons
-
-        if any(u.email == email_clean for u in
-               self.attendees):  # Iterate through attendees to check for duplicate email
-            return False  # Return False to indicate registration failure due to duplicate email
-
-        self.attendees.append(
-            Attendee(name, email_clean, password, phone))  # Create a new Attendee object and add to list
-        self.dm.save("attendees", self.attendees)  # Save the updated list of attendees to the file system
-        return True  # Return True to indicate successful registration
+        return self.service.register_user(name, email, password, phone)
 
     def login(self, email, password):
         """
         Authenticates a user against the stored records.
         Supports both Admin (hardcoded) and standard Attendee logins.
         """
-        # LOGIC FIX: Normalize email to lowercase
-        email_clean = email.strip().lower()  # Clean the input email for consistent matching
-
-        # Admin check (hardcoded)
-        if email_clean == "admin" and password == "admin123":  # specific check for the hardcoded admin credentials
-            self.current_user = Admin()  # Instantiate an Admin object and set it as the current user
-            self.show_frame("AdminDashboard")  # Navigate the user to the Admin Dashboard
-            return True  # Return True to indicate successful login
+        user = self.service.login(email, password)  # Check the credentials
+        if user is None:
+            return False  # Return False if no matching credentials were found
 
-        for u in self.attendees:  # Iterate through the list of registered attendees
-            if u.email == email_clean and u.password == password:  # Check if the email and password match a record
-                self.current_user = u  # Set the matched attendee object as the current session user
-                self.show_frame("AttendeeDashboard")  # Navigate the user to the Attendee Dashboard
-                return True  # Return True to indicate successful login
-        return False  # Return False if no matching credentials were found
+        self.current_user = user  # Set the user as the current session user
+        if isinstance(user, Admin):  # Navigate to the dashboard matching the role
+            self.show_frame("AdminDashboard")
+        else:
+            self.show_frame("AttendeeDashboard")
+        return True  # Return True to indicate successful login
 
     def logout(self):
         """
@@ -156,79 +208,19 @@ class GreenWaveApp(tk.Tk):
 
     def process_payment(self):
         """
-        Finalizes a transaction based on data in 'temp_transaction_data'.
-        Handles both creating new tickets and upgrading existing ones.
+        Finalizes the transaction stored in 'temp_transaction_data' for the current user.
+        Raises ValueError with the message to show if the transaction can no longer be made.
         """
-        # Apply the transaction stored in temp_transaction_data
-        data = self.temp_transaction_data  # Retrieve the temporary payment details set by the purchase page
-        user = self.current_user  # Get the currently logged-in user object
-
-        if data['action'] == 'new_ticket':  # Check if the transaction is for buying a fresh ticket
-            user.ticket = Ticket(data['type'], data['price'],
-                                 data['access'])  # Create a new Ticket object and assign it
-
-        elif data['action'] == 'upgrade':  # Check if the transaction is for upgrading an existing ticket
-            # Update existing ticket
-            if data['upgrade_type'] == 'all_access':  # If upgrading to the premium All-Access tier
-                user.ticket.ticket_type = "All-Access"  # Update the ticket type string description
-                # Add all exhibitions that aren't already there
-                all_names = [e.name for e in self.exhibitions]  # Generate a list of all exhibition names in the system
-                user.ticket.exhibitions_allowed = all_names  # Grant access to all exhibitions
-            elif data['upgrade_type'] == 'add_exh':  # If upgrading by adding a single exhibition
-                user.ticket.exhibitions_allowed.append(data['new_exh'])  # Append the new exhibition name to the list
-
-            # Update price paid tracker if needed (simplification: just updating object)
-            user.ticket.price += data['price']  # Add the upgrade cost to the total price tracked on the ticket
-
-        self.dm.save("attendees", self.attendees)  # Save the updated user (and their ticket) to the file system
-        return True  # Return True to indicate the payment logic completed successfully
+        return self.service.process_payment(self.current_user, self.temp_transaction_data)
 
     def reserve_workshop(self, w_id):
         """
-        Attempts to reserve a workshop seat for the current user.
-        Performs validation checks for existence, capacity, duplication, and ticket scope.
+        Attempts to reserve a workshop seat for the current user. Returns the service's status string.
         """
-        ws = next((w for w in self.workshops if w.w_id == w_id), None)  # Search for the workshop object by its ID
-        u = self.current_user  # Get the currently logged-in user
-
-        if not ws or not u.ticket: return "Error"  # Fail if workshop doesn't exist or user has no ticket
-        if ws.is_full(): return "Workshop Full"  # Fail if the workshop has reached maximum capacity
-        if any(r.w_id == w_id for r in u.reservations): return "Already Booked"  # Fail if user already reserved this
-        if ws.exhibition_name not in u.ticket.exhibitions_allowed: return "Invalid Pass Scope"  # Fail if ticket doesn't cover this topic
-
-        ws.booked += 1  # Increment the booking counter on the workshop object
-        u.reservations.append(ws)  # Add the workshop object to the user's list of reservations
-        self.dm.save("workshops", self.workshops)  # Save the updated workshop data (booking count)
-        self.dm.save("attendees", self.attendees)  # Save the updated attendee data (reservation list)
-        return "Success"  # Return success string
+        return self.service.reserve_workshop(self.current_user, w_id)
 
     def cancel_workshop(self, w_id):
         """
-        Cancels a user's reservation for a specific workshop.
-        Restores the workshop capacity by decrementing the 'booked' count.
+        Cancels the current user's reservation for a specific workshop.
         """
-        u = self.current_user  # Get current logged-in user
-        ws = next((w for w in self.workshops if w.w_id == w_id), None)  # Find the workshop object by ID
-
-        # Safety Check: Ensure workshop and user exist
-        if not ws or not u:
-            return False
-
-        # Find the specific reservation in the user's list
-        found_index = -1
-        for i, res in enumerate(u.reservations):
-            if res.w_id == w_id:
-                found_index = i
-                break
-
-        # If reservation found, remove it
-        if found_index != -1:
-            u.reservations.pop(found_index)  # Remove from User's reservation list
-            ws.booked -= 1  # Decrease the 'booked' count on the Workshop object
-
-            # Save the changes to files immediately
-            self.dm.save("workshops", self.workshops)
-            self.dm.save("attendees", self.attendees)
-            return True  # Return success
-
-        return False  # Return failure (reservation not found)
+        return self.service.cancel_workshop(self.current_user, w_id)
@@ -0,0 +1,133 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from Storage import DataManager, BINARY_CODECS
+from Benchmark import build_conference
+
+# =============================================================================
+#                               DATA CONVERTER
+# =============================================================================
+# Rewrites the data files of a data folder in the binary record format or in pickle, and checks that
+# every record reads back unchanged:
+#
+#     python ConvertData.py --to pickle
+#     python ConvertData.py --to binary --data-dir kiosk1
+#
+# The application does not unpickle data files, since a planted pickle can run code; files written with
+# pickle (by older versions) are converted here once, from a folder you trust.
+#
+# With --compare it builds a synthetic conference instead and prints the file size and the save/load
+# times of both formats as JSON:
+#
+#     python ConvertData.py --compare --attendees 100000
+
+
+def record_state(record):
+    """The stored fields of a record (and of its ticket), for comparing two copies."""
+    state = record.__getstate__()
+    if state.get("ticket") is not None:
+        state["ticket"] = state["ticket"].__getstate__()
+    return state
+
+
+def data_state(dm, key, data):
+    """The stored contents of a data object, for comparing two copies."""
+    if isinstance(data, dict):  # ID sequences
+        return data
+    if not isinstance(data, list):  # Config, dashboard totals
+        return vars(data)
+    get_id = dm.record_ids.get(key)
+    if get_id is None:  # Exhibitions: kept in list order
+        return [record_state(r) for r in data]
+    return {get_id(r): record_state(r) for r in data}  # Attendees, workshops (shards reorder them)
+
+
+def convert(data_dir, binary):
+    """
+    Rewrites every data file in 'data_dir' in the chosen format (any journal is folded in).
+    Pickle files are unpickled here, so only convert folders you trust.
+    Returns True if all records read back unchanged.
+    """
+    source = DataManager(journal=True, data_dir=data_dir, read_pickle=True)  # Reads either format and replays the journals
+    target = DataManager(data_dir=data_dir, binary=binary)
+    ok = True
+    for key in BINARY_CODECS:
+        if not source.paths(key):
+            continue
+        data = source.load(key, None)
+        expected = data_state(source, key, data)
+        target.save(key, data)
+        same = data_state(target, key, target.load(key, None)) == expected  # Round trip
+        count = len(data) if isinstance(data, list) else 1
+        print(f"{key:<11}: {count} record(s) -> {'binary' if binary else 'pickle'}, "
+              f"{sum(os.path.getsize(p) for p in target.paths(key))} bytes, " + ("OK" if same else "MISMATCH"))
+        ok = ok and same
+    return ok
+
+
+def best_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return round(min(times), 6)
+
+
+def compare(n_attendees, n_workshops, n_exhibitions, seed=1, repeat=3):
+    """Saves and loads the same synthetic records in both formats and returns sizes, times and ratios."""
+    data_dir = tempfile.mkdtemp(prefix="greenwave-format-")
+    try:
+        build_conference(data_dir, n_attendees, n_workshops, n_exhibitions, seed)
+        source = DataManager(data_dir=data_dir)
+        records = {key: source.load(key, []) for key, codec in BINARY_CODECS.items() if not codec.single}  # Lists
+
+        results = {}
+        for name, binary in (("pickle", False), ("binary", True)):
+            folder = os.path.join(data_dir, name)
+            os.makedirs(folder)
+            dm = DataManager(data_dir=folder, binary=binary)
+            results[name] = {}
+            for key, data in records.items():
+                save_s = best_time(lambda: dm.save(key, data), repeat)
+                load_s = best_time(lambda: dm.load(key, []), repeat)
+                results[name][key] = {"records": len(data), "file_bytes": sum(os.path.getsize(p) for p in dm.paths(key)),
+                                      "save_s": save_s, "load_s": load_s}
+
+        results["pickle_vs_binary"] = {  # How many times larger / slower pickle is
+            key: {field: round(results["pickle"][key][field] / max(results["binary"][key][field], 1e-9), 2)
+                  for field in ("file_bytes", "save_s", "load_s")}
+            for key in records}
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the data files between pickle and the binary format.")
+    parser.add_argument("--to", choices=["binary", "pickle"], default="binary", help="format to write")
+    parser.add_argument("--data-dir", default="", help="folder holding the data files")
+    parser.add_argument("--compare", action="store_true", help="compare both formats on synthetic data")
+    parser.add_argument("--attendees", type=int, default=100000, help="synthetic attendees for --compare")
+    parser.add_argument("--workshops", type=int, default=1000, help="synthetic workshops for --compare")
+    parser.add_argument("--exhibitions", type=int, default=50, help="synthetic exhibitions for --compare")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions for --compare (best is kept)")
+    args = parser.parse_args()
+
+    if not args.compare:
+        sys.exit(0 if convert(args.data_dir, args.to == "binary") else 1)
+
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": {"attendees": args.attendees, "workshops": args.workshops, "exhibitions": args.exhibitions,
+                   "repeat": args.repeat},
+        "results": compare(args.attendees, args.workshops, args.exhibitions, repeat=args.repeat),
+    }
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,393 @@
+import os
+import sqlite3
+import sys
+import threading
+import datetime
+from Model import Workshop, Exhibition, Attendee, Ticket, SalesStats, ExhibitionRegistry
+from Storage import DataManager, BINARY_CODECS, BINARY_MAGIC, FormatError
+
+# =============================================================================
+#                                  DATABASE
+# =============================================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exhibitions (
+    name        TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    bit         INTEGER NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS workshops (
+    w_id            INTEGER NOT NULL UNIQUE,
+    title           TEXT NOT NULL,
+    time            TEXT NOT NULL,
+    capacity        INTEGER NOT NULL,
+    booked          INTEGER NOT NULL DEFAULT 0,
+    exhibition_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS workshops_exhibition ON workshops (exhibition_name);
+CREATE TABLE IF NOT EXISTS attendees (
+    email    TEXT PRIMARY KEY,
+    name     TEXT NOT NULL,
+    password TEXT NOT NULL,
+    phone    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tickets (
+    email         TEXT PRIMARY KEY REFERENCES attendees (email) ON DELETE CASCADE,
+    ticket_id     TEXT NOT NULL,
+    ticket_type   TEXT NOT NULL,
+    price,
+    purchase_date TEXT NOT NULL,
+    all_access    INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tickets_id ON tickets (ticket_id);
+CREATE INDEX IF NOT EXISTS tickets_date ON tickets (purchase_date);
+CREATE TABLE IF NOT EXISTS ticket_access (
+    email TEXT NOT NULL REFERENCES attendees (email) ON DELETE CASCADE,
+    bit   INTEGER NOT NULL,
+    PRIMARY KEY (email, bit)
+);
+CREATE INDEX IF NOT EXISTS ticket_access_bit ON ticket_access (bit);
+CREATE TABLE IF NOT EXISTS reservations (
+    email TEXT NOT NULL REFERENCES attendees (email) ON DELETE CASCADE,
+    w_id  INTEGER NOT NULL,
+    PRIMARY KEY (email, w_id)
+);
+CREATE INDEX IF NOT EXISTS reservations_workshop ON reservations (w_id);
+CREATE TABLE IF NOT EXISTS sequences (
+    name TEXT PRIMARY KEY,
+    next INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS objects (
+    key   TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+"""
+# 'price' has no declared type on purpose: SQLite then keeps ints as ints and floats as floats,
+# so prices read back exactly as they were stored (e.g. "AED 500" and not "AED 500.0").
+# A ticket's access bitmask is stored as one ticket_access row per exhibition bit, so it is not limited
+# to the 64 bits of an SQLite integer; All-Access passes only set tickets.all_access.
+# Lists are returned in insertion order (rowid); a put() of an existing record keeps its position.
+# (This is why workshops.w_id is UNIQUE and not the INTEGER PRIMARY KEY, which would replace the rowid.)
+
+
+class SQLiteDataManager:
+    """
+    Stores the application data in a single SQLite database instead of one data file per list.
+    It has the same load()/save()/put()/delete() contract as DataManager, so the service can use either:
+    save() replaces a whole list (except the workshops, see save()), while put() and delete() change only
+    the rows of one record inside a single transaction.
+    Config is a small object kept in the 'objects' table, encoded with the same binary codec as the data file
+    (never pickled, so a planted database cannot run code either). The dashboard totals are not stored: they
+    are counted from the ticket and workshop rows, so they include every kiosk's sales and bookings.
+    Several processes (kiosks) can share one database: seats are taken with a conditional UPDATE that
+    only succeeds while booked < capacity, and saving the workshop list never overwrites booking counts.
+    """
+    shared = True  # Other processes may use the same database, so files derived from it (tickets.col) are locked
+
+    def __init__(self, path="greenwave.db", data_dir=""):
+        self.data_dir = data_dir  # Folder holding the database file
+        self.path = os.path.join(data_dir, path)  # Database file name
+        self._lock = threading.Lock()  # The connection is shared with the background attendee loader
+        self.conn = sqlite3.connect(self.path, timeout=30,
+                                    check_same_thread=False)  # Wait up to 30 s for other processes' transactions
+        self.conn.execute("PRAGMA journal_mode=WAL")  # Readers do not block the writer
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # Durable at every checkpoint, fast commits
+        self.conn.execute("PRAGMA foreign_keys=ON")  # Deleting an attendee removes its ticket and bookings
+        self.conn.executescript(SCHEMA)
+
+    # --- DataManager contract ---
+    def load(self, key, default, progress=None):
+        """
+        Loads the data stored under 'key', or 'default' if there is none.
+        'progress' is an optional callback that receives the percentage (0-100) of the rows read so far.
+        """
+        with self._lock:
+            if key == "attendees":
+                data = self._load_attendees(progress)
+            elif key == "workshops":
+                data = self._load_workshops()
+            elif key == "stats":
+                data = self._totals()
+            elif key == "exhibitions":
+                data = []
+                for name, description, bit in self.conn.execute(
+                        "SELECT name, description, bit FROM exhibitions ORDER BY rowid"):
+                    e = Exhibition(name, description)
+                    e.bit = bit  # Keep the stored access bit number
+                    data.append(e)
+            else:
+                row = self.conn.execute("SELECT value FROM objects WHERE key = ?", (key,)).fetchone()
+                data = self._object(key, row[0]) if row else None
+        if progress:
+            progress(100)
+        if data is None or (isinstance(data, list) and not data):
+            return default  # Nothing stored yet (first run)
+        return data
+
+    def save(self, key, data):
+        """
+        Replaces everything stored under 'key' with 'data' in one transaction. Workshops are only inserted or
+        updated: rows other kiosks added are kept (a session is removed with delete()).
+        """
+        with self._lock, self.conn:  # Commits on success, rolls back on error
+            if key == "attendees":
+                for table in ("reservations", "ticket_access", "tickets", "attendees"):
+                    self.conn.execute(f"DELETE FROM {table}")
+                for a in data:
+                    self._insert_attendee(a)
+            elif key == "workshops":
+                self.conn.executemany(  # Existing rows keep their position and their (shared) booking count
+                    "INSERT INTO workshops VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (w_id) DO UPDATE SET "
+                    "title = excluded.title, time = excluded.time, capacity = excluded.capacity, "
+                    "exhibition_name = excluded.exhibition_name",
+                    [self._workshop_row(w) for w in data])
+                booked = dict(self.conn.execute("SELECT w_id, booked FROM workshops"))
+                for w in data:
+                    w.booked = booked[w.w_id]  # Pick up seats booked by other processes
+            elif key == "exhibitions":
+                self.conn.execute("DELETE FROM exhibitions")
+                self.conn.executemany("INSERT INTO exhibitions VALUES (?, ?, ?)",
+                                      [(e.name, e.description, e.bit) for e in data])
+            elif key == "stats":
+                pass  # Counted from the rows (see _totals), so a kiosk's copy never overwrites another's sales
+            else:
+                self._put_object(key, data)
+
+    def put(self, key, data, item):
+        """
+        Persists a single added or changed record; only its own rows are written.
+        'data' is accepted for compatibility with DataManager and is not used.
+        """
+        with self._lock, self.conn:
+            if key == "attendees":
+                self._put_attendee(item)
+            elif key == "workshops":
+                self.conn.execute(
+                    "INSERT INTO workshops VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (w_id) DO UPDATE SET "
+                    "title = excluded.title, time = excluded.time, capacity = excluded.capacity, "
+                    "booked = excluded.booked, exhibition_name = excluded.exhibition_name",
+                    self._workshop_row(item))
+            elif key == "exhibitions":
+                self.conn.execute(
+                    "INSERT INTO exhibitions VALUES (?, ?, ?) ON CONFLICT (name) DO UPDATE SET "
+                    "description = excluded.description", (item.name, item.description, item.bit))
+            else:
+                raise KeyError(f"put() is not supported for '{key}'")
+
+    def delete(self, key, data, item_id):
+        """Removes the record identified by 'item_id' (email, workshop ID or exhibition name)."""
+        tables = {"attendees": ("attendees", "email"), "workshops": ("workshops", "w_id"),
+                  "exhibitions": ("exhibitions", "name")}
+        table, column = tables[key]
+        with self._lock, self.conn:
+            self.conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (item_id,))
+
+    def refresh(self, key, data):
+        """Copies the changes other processes saved for 'key' ("workshops" or "stats") into 'data'."""
+        with self._lock:
+            if key == "workshops":
+                booked = dict(self.conn.execute("SELECT w_id, booked FROM workshops"))
+                for w in data:
+                    w.booked = booked.get(w.w_id, w.booked)  # Workshops not saved yet keep their own count
+            elif key == "stats":
+                vars(data).update(vars(self._totals()))
+
+    def allocate(self, name, count=1, start=1):
+        """
+        Reserves 'count' consecutive numbers of the named sequence and returns the first one (never below 'start').
+        The read and the update happen in one write transaction, so concurrent processes never get the same numbers.
+        """
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO sequences VALUES (?, ?)", (name, start))  # Takes the write lock
+            self.conn.execute("UPDATE sequences SET next = MAX(next, ?) + ? WHERE name = ?", (start, count, name))
+            return self.conn.execute("SELECT next FROM sequences WHERE name = ?", (name,)).fetchone()[0] - count
+
+    def reserve_seat(self, data, workshop):
+        """
+        Takes one seat of 'workshop' if it is not full. The capacity check and the increment are a single
+        conditional UPDATE, so it is atomic across processes. Returns True if a seat was taken;
+        workshop.booked is refreshed to the stored count either way.
+        """
+        with self._lock, self.conn:
+            taken = self.conn.execute("UPDATE workshops SET booked = booked + 1 WHERE w_id = ? AND booked < capacity",
+                                      (workshop.w_id,)).rowcount == 1
+            row = self.conn.execute("SELECT booked FROM workshops WHERE w_id = ?", (workshop.w_id,)).fetchone()
+        if row:
+            workshop.booked = row[0]
+        return taken
+
+    def book_seat(self, workshops, workshop, attendees, attendee, stats, apply):
+        """
+        Takes one seat of 'workshop' for 'attendee' and writes the seat and the reservation row in a single
+        transaction, so a crash never leaves a seat taken that no attendee holds ('stats' is counted from them).
+        apply() records the booking in memory once the transaction has committed. Returns True if a seat was
+        taken; workshop.booked is refreshed to the stored count either way.
+        """
+        with self._lock, self.conn:
+            taken = self.conn.execute("UPDATE workshops SET booked = booked + 1 WHERE w_id = ? AND booked < capacity",
+                                      (workshop.w_id,)).rowcount == 1
+            if taken:
+                self.conn.execute("INSERT INTO reservations VALUES (?, ?)", (attendee.email, workshop.w_id))
+            row = self.conn.execute("SELECT booked FROM workshops WHERE w_id = ?", (workshop.w_id,)).fetchone()
+        if row:
+            workshop.booked = row[0]
+        if taken:
+            apply()  # Committed: memory now matches the database
+        return taken
+
+    def cancel_seat(self, workshops, workshop, attendees, attendee, stats, apply):
+        """
+        Gives back the seat of 'workshop' that 'attendee' holds: deletes the reservation row and frees the seat
+        in a single transaction, then calls apply() to record the cancellation in memory. Returns True if the
+        database held the reservation; workshop.booked is refreshed to the stored count either way.
+        """
+        with self._lock, self.conn:
+            held = self.conn.execute("DELETE FROM reservations WHERE email = ? AND w_id = ?",
+                                     (attendee.email, workshop.w_id)).rowcount == 1
+            if held:
+                self.conn.execute("UPDATE workshops SET booked = booked - 1 WHERE w_id = ? AND booked > 0",
+                                  (workshop.w_id,))
+            row = self.conn.execute("SELECT booked FROM workshops WHERE w_id = ?", (workshop.w_id,)).fetchone()
+        if row:
+            workshop.booked = row[0]
+        if held:
+            apply()
+        return held
+
+    def release_seat(self, data, workshop):
+        """Gives back one seat of 'workshop' (the reverse of reserve_seat)."""
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE workshops SET booked = booked - 1 WHERE w_id = ? AND booked > 0",
+                              (workshop.w_id,))
+            row = self.conn.execute("SELECT booked FROM workshops WHERE w_id = ?", (workshop.w_id,)).fetchone()
+        if row:
+            workshop.booked = row[0]
+
+    def flush(self):
+        """Every write is committed immediately, so there is nothing to flush."""
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # --- Row conversion ---
+    @staticmethod
+    def _workshop_row(w):
+        return w.w_id, w.title, w.time, w.capacity, w.booked, w.exhibition_name
+
+    def _put_attendee(self, a):
+        """Writes attendee 'a' with its ticket and reservations; the row keeps its position if it exists."""
+        self.conn.execute(
+            "INSERT INTO attendees VALUES (?, ?, ?, ?) ON CONFLICT (email) DO UPDATE SET "
+            "name = excluded.name, password = excluded.password, phone = excluded.phone",
+            (a.email, a.name, a.password, a.phone))  # Upsert keeps the row's position
+        for table in ("reservations", "ticket_access", "tickets"):
+            self.conn.execute(f"DELETE FROM {table} WHERE email = ?", (a.email,))
+        self._insert_details(a)
+
+    def _put_object(self, key, data):
+        self.conn.execute("INSERT OR REPLACE INTO objects VALUES (?, ?)", (key, BINARY_CODECS[key].encode([data])))
+
+    def _totals(self):
+        """The dashboard totals, counted from the ticket and workshop rows; the caller holds self._lock."""
+        stats = SalesStats()
+        stats.tickets_sold, stats.revenue = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(price), 0) FROM tickets").fetchone()  # Prices include upgrade payments
+        stats.total_capacity, stats.total_booked = self.conn.execute(
+            "SELECT COALESCE(SUM(capacity), 0), COALESCE(SUM(booked), 0) FROM workshops").fetchone()
+        return stats
+
+    def _object(self, key, blob):
+        """Decodes a value of the 'objects' table; values pickled by earlier versions are refused."""
+        if not bytes(blob).startswith(BINARY_MAGIC):
+            raise FormatError(f"{self.path} holds '{key}' pickled by an earlier version, which is not loaded because "
+                              f"it can run code; delete the database and import the data folder again")
+        return BINARY_CODECS[key].decode(bytes(blob))[0]
+
+    def _insert_attendee(self, a):
+        self.conn.execute("INSERT INTO attendees VALUES (?, ?, ?, ?)", (a.email, a.name, a.password, a.phone))
+        self._insert_details(a)
+
+    def _insert_details(self, a):
+        """Writes the ticket, its exhibition access and the reservations of attendee 'a'."""
+        t = a.ticket
+        if t:
+            self.conn.execute("INSERT INTO tickets VALUES (?, ?, ?, ?, ?, ?)",
+                              (a.email, t.ticket_id, t.ticket_type, t.price, t.purchase_date.isoformat(),
+                               int(t.all_access)))
+            bits = [i for i in range(t.access_mask.bit_length()) if (t.access_mask >> i) & 1]  # Set bits
+            self.conn.executemany("INSERT INTO ticket_access VALUES (?, ?)", [(a.email, bit) for bit in bits])
+        self.conn.executemany("INSERT INTO reservations VALUES (?, ?)",
+                              [(a.email, w_id) for w_id in a.reservations])
+
+    def _load_workshops(self):
+        workshops = []
+        for w_id, title, time, capacity, booked, exhibition_name in self.conn.execute(
+                "SELECT w_id, title, time, capacity, booked, exhibition_name FROM workshops ORDER BY rowid"):
+            w = Workshop(w_id, title, time, capacity, exhibition_name)
+            w.booked = booked
+            workshops.append(w)
+        return workshops
+
+    def _load_attendees(self, progress=None):
+        """Rebuilds the Attendee objects (with tickets and reservations) from the joined tables."""
+        access = {}  # email -> access bitmask
+        for email, bit in self.conn.execute("SELECT email, bit FROM ticket_access"):
+            access[email] = access.get(email, 0) | (1 << bit)
+        booked = {}  # email -> workshop IDs, in booking order
+        for email, w_id in self.conn.execute("SELECT email, w_id FROM reservations ORDER BY rowid"):
+            booked.setdefault(email, []).append(w_id)
+        tickets = {}
+        for email, ticket_id, ticket_type, price, purchase_date, all_access in self.conn.execute(
+                "SELECT email, ticket_id, ticket_type, price, purchase_date, all_access FROM tickets"):
+            t = Ticket(ticket_type, price, access.get(email, 0), bool(all_access), ticket_id)
+            t.purchase_date = datetime.date.fromisoformat(purchase_date)
+            tickets[email] = t
+
+        total = self.conn.execute("SELECT COUNT(*) FROM attendees").fetchone()[0]
+        step = max(total // 100, 1)  # Report roughly every percent
+        attendees = []
+        for i, (email, name, password, phone) in enumerate(
+                self.conn.execute("SELECT * FROM attendees ORDER BY rowid")):
+            a = Attendee(name, email, password, phone)
+            a.ticket = tickets.get(email)
+            for w_id in booked.get(email, ()):
+                a.add_reservation(w_id)
+            attendees.append(a)
+            if progress and i % step == 0:
+                progress(i * 100 // total)
+        return attendees
+
+
+def import_pickles(data_dir="", path="greenwave.db"):
+    """
+    One-shot import of the data files (including any journal not yet compacted) into the SQLite database.
+    Returns the SQLiteDataManager for the filled database. Files written with pickle by older versions raise
+    FormatError, like in the application; convert them first with ConvertData.py.
+    """
+    source = DataManager(journal=True, data_dir=data_dir)  # Reads snapshots and replays their journals
+    target = SQLiteDataManager(path, data_dir)
+
+    exhibitions = ExhibitionRegistry(source.load("exhibitions", []))  # Numbers exhibitions saved without bits
+    attendees = source.load("attendees", [])  # Files of older versions are converted while loading
+    target.save("exhibitions", exhibitions)
+    for name, next_number in source.load("sequences", {}).items():  # Carry over the ID counters
+        target.allocate(name, 0, next_number)
+    for key in ("config", "workshops"):  # The totals are counted from the imported rows
+        data = source.load(key, None)
+        if data is not None:
+            target.save(key, data)
+    target.save("attendees", attendees)
+    return target
+
+
+if __name__ == "__main__":
+    """
+    Imports the data files of a data folder into a new database:
+        python Database.py [data_dir]
+    """
+    folder = sys.argv[1] if len(sys.argv) > 1 else ""
+    db = import_pickles(folder)
+    print(f"Imported {len(db.load('attendees', []))} attendee(s) and "
+          f"{len(db.load('workshops', []))} workshop(s) into {db.path}")
+    db.close()
@@ -1,8 +1,51 @@
+import os
+import sys
 from Controller import GreenWaveApp
+from Storage import DataManager
+from Service import ConferenceService
+
+
+def measure_startup():
+    """
+    Compares the startup time of building every page and loading all attendees up front
+    with building pages on demand and loading the attendees in the background.
+    """
+    for label, lazy in (("eager", False), ("lazy", True)):
+        app = GreenWaveApp(lazy_pages=lazy, lazy_load=lazy)  # Build the window in the given mode
+        print(f"{label:<12}: {app.startup_seconds * 1000:.1f} ms ({len(app.frames)} page(s) built)")
+        app.on_close()  # Close the window again
+
+
+def verify(dm, repair):
+    """Recounts the dashboard totals without opening the window and prints the counters that drifted."""
+    service = ConferenceService(dm)
+    drift = service.verify_stats(repair)
+    for name, (stored, actual) in drift.items():
+        print(f"{name:<15}: stored {stored}, recounted {actual}")
+    print(("Repaired." if repair else "Run with --repair to save the recount.") if drift else "Totals are consistent.")
+    dm.close()
+    return 1 if drift and not repair else 0
+
+
 if __name__ == "__main__":
     """
     Main entry point of the application.
     Instantiates the main controller and starts the Tkinter event loop.
+    Run with --measure-startup to print the eager vs. lazy startup time instead.
+    Run with --sqlite to store the data in greenwave.db (imported from the pickle files on first use).
+    Run with --shared when several kiosks use the same data folder with the pickle files.
+    Run with --verify to check the dashboard totals against the data (--repair also fixes them).
     """
-    app = GreenWaveApp()  # Create Application Instance
-    app.mainloop()  # Start GUI Loop
\ No newline at end of file
+    if "--measure-startup" in sys.argv:
+        measure_startup()
+    else:
+        dm = None  # Default: pickle files
+        if "--sqlite" in sys.argv:
+            from Database import SQLiteDataManager, import_pickles
+            dm = SQLiteDataManager() if os.path.exists("greenwave.db") else import_pickles()
+        elif "--shared" in sys.argv:
+            dm = DataManager(journal=True, write_behind=True, shared=True)  # Seats are taken under a file lock
+        if "--verify" in sys.argv:
+            sys.exit(verify(dm or DataManager(journal=True), "--repair" in sys.argv))
+        app = GreenWaveApp(prewarm="--prewarm" in sys.argv, dm=dm)  # Create Application Instance
+        app.mainloop()  # Start GUI Loop
@@ -1,13 +1,40 @@
-import tkinter as tk
-from tkinter import messagebox, ttk
-import pickle
-import os
+import sys
 import datetime
+import threading
 
 # =============================================================================
 #                                   MODEL
 # =============================================================================
 
+class Slotted:
+    """
+    Base class for the model classes that declare __slots__ (no per-instance __dict__, which saves memory
+    when hundreds of thousands of attendees are loaded).
+    The pickled state is a plain {attribute: value} dictionary, exactly as for the earlier dict-based classes,
+    so files written before and after the change can be read by either version.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def _slot_names(cls):
+        names = cls.__dict__.get("_slot_cache")  # Computed once per class
+        if names is None:
+            names = tuple(n for c in reversed(cls.__mro__) for n in c.__dict__.get("__slots__", ()))
+            setattr(cls, "_slot_cache", names)
+        return names
+
+    def __getstate__(self):
+        return {n: getattr(self, n) for n in self._slot_names() if hasattr(self, n)}  # Unset slots are skipped
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):  # (dict state, slot state) as written by the default slot pickling
+            state = {**(state[0] or {}), **(state[1] or {})}
+        slots = self._slot_names()
+        for name, value in state.items():
+            if name in slots:  # Ignore attributes that no longer exist
+                setattr(self, name, value)
+
+
 class Config:
     """
     Stores global configuration settings for the application.
@@ -32,31 +59,40 @@ class Config:
                              price): self.price_all_access = price  # Update the all-access ticket price with a new value
 
 
-class Exhibition:
+class Exhibition(Slotted):
     """
     Represents a major event category or topic within the conference.
     This object holds the name and description of the event, serving as a parent category for workshops.
     """
+    __slots__ = ("name", "description", "bit")
 
     def __init__(self, name, description):
-        self.name = name  # Assign the display name of the exhibition category
+        self.name = sys.intern(name)  # Assign the display name of the exhibition category (shared with tickets)
         self.description = description  # Assign the descriptive text explaining the exhibition topic
+        self.bit = None  # Position of this exhibition in ticket access masks (assigned by ExhibitionRegistry)
 
     # Getters and Setters
     def get_name(self): return self.name  # Retrieve the name of the exhibition
 
-    def set_name(self, name): self.name = name  # Modify the name of the exhibition
+    def set_name(self, name): self.name = sys.intern(name)  # Modify the name of the exhibition
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.name = sys.intern(self.name)  # One string object per name, however many tickets refer to it
+        if not hasattr(self, "bit"):  # Saved before access masks: numbered by ExhibitionRegistry when loaded
+            self.bit = None
 
     def get_description(self): return self.description  # Retrieve the description text
 
     def set_description(self, desc): self.description = desc  # Modify the description text
 
 
-class Workshop:
+class Workshop(Slotted):
     """
     Represents a specific scheduled session that attendees can book.
     This class manages the session details and tracks the current booking count against the maximum capacity.
     """
+    __slots__ = ("w_id", "title", "time", "capacity", "booked", "exhibition_name")
 
     def __init__(self, w_id, title, time, capacity, exhibition_name):
         self.w_id = w_id  # Assign a unique integer ID to identify this specific workshop session
@@ -64,7 +100,11 @@ class Workshop:
         self.time = time  # Assign the scheduled time string (e.g., "10:30 AM")
         self.capacity = capacity  # Define the maximum number of attendees allowed in this session
         self.booked = 0  # Initialize the count of booked seats to zero as the session starts empty
-        self.exhibition_name = exhibition_name  # Link this workshop to a parent exhibition by name
+        self.exhibition_name = sys.intern(exhibition_name)  # Link this workshop to a parent exhibition by name
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.exhibition_name = sys.intern(self.exhibition_name)  # Share the name string with the exhibition
 
     def is_full(self):
         return self.booked >= self.capacity  # Return True if the booked seats equal or exceed the limit, preventing overbooking
@@ -85,24 +125,61 @@ class Workshop:
     def set_booked(self, count): self.booked = count  # Manually set the booking count (used for data correction)
 
 
-class Ticket:
+class Ticket(Slotted):
     """
     Represents a purchased entry pass held by an attendee.
     This class generates a unique ID upon creation and tracks which exhibitions the user is permitted to enter.
+    Access is stored as a bitmask over the exhibitions' bit numbers (see ExhibitionRegistry), and an
+    All-Access pass is a flag that covers every exhibition, including ones added later.
     """
+    __slots__ = ("ticket_type", "price", "access_mask", "all_access", "ticket_id", "purchase_date", "legacy_names")
 
-    def __init__(self, ticket_type, price, exhibitions_allowed):
-        self.ticket_type = ticket_type  # Store the type of ticket (e.g., "Exhibition Pass" or "All-Access")
+    def __init__(self, ticket_type, price, access_mask=0, all_access=False, ticket_id=None):
+        self.ticket_type = sys.intern(ticket_type)  # Store the type of ticket (e.g., "Exhibition Pass" or "All-Access")
         self.price = price  # Store the specific amount paid for this ticket
-        self.exhibitions_allowed = exhibitions_allowed  # Store the list of exhibition names this ticket grants access to
+        self.access_mask = access_mask  # One bit per exhibition this ticket grants access to
+        self.all_access = all_access  # True for All-Access passes (the mask is then not consulted)
 
-        # ID Generation
-        code = "ALL" if ticket_type == "All-Access" else "EXH"  # distinct prefix code based on the ticket type
-        timestamp = int(
-            datetime.datetime.now().timestamp() % 10000)  # Generate a short unique number from the current timestamp
-        self.ticket_id = f"GW-{code}-{timestamp:04d}"  # Construct the final unique Ticket ID string
+        self.ticket_id = ticket_id  # Unique ID, built with make_id() from a SequenceAllocator number
         self.purchase_date = datetime.date.today()  # Record the current date as the official purchase date
 
+    @staticmethod
+    def make_id(ticket_type, number):
+        code = "ALL" if ticket_type == "All-Access" else "EXH"  # distinct prefix code based on the ticket type
+        return f"GW-{code}-{number:04d}"  # Construct the final unique Ticket ID string (e.g. "GW-EXH-10001")
+
+    @staticmethod
+    def id_number(ticket_id):
+        """The sequence number inside a ticket ID, or 0 if the ID does not end in one."""
+        tail = str(ticket_id).rsplit("-", 1)[-1]
+        return int(tail) if tail.isdigit() else 0
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.ticket_type = sys.intern(self.ticket_type)  # Every ticket of a type shares one string
+        if not hasattr(self, "access_mask"):  # Saved with a list of exhibition names (before access masks)
+            self.access_mask = 0
+            self.all_access = self.ticket_type == "All-Access"
+            self.legacy_names = state.get("exhibitions_allowed", [])  # Converted by _v1_attendee() while loading
+
+    def allows(self, bit):
+        """Returns True if the ticket grants access to the exhibition with bit number 'bit' (O(1))."""
+        return self.all_access or (bit is not None and (self.access_mask >> bit) & 1 == 1)
+
+    def grant(self, bit):
+        self.access_mask |= 1 << bit  # Add one exhibition
+
+    def grant_all(self):
+        self.all_access = True  # Covers every exhibition, present and future
+
+    def bits(self):
+        """Yields the bit numbers set in the access mask (one per exhibition bought explicitly)."""
+        mask = self.access_mask
+        while mask:
+            low = mask & -mask  # Lowest set bit
+            yield low.bit_length() - 1
+            mask ^= low  # Clear it
+
     # Getters and Setters
     def get_ticket_type(self): return self.ticket_type  # Retrieve the ticket type string
 
@@ -112,17 +189,17 @@ class Ticket:
 
     def set_price(self, price): self.price = price  # Update the price value
 
-    def get_exhibitions(self): return self.exhibitions_allowed  # Retrieve the list of accessible exhibitions
+    def get_access_mask(self): return self.access_mask  # Retrieve the exhibition access bitmask
 
-    def set_exhibitions(self,
-                        exhibitions): self.exhibitions_allowed = exhibitions  # Update the list of accessible exhibitions
+    def set_access_mask(self, mask): self.access_mask = mask  # Replace the exhibition access bitmask
 
 
-class Person:
+class Person(Slotted):
     """
     Defines the base attributes for any user in the system.
     This is a parent class that holds common credentials like name, email, and password.
     """
+    __slots__ = ("name", "email", "password")
 
     def __init__(self, name, email, password):
         self.name = name  # Assign the full name of the user
@@ -148,12 +225,23 @@ class Attendee(Person):
     Represents a standard conference participant.
     Inherits from Person and adds fields for ticket management and workshop reservations.
     """
+    __slots__ = ("phone", "ticket", "reservations", "reserved_ids")
 
     def __init__(self, name, email, password, phone):
         super().__init__(name, email, password)  # Initialize the parent Person class with basic credentials
         self.phone = phone  # Store the attendee's contact phone number
         self.ticket = None  # Initialize the ticket slot as None (attendee starts without a pass)
-        self.reservations = []  # Initialize an empty list to track future workshop bookings
+        self.reservations = []  # Initialize an empty list of booked workshop IDs (resolved via the workshop table)
+        self.reserved_ids = set()  # Set of booked workshop IDs for O(1) "already booked?" checks
+
+    def __getstate__(self):
+        state = super().__getstate__()  # Copy the instance attributes for pickling
+        state.pop("reserved_ids", None)  # The ID set is derived from 'reservations', so it is not stored
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)  # Restore the stored attributes
+        self.reserved_ids = {getattr(r, "w_id", r) for r in self.reservations}  # Rebuild the ID set (also for old files)
 
     # Getters and Setters
     def get_phone(self): return self.phone  # Retrieve the phone number
@@ -164,10 +252,21 @@ class Attendee(Person):
 
     def set_ticket(self, ticket): self.ticket = ticket  # Assign a purchased Ticket object to this user
 
-    def get_reservations(self): return self.reservations  # Retrieve the list of workshop reservations
+    def get_reservations(self): return self.reservations  # Retrieve the list of reserved workshop IDs
 
-    def add_reservation(self, workshop): self.reservations.append(
-        workshop)  # Add a specific workshop to the reservations list
+    def add_reservation(self, w_id):
+        self.reservations.append(w_id)  # Add the workshop ID to the reservations list
+        self.reserved_ids.add(w_id)  # Record it in the lookup set
+
+    def has_reservation(self, w_id): return w_id in self.reserved_ids  # Check if this workshop is already booked
+
+    def remove_reservation(self, w_id):
+        """Removes the booking for workshop 'w_id'. Returns True if a booking was removed."""
+        if w_id not in self.reserved_ids:  # O(1) check before touching the list
+            return False
+        self.reserved_ids.discard(w_id)  # Forget the ID
+        self.reservations.remove(w_id)  # Drop the booking from the list
+        return True
 
 
 class Admin(Person):
@@ -175,38 +274,352 @@ class Admin(Person):
     Represents a System Administrator with privileged access.
     This class is instantiated when specific admin credentials are used during login.
     """
+    __slots__ = ()
 
     def __init__(self):
         super().__init__("Administrator", "admin", "admin123")  # Initialize with hardcoded Admin credentials
 
 
-class DataManager:
+class SalesStats:
+    """
+    Running totals shown on the Administrator Dashboard.
+    The counters are updated on every purchase, upgrade, reservation, cancellation and workshop change,
+    so the dashboard never has to scan the attendee list. verify() recomputes them from scratch.
+    """
+
+    def __init__(self):
+        self.tickets_sold = 0  # Number of attendees holding a ticket
+        self.revenue = 0  # Sum of all ticket prices (including upgrade payments)
+        self.total_capacity = 0  # Sum of the capacity of all workshops
+        self.total_booked = 0  # Sum of the booked seats of all workshops
+
+    @classmethod
+    def from_data(cls, attendees, workshops):
+        """Builds the totals with a full scan (first run, or files written before stats existed)."""
+        stats = cls()  # Start from zero
+        for a in attendees:  # Count tickets and revenue
+            if a.ticket:
+                stats.on_ticket_purchase(a.ticket.price)
+        for w in workshops:  # Count seats
+            stats.on_workshop_added(w)
+        return stats
+
+    def on_ticket_purchase(self, price):
+        self.tickets_sold += 1  # One more ticket holder
+        self.revenue += price  # Add the amount paid
+
+    def on_upgrade(self, price):
+        self.revenue += price  # Add the upgrade payment (the ticket count does not change)
+
+    def on_reserve(self):
+        self.total_booked += 1  # One seat taken
+
+    def on_cancel(self):
+        self.total_booked -= 1  # One seat released
+
+    def on_workshop_added(self, workshop):
+        self.total_capacity += workshop.capacity  # New seats available
+        self.total_booked += workshop.booked  # Seats already booked on the session (normally zero)
+
+    def on_workshop_removed(self, workshop):
+        self.total_capacity -= workshop.capacity  # Seats no longer offered
+        self.total_booked -= workshop.booked  # Bookings that disappear with the session
+
+    def load_percent(self):
+        return int((self.total_booked / self.total_capacity) * 100) if self.total_capacity > 0 else 0  # Workshop load
+
+    def verify(self, attendees, workshops, repair=False):
+        """
+        Recomputes every counter from the raw data and compares it with the running totals.
+        Returns a dictionary {counter: (stored, actual)} of the counters that drifted (empty when consistent).
+        With repair=True the stored counters are replaced by the recomputed ones.
+        """
+        actual = SalesStats.from_data(attendees, workshops)  # Full recount
+        drift = {}  # Collect mismatches
+        for name, value in vars(actual).items():  # Compare counter by counter
+            if getattr(self, name) != value:
+                drift[name] = (getattr(self, name), value)
+        if repair:
+            self.__dict__.update(vars(actual))  # Adopt the recomputed values
+        return drift
+
+
+class DaySales:
+    """
+    Sales bucket for one purchase date (or a merged date range): the tickets sold, revenue and count per ticket type.
+    """
+
+    def __init__(self):
+        self.tickets = []  # Ticket objects purchased on this day, in purchase order
+        self.revenue = 0  # Sum of the ticket prices (including upgrade payments)
+        self.type_counts = {}  # Ticket type string -> number of tickets
+
+    def count(self, ticket_type):
+        return self.type_counts.get(ticket_type, 0)  # Number of tickets of the given type
+
+    def merge(self, other):
+        self.tickets.extend(other.tickets)  # Combine the ticket logs
+        self.revenue += other.revenue  # Combine revenue
+        for t_type, n in other.type_counts.items():  # Combine the per-type counts
+            self.type_counts[t_type] = self.type_counts.get(t_type, 0) + n
+
+
+class HolderIndex:
     """
-    Manages the persistence of application data to the local file system.
-    This class uses the pickle library to save and load objects, ensuring data is not lost when the app closes.
+    Number of tickets holding each exhibition, keyed by the exhibition's bit number. It is maintained at
+    purchase/upgrade time, so asking whether an exhibition can be deleted costs O(1).
+    All-Access passes are not counted: they cover whatever exhibitions exist, so deleting one does not
+    take anything away from them.
     """
 
     def __init__(self):
-        self.files = {
-            "attendees": "attendees.pkl",  # Map the logical key 'attendees' to its physical filename
-            "workshops": "workshops.pkl",  # Map the logical key 'workshops' to its physical filename
-            "exhibitions": "exhibitions.pkl",  # Map the logical key 'exhibitions' to its physical filename
-            "config": "config.pkl"  # Map the logical key 'config' to its physical filename
-        }
-
-    def save(self, key, data):
-        try:
-            with open(self.files[key], 'wb') as f:  # Open the file corresponding to the key in write-binary mode
-                pickle.dump(data, f)  # Serialize and write the data object to the file
-        except Exception as e:
-            print(f"Save error ({key}): {e}")  # Catch and log any file writing errors to the console
-
-    def load(self, key, default):
-        if not os.path.exists(self.files[key]):  # Check if the data file exists on the disk
-            return default  # Return the default empty value if the file is missing (first run)
-        try:
-            with open(self.files[key], 'rb') as f:  # Open the data file in read-binary mode
-                return pickle.load(f)  # Deserialize the file content back into a Python object
-        except Exception as e:
-            print(f"Load error ({key}): {e}")  # Catch and log any file reading errors
-            return default  # Return the default value if the file is corrupt to prevent crashing
\ No newline at end of file
+        self.counts = {}  # Exhibition bit -> number of tickets holding it
+
+    @classmethod
+    def from_attendees(cls, attendees):
+        """Builds the index with one pass over the attendees (done once at startup)."""
+        index = cls()
+        for a in attendees:
+            if a.ticket:
+                index.add_ticket(a.ticket)
+        return index
+
+    def add_ticket(self, ticket):
+        if ticket.all_access:  # Does not pin any exhibition
+            return
+        for bit in ticket.bits():
+            self.counts[bit] = self.counts.get(bit, 0) + 1
+
+    def remove_ticket(self, ticket):
+        """Takes a ticket out of the counts; call before changing its access, then add_ticket() after."""
+        if ticket.all_access:
+            return
+        for bit in ticket.bits():
+            left = self.counts.get(bit, 0) - 1
+            if left > 0:
+                self.counts[bit] = left
+            else:
+                self.counts.pop(bit, None)  # Keep only exhibitions that are still held
+
+    def count(self, bit):
+        return self.counts.get(bit, 0)  # Tickets holding the exhibition with bit number 'bit'
+
+
+class RosterIndex:
+    """
+    The attendees holding a reservation for each workshop, keyed by workshop ID (in booking order).
+    It is maintained when seats are reserved and cancelled, so booking counts cost O(1) and a roster
+    costs O(attendees on it).
+    """
+
+    def __init__(self):
+        self.by_workshop = {}  # Workshop ID -> {email: Attendee}
+
+    @classmethod
+    def from_attendees(cls, attendees):
+        """Builds the index with one pass over the attendees (done once at startup)."""
+        index = cls()
+        for a in attendees:
+            for w_id in a.reservations:
+                index.add(w_id, a)
+        return index
+
+    def add(self, w_id, attendee):
+        self.by_workshop.setdefault(w_id, {})[attendee.email] = attendee  # Put the attendee on the roster
+
+    def remove(self, w_id, attendee):
+        roster = self.by_workshop.get(w_id)
+        if roster and roster.pop(attendee.email, None) is not None and not roster:
+            del self.by_workshop[w_id]  # Drop empty rosters
+
+    def count(self, w_id):
+        return len(self.by_workshop.get(w_id, ()))  # Number of attendees booked on the workshop
+
+    def roster(self, w_id):
+        return list(self.by_workshop.get(w_id, {}).values())  # Attendees booked on the workshop
+
+
+class SequenceAllocator:
+    """
+    Hands out unique, increasing numbers of one named sequence (e.g. ticket numbers), safe across threads and processes.
+    Numbers are reserved from the DataManager in blocks of 'block', so most calls are an in-memory increment.
+    Numbers of a block left unused when the program exits are skipped, never reused; concurrent processes
+    each draw from their own blocks, so numbers increase within a process and never repeat between processes.
+    """
+
+    def __init__(self, dm, name, start=1, block=100):
+        self.dm = dm  # Storage that persists the sequence counter
+        self.name = name  # Sequence name
+        self.start = start  # Lowest number to hand out (raise it above IDs already in use)
+        self.block = block  # Numbers reserved per trip to the storage
+        self._next = 0  # Next number of the current block
+        self._end = 0  # First number after the current block
+        self._lock = threading.Lock()
+
+    def next(self):
+        """Returns the next unique number."""
+        with self._lock:
+            if self._next >= self._end:  # Block used up: reserve a new one
+                self._next = self.dm.allocate(self.name, self.block, self.start)
+                self._end = self._next + self.block
+            number = self._next
+            self._next += 1
+            return number
+
+    def take(self, count):
+        """Returns 'count' consecutive unique numbers as a range (bulk allocation, one storage trip at most)."""
+        with self._lock:
+            if self._end - self._next < count:  # Not enough left in the current block
+                first = self.dm.allocate(self.name, max(count, self.block), self.start)
+                self._next, self._end = first, first + max(count, self.block)
+            numbers = range(self._next, self._next + count)
+            self._next += count
+            return numbers
+
+
+class Registry:
+    """
+    Wraps a list of records and keeps hash indexes over it in step with every change.
+    Subclasses define which indexes exist. The registry pickles as a plain list,
+    so the data files on disk keep exactly the same format as before.
+    """
+
+    def __init__(self, items=None):
+        self.items = list(items or [])  # The underlying ordered list of records
+        self.reindex()  # Build the indexes from scratch for the initial records
+
+    def reindex(self):
+        """Rebuilds every index from the current list (used after loading from disk)."""
+        self._clear_indexes()  # Drop any existing index entries
+        for item in self.items:  # Walk the list once
+            self._index(item)  # Add the record to the indexes
+
+    def _clear_indexes(self):
+        pass  # Overridden by subclasses that maintain indexes
+
+    def _index(self, item):
+        pass  # Overridden by subclasses that maintain indexes
+
+    def _unindex(self, item):
+        pass  # Overridden by subclasses that maintain indexes
+
+    def append(self, item):
+        self.items.append(item)  # Add the record to the end of the list
+        self._index(item)  # Register it in the indexes
+
+    def pop(self, index=-1):
+        item = self.items.pop(index)  # Remove the record at the given position
+        self._unindex(item)  # Remove it from the indexes
+        return item
+
+    def __iter__(self): return iter(self.items)  # Iterate records in insertion order
+
+    def __len__(self): return len(self.items)  # Number of records held
+
+    def __getitem__(self, index): return self.items[index]  # Positional access (used by list-based views)
+
+    def __reduce__(self): return list, (self.items,)  # Pickle as a plain list for file compatibility
+
+
+class AttendeeRegistry(Registry):
+    """
+    The list of registered attendees with O(1) lookups by normalized email and by ticket ID.
+    """
+
+    @staticmethod
+    def normalize_email(email):
+        return email.strip().lower()  # Emails are compared case-insensitively and without surrounding spaces
+
+    def _clear_indexes(self):
+        self.by_email = {}  # Normalized email -> Attendee
+        self.by_ticket = {}  # Ticket ID -> Attendee
+
+    def _index(self, attendee):
+        self.by_email[self.normalize_email(attendee.email)] = attendee  # Index the login name
+        if attendee.ticket:  # Only ticket holders appear in the ticket index
+            self.by_ticket[attendee.ticket.ticket_id] = attendee
+
+    def _unindex(self, attendee):
+        self.by_email.pop(self.normalize_email(attendee.email), None)  # Forget the login name
+        if attendee.ticket and self.by_ticket.get(attendee.ticket.ticket_id) is attendee:
+            del self.by_ticket[attendee.ticket.ticket_id]  # Forget the ticket ID
+
+    def find_by_email(self, email):
+        return self.by_email.get(self.normalize_email(email))  # Return the matching Attendee or None
+
+    def find_by_ticket(self, ticket_id):
+        return self.by_ticket.get(ticket_id.strip())  # Return the ticket holder or None
+
+    def index_ticket(self, attendee):
+        """Registers the attendee's (new) ticket ID; call after a ticket is assigned."""
+        if attendee.ticket:
+            self.by_ticket[attendee.ticket.ticket_id] = attendee
+
+
+class ExhibitionRegistry(Registry):
+    """
+    The list of exhibitions with an O(1) lookup by name. Every exhibition gets a bit number that never
+    changes, which tickets use for their access bitmask; exhibitions loaded from files written before
+    bitmasks existed are numbered in list order.
+    """
+
+    def reindex(self):
+        self.next_bit = 1 + max((e.bit for e in self.items if getattr(e, "bit", None) is not None),
+                                default=-1)  # First unused bit number
+        super().reindex()
+
+    def _clear_indexes(self):
+        self.by_name = {}  # Exhibition name -> Exhibition
+
+    def _index(self, exhibition):
+        if getattr(exhibition, "bit", None) is None:  # New exhibition (or old file): take the next bit number
+            exhibition.bit = self.next_bit
+        self.next_bit = max(self.next_bit, exhibition.bit + 1)
+        self.by_name[exhibition.name] = exhibition  # Index the exhibition by its name
+
+    def _unindex(self, exhibition):
+        if self.by_name.get(exhibition.name) is exhibition:
+            del self.by_name[exhibition.name]  # Forget the name
+
+    def get(self, name):
+        return self.by_name.get(name)  # Return the matching Exhibition or None
+
+    def bit(self, name):
+        e = self.by_name.get(name)
+        return e.bit if e else None  # Bit number of the exhibition (None if it does not exist)
+
+    def mask_of(self, names):
+        """Access mask granting the exhibitions in 'names' (unknown names are ignored)."""
+        mask = 0
+        for name in names:
+            e = self.by_name.get(name)
+            if e:
+                mask |= 1 << e.bit
+        return mask
+
+    def names_for(self, ticket):
+        """Names of the exhibitions 'ticket' grants access to, in list order."""
+        return [e.name for e in self.items if ticket.allows(e.bit)]
+
+
+class WorkshopRegistry(Registry):
+    """
+    The list of workshop sessions with an O(1) lookup by workshop ID.
+    """
+
+    def _clear_indexes(self):
+        self.by_id = {}  # Workshop ID -> Workshop
+
+    def _index(self, workshop):
+        self.by_id[workshop.w_id] = workshop  # Index the session by its ID
+
+    def _unindex(self, workshop):
+        if self.by_id.get(workshop.w_id) is workshop:
+            del self.by_id[workshop.w_id]  # Forget the session ID
+
+    def get(self, w_id):
+        return self.by_id.get(w_id)  # Return the matching Workshop or None
+
+    def resolve(self, w_ids):
+        """Turns a list of reserved workshop IDs into the live Workshop objects, skipping deleted sessions."""
+        return [self.by_id[w_id] for w_id in w_ids if w_id in self.by_id]
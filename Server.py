@@ -0,0 +1,399 @@
+import argparse
+import asyncio
+import concurrent.futures
+import datetime
+import json
+import secrets
+import time
+from urllib.parse import urlsplit, parse_qs
+from Model import Admin
+from Storage import DataManager
+from Service import ConferenceService
+
+# =============================================================================
+#                                   SERVER
+# =============================================================================
+# A small HTTP/JSON front end for ConferenceService, for clients other than the Tk GUI.
+# Connections are handled by one asyncio event loop; every request handler runs on a single worker
+# thread, so the service (which is not thread-safe) sees one request at a time and slow disk work
+# never stalls the loop. Disk writes are additionally handed to the DataManager's writer thread.
+# With --group-commit every response waits until the request's writes are fsynced; the writes of all
+# requests handled in the meantime are synced together, so a burst of bookings costs a few fsyncs, not one each.
+#
+#     python Server.py --port 8080 --group-commit
+#
+# Endpoints (JSON bodies; send "Authorization: Bearer <token>" after logging in; a token expires after
+# SESSION_TIMEOUT seconds without a request, or at /logout):
+#     POST   /register               {name, email, password, phone}
+#     POST   /login                  {email, password}            -> {token, role}
+#     POST   /logout
+#     GET    /me
+#     GET    /exhibitions, /workshops
+#     POST   /tickets                {type: "exhibition" | "all_access", exhibition}
+#     POST   /upgrade                {type: "all_access" | "add_exhibition", exhibition}
+#     POST   /reservations           {w_id}
+#     DELETE /reservations/<w_id>
+#     GET    /admin/dashboard
+#     GET    /admin/sales?date=YYYY-MM-DD[&end=YYYY-MM-DD][&log=1]   (log=1 adds the report text with every ticket)
+
+MAX_BODY = 1024 * 1024  # Largest accepted request body (bytes)
+SESSION_TIMEOUT = 8 * 60 * 60  # Seconds a login token stays valid without being used
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+           404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    """Raised by a handler to answer with an error status and a JSON {"error": message} body."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def workshop_json(w):
+    return {"w_id": w.w_id, "title": w.title, "time": w.time, "capacity": w.capacity,
+            "booked": w.booked, "exhibition": w.exhibition_name}
+
+
+def attendee_json(u, exhibitions):
+    t = u.ticket
+    return {
+        "name": u.name, "email": u.email, "phone": u.phone,
+        "ticket": t and {"ticket_id": t.ticket_id, "type": t.ticket_type, "price": t.price,
+                         "purchase_date": t.purchase_date.isoformat(), "exhibitions": exhibitions.names_for(t)},
+        "reservations": list(u.reservations),
+    }
+
+
+class ConferenceServer:
+    """
+    Routes HTTP requests to the ConferenceService and keeps the login sessions (token -> user).
+    """
+
+    def __init__(self, service, session_timeout=SESSION_TIMEOUT):
+        self.service = service
+        self.sessions = {}  # Bearer token -> [Attendee or Admin, time of the last request]
+        self.session_timeout = session_timeout  # Idle seconds after which a token no longer logs in
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)  # The single service thread
+        self.routes = {
+            ("POST", "/register"): self.register,
+            ("POST", "/login"): self.login,
+            ("POST", "/logout"): self.logout,
+            ("GET", "/me"): self.me,
+            ("GET", "/exhibitions"): self.exhibitions,
+            ("GET", "/workshops"): self.workshops,
+            ("POST", "/tickets"): self.buy_ticket,
+            ("POST", "/upgrade"): self.upgrade,
+            ("POST", "/reservations"): self.reserve,
+            ("GET", "/admin/dashboard"): self.dashboard,
+            ("GET", "/admin/sales"): self.sales,
+        }
+
+    # --- Connection handling (event loop) ---
+    async def handle_connection(self, reader, writer):
+        """Serves the requests of one keep-alive connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break  # Client went away (or sent an oversized header)
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.respond(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY:
+                    await self.respond(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, payload = await self.dispatch(method, target, headers, body)
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+        await writer.drain()
+
+    async def dispatch(self, method, target, headers, body):
+        """Parses the request and runs the matching handler on the service thread."""
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError
+        except ValueError:
+            return 400, {"error": "Body must be a JSON object"}
+
+        args = ()
+        handler = self.routes.get((method, path))
+        if handler is None and method == "DELETE" and path.startswith("/reservations/"):
+            handler, args = self.cancel, (path.rsplit("/", 1)[1],)
+        if handler is None:
+            known = any(p == path for _, p in self.routes)
+            return (405, {"error": "Method not allowed"}) if known else (404, {"error": "Not found"})
+
+        token = headers.get("authorization", "").removeprefix("Bearer ").strip()
+        loop = asyncio.get_running_loop()
+        try:
+            status, payload = await loop.run_in_executor(self.executor, handler, self.session_user(token), token,
+                                                         data, query, *args)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            print(f"Request error ({method} {path}): {e!r}")
+            return 500, {"error": "Internal server error"}
+        error = await self.durable()  # Answer only once the request's writes are on disk
+        if error:
+            print(f"Commit error ({method} {path}): {error}")
+            return 500, {"error": "The change could not be saved"}
+        return status, payload
+
+    def session_user(self, token):
+        """The user logged in with 'token', or None if it is unknown or has expired (which ends the session)."""
+        session = self.sessions.get(token)
+        if session is None:
+            return None
+        now = time.monotonic()
+        if now - session[1] > self.session_timeout:
+            self.sessions.pop(token, None)
+            return None
+        session[1] = now  # Each request keeps the session alive
+        return session[0]
+
+    async def durable(self):
+        """
+        Waits (without blocking the loop) until every write queued so far has been committed.
+        Returns None, or the OSError if a write could not be saved.
+        """
+        if not getattr(self.service.dm, "group_commit", False):
+            return None
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self.service.dm.on_durable(lambda error: loop.call_soon_threadsafe(done.set_result, error))
+        return await done
+
+    # --- Helpers (service thread) ---
+    @staticmethod
+    def field(data, name):
+        value = data.get(name)
+        if value in (None, ""):
+            raise HTTPError(400, f"Missing field '{name}'")
+        return value
+
+    @classmethod
+    def text(cls, data, name):
+        value = cls.field(data, name)
+        if not isinstance(value, str):
+            raise HTTPError(400, f"Field '{name}' must be a string")
+        return value
+
+    @staticmethod
+    def attendee(user):
+        if user is None:
+            raise HTTPError(401, "Login required")
+        if isinstance(user, Admin):
+            raise HTTPError(403, "Attendees only")
+        return user
+
+    @staticmethod
+    def admin(user):
+        if not isinstance(user, Admin):
+            raise HTTPError(403 if user else 401, "Administrator login required")
+        return user
+
+    def pay(self, user, transaction):
+        try:
+            self.service.process_payment(user, transaction)
+        except ValueError as e:  # Nothing was charged
+            raise HTTPError(409, str(e))
+
+    def exhibition_name(self, data):
+        name = self.text(data, "exhibition")
+        if name not in {e.name for e in self.service.exhibitions}:
+            raise HTTPError(404, f"Unknown exhibition '{name}'")
+        return name
+
+    # --- Handlers (service thread): (user, token, body, query, *path args) -> (status, payload) ---
+    def register(self, user, token, data, query):
+        fields = [self.text(data, f) for f in ("name", "email", "password", "phone")]
+        try:
+            registered = self.service.register_user(*fields)  # Same rules as the Register page
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        if not registered:
+            raise HTTPError(409, "Email already registered")
+        return 201, {"email": fields[1].strip().lower()}
+
+    def login(self, user, token, data, query):
+        user = self.service.login(self.text(data, "email"), self.text(data, "password"))
+        if user is None:
+            raise HTTPError(401, "Invalid credentials")
+        now = time.monotonic()
+        for old in [t for t, s in list(self.sessions.items()) if now - s[1] > self.session_timeout]:
+            self.sessions.pop(old, None)  # Forget the sessions that expired without a logout
+        token = secrets.token_urlsafe(24)
+        self.sessions[token] = [user, now]
+        return 200, {"token": token, "role": "admin" if isinstance(user, Admin) else "attendee"}
+
+    def logout(self, user, token, data, query):
+        self.sessions.pop(token, None)
+        return 200, {"logged_out": True}
+
+    def me(self, user, token, data, query):
+        return 200, attendee_json(self.attendee(user), self.service.exhibitions)
+
+    def exhibitions(self, user, token, data, query):
+        return 200, [{"name": e.name, "description": e.description} for e in self.service.exhibitions]
+
+    def workshops(self, user, token, data, query):
+        return 200, [workshop_json(w) for w in self.service.live_workshops()]
+
+    def buy_ticket(self, user, token, data, query):
+        """Buys a new pass; the price is taken from the current configuration, never from the client."""
+        u = self.attendee(user)
+        if u.ticket:
+            raise HTTPError(409, "Attendee already holds a ticket")
+        config = self.service.config
+        if data.get("type") == "all_access":
+            purchase = {'action': 'new_ticket', 'type': "All-Access", 'price': config.price_all_access,
+                        'access': [e.name for e in self.service.exhibitions]}
+        elif data.get("type") == "exhibition":
+            purchase = {'action': 'new_ticket', 'type': "Exhibition Pass", 'price': config.price_exhibition,
+                        'access': [self.exhibition_name(data)]}
+        else:
+            raise HTTPError(400, "Field 'type' must be 'exhibition' or 'all_access'")
+        self.pay(u, purchase)
+        return 201, attendee_json(u, self.service.exhibitions)["ticket"]
+
+    def upgrade(self, user, token, data, query):
+        """Upgrades the current pass, with the same prices the Upgrade Ticket page charges."""
+        u = self.attendee(user)
+        t = u.ticket
+        if not t:
+            raise HTTPError(409, "No ticket to upgrade")
+        if t.ticket_type == "All-Access":
+            raise HTTPError(409, "Ticket is already All-Access")
+        if data.get("type") == "all_access":
+            upgrade = {'action': 'upgrade', 'upgrade_type': 'all_access',
+                       'price': self.service.config.price_all_access - t.price, 'new_exh': None}
+        elif data.get("type") == "add_exhibition":
+            name = self.exhibition_name(data)
+            if t.allows(self.service.exhibitions.bit(name)):
+                raise HTTPError(409, "Exhibition already included")
+            upgrade = {'action': 'upgrade', 'upgrade_type': 'add_exh',
+                       'price': self.service.config.upgrade_add_exh_cost, 'new_exh': name}
+        else:
+            raise HTTPError(400, "Field 'type' must be 'all_access' or 'add_exhibition'")
+        self.pay(u, upgrade)
+        return 200, attendee_json(u, self.service.exhibitions)["ticket"]
+
+    def reserve(self, user, token, data, query):
+        u = self.attendee(user)
+        w_id = self.field(data, "w_id")
+        if type(w_id) is not int and not (isinstance(w_id, str) and w_id.isascii() and w_id.isdigit()):
+            raise HTTPError(400, "Field 'w_id' must be a whole number")  # Not true, 101.9 or 1e400
+        w_id = int(w_id)
+        result = self.service.reserve_workshop(u, w_id)  # "Success" or the reason it failed
+        return (201 if result == "Success" else 409), {"result": result}
+
+    def cancel(self, user, token, data, query, w_id):
+        u = self.attendee(user)
+        if not w_id.isdigit() or not self.service.cancel_workshop(u, int(w_id)):
+            raise HTTPError(404, "No such reservation")
+        return 200, {"cancelled": int(w_id)}
+
+    def dashboard(self, user, token, data, query):
+        self.admin(user)
+        stats = self.service.dashboard_stats()
+        return 200, {"tickets_sold": stats.tickets_sold, "revenue": stats.revenue,
+                     "capacity_load_percent": stats.load_percent()}
+
+    def sales(self, user, token, data, query):
+        """The sales totals of a day or date range; the per-ticket report text only when asked for with log=1."""
+        self.admin(user)
+        try:
+            start = datetime.date.fromisoformat(self.field(query, "date"))
+            end = datetime.date.fromisoformat(query["end"]) if query.get("end") else None
+        except ValueError:
+            raise HTTPError(400, "Dates must use the format YYYY-MM-DD")
+        sold = self.service.sales.range(start, end, log=False) if end else self.service.sales.day(start, log=False)
+        result = {
+            "tickets": len(sold.tickets) if sold else 0,
+            "revenue": sold.revenue if sold else 0,
+            "exhibition_passes": sold.count("Exhibition Pass") if sold else 0,
+            "all_access_passes": sold.count("All-Access") if sold else 0,
+        }
+        if query.get("log") in ("1", "true"):  # Reading every ticket row costs O(tickets sold in the period)
+            result["report"] = self.service.sales_report(start, end)  # Same text as the Sales Report page (or null)
+        return 200, result
+
+
+async def serve(service, host, port, session_timeout=SESSION_TIMEOUT):
+    server = ConferenceServer(service, session_timeout)
+    listener = await asyncio.start_server(server.handle_connection, host, port, backlog=4096)
+    print(f"GreenWave API listening on http://{host}:{port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.executor.shutdown(wait=True)  # Let the running request finish
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the GreenWave HTTP/JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir", default="", help="folder holding the data files")
+    parser.add_argument("--sqlite", action="store_true", help="use the SQLite database instead of the pickle files")
+    parser.add_argument("--group-commit", action="store_true",
+                        help="answer only after the changes are fsynced, syncing concurrent requests together")
+    parser.add_argument("--commit-window", type=float, default=0.002,
+                        help="seconds a group commit waits for more requests to join (with --group-commit)")
+    parser.add_argument("--session-timeout", type=float, default=SESSION_TIMEOUT,
+                        help="seconds a login token stays valid without being used")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        from Database import SQLiteDataManager
+        dm = SQLiteDataManager(data_dir=args.data_dir)
+    else:
+        dm = DataManager(journal=True, write_behind=True, data_dir=args.data_dir, group_commit=args.group_commit,
+                         commit_window=args.commit_window)
+    service = ConferenceService(dm)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.session_timeout))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dm.close()  # Write everything still queued to disk
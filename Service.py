@@ -0,0 +1,519 @@
+import csv
+import io
+import os
+import re
+import threading
+from Model import Workshop, Exhibition, Admin, Attendee, Ticket, Config, AttendeeRegistry, WorkshopRegistry, ExhibitionRegistry, SalesStats, \
+    SequenceAllocator, HolderIndex, RosterIndex
+from Storage import DataManager
+from Columnar import TicketColumns
+
+# =============================================================================
+#                                  SERVICE
+# =============================================================================
+
+
+def format_sales_report(title, label, sold):
+    """
+    Formats the sales report text for a DaySales bucket, writing into one buffer instead of concatenating strings.
+    """
+    sep = "=" * 60  # Separator line
+    thin = "-" * 60  # Thin separator line
+
+    out = io.StringIO()  # Buffered report builder
+    out.write(
+        f"{sep}\n"
+        f" GREENWAVE CONFERENCE - {title}\n"
+        f" Date: {label}\n"
+        f"{sep}\n\n"
+        f" SUMMARY:\n"
+        f" {thin}\n"
+        f" Total Transactions   : {len(sold.tickets)}\n"
+        f" Total Revenue        : AED {sold.revenue}\n"
+        f" Exhibition Passes    : {sold.count('Exhibition Pass')}\n"
+        f" All-Access Passes    : {sold.count('All-Access')}\n"
+        f" {thin}\n\n"
+        f" LOG:\n"
+        f" {thin}\n"
+        f" {'TICKET ID':<20} | {'TYPE':<15} | {'PRICE'}\n"
+        f" {thin}\n"
+    )  # Write the header
+
+    for t in sold.tickets:  # Loop through sold tickets
+        t_type = "Exhibition" if t.ticket_type == "Exhibition Pass" else "All-Access"  # Shorten type name
+        out.write(f" {t.ticket_id:<20} | {t_type:<15} | AED {t.price}\n")  # Write row
+
+    out.write(f" {thin}\n")  # Write footer line
+    return out.getvalue()  # Return the full report text
+
+
+class ConferenceService:
+    """
+    The business logic of the conference system, independent of any user interface.
+    It owns the data (config, exhibitions, workshops, attendees and the derived indexes) and implements
+    every operation with the same return codes the GUI expects. It never imports tkinter, so it can be
+    used headless: by GreenWaveApp, by tests and benchmarks, or behind a server.
+    """
+
+    def __init__(self, dm=None, background_load=False):
+        self.dm = dm if dm is not None else DataManager(journal=True)  # Storage backend
+
+        # Load Data
+        self.config = self.dm.load("config", Config())  # Load global settings or create a new Config object if missing
+        exhibitions = self.dm.load("exhibitions", [])  # Load the list of exhibitions or start with an empty list
+        numbered = all(getattr(e, "bit", None) is not None for e in exhibitions)  # Saved with access bit numbers?
+        self.exhibitions = ExhibitionRegistry(exhibitions)  # Index them by name and number them for access masks
+        self.workshops = WorkshopRegistry(
+            self.dm.load("workshops", []))  # Load the list of workshops and index them by ID
+
+        # The attendee file is by far the largest. In background mode it is read on a separate thread;
+        # anything that needs it waits for it through the 'attendees', 'stats' and 'sales' properties.
+        self._attendees = None  # Attendee registry (None until loading has finished)
+        self._holders = None  # Exhibition -> ticket holder counts (built from the attendees)
+        self._rosters = None  # Workshop -> booked attendees (built from the attendees)
+        self._loaded_attendees = None  # Raw list handed over from the loader thread
+        self._load_error = None  # Error raised on the loader thread, re-raised by wait_for_attendees()
+        self.load_progress = 0  # Percentage of the attendee file read so far
+        self._loader = threading.Thread(target=self._read_attendees, daemon=True)  # Background loader
+        self._loader.start()  # Start reading the attendee file
+        self._stats = self.dm.load("stats", None)  # Dashboard totals (None means they must be counted from the attendees)
+        # Sales reports read the ticket columns on disk; they are usable before the attendees are loaded
+        # as long as they agree with the saved totals, otherwise they are rebuilt once the attendees are in
+        # (kiosks sharing the data folder or the database add their tickets to the same file under a lock)
+        self._sales = TicketColumns(os.path.join(self.dm.data_dir, "tickets.col"),
+                                    lock_path=os.path.join(self.dm.data_dir, "tickets.lock")
+                                    if getattr(self.dm, "shared", False) else None)
+        self._sales_ready = (self._stats is not None and self._sales.rows == self._stats.tickets_sold
+                             and self._sales.revenue_total() == self._stats.revenue)
+        # Workshop IDs also come from a persistent sequence, so IDs of deleted sessions are never handed out again
+        self.workshop_ids = SequenceAllocator(self.dm, "workshop", start=self._next_workshop_id(), block=1)
+        # Ticket numbers come from a persistent sequence; they start above the 4-digit timestamp IDs of older versions
+        self.ticket_numbers = SequenceAllocator(self.dm, "ticket", start=10000)
+
+        # Files from older versions are converted record by record while they are loaded (see FILE FORMAT in Storage.py)
+        if not self.exhibitions:  # Check if the exhibition list is completely empty (first run)
+            self.create_defaults()  # Populate the system with initial default data
+        elif not numbered:  # File from before ticket access masks: keep the bit numbers just assigned
+            self.dm.save("exhibitions", self.exhibitions)
+
+        if not background_load:  # Blocking mode: wait until the attendees are loaded
+            self.wait_for_attendees()
+
+    def _next_workshop_id(self):
+        return max((w.w_id for w in self.workshops), default=100) + 1  # Above every ID in use (101 when empty)
+
+    # --- LOADING ---
+    @property
+    def attendees(self):
+        """The attendee registry; waits for the background loader the first time it is needed."""
+        if self._attendees is None:
+            self.wait_for_attendees()
+        return self._attendees
+
+    @property
+    def stats(self):
+        """The dashboard totals; only waits for the attendees if the totals were never saved."""
+        if self._stats is None:
+            self.wait_for_attendees()
+        return self._stats
+
+    def dashboard_stats(self):
+        """The dashboard totals, including the changes other kiosks saved (shared mode)."""
+        stats = self.stats
+        if getattr(self.dm, "shared", False):
+            self.dm.refresh("stats", stats)
+        return stats
+
+    def live_workshops(self):
+        """The workshops, with the seats other kiosks booked or released (shared mode)."""
+        if getattr(self.dm, "shared", False):
+            self.dm.refresh("workshops", self.workshops)
+        return self.workshops
+
+    def verify_stats(self, repair=False):
+        """
+        Recounts the dashboard totals from the attendees and workshops. Returns {counter: (stored, actual)}
+        for the counters that drifted (empty when consistent); with repair=True the recount is saved instead.
+        """
+        stats = self.dashboard_stats()
+        drift = stats.verify(self.attendees, self.workshops, repair)
+        if drift and repair:
+            self.dm.save("stats", stats)
+        return drift
+
+    @property
+    def sales(self):
+        """The columnar ticket store behind the sales reports; waits for the attendees only if it must be rebuilt."""
+        if not self._sales_ready:
+            self.wait_for_attendees()
+        return self._sales
+
+    @property
+    def holders(self):
+        """The exhibition holder-count index; built once the attendees are loaded."""
+        if self._holders is None:
+            self.wait_for_attendees()
+        return self._holders
+
+    @property
+    def rosters(self):
+        """The workshop roster index; built once the attendees are loaded."""
+        if self._rosters is None:
+            self.wait_for_attendees()
+        return self._rosters
+
+    def is_loading(self):
+        return self._attendees is None and self._loader.is_alive()  # True while the attendee file is being read
+
+    def _read_attendees(self):
+        """Runs on the loader thread: only reads the file."""
+        try:
+            self._loaded_attendees = self.dm.load("attendees", [],
+                                                  progress=self._set_load_progress)  # Read with progress reports
+        except Exception as e:  # File this version must not (or cannot) read: never continue with an empty list
+            self._load_error = e
+
+    def _set_load_progress(self, percent):
+        self.load_progress = percent  # Read by the UI when it polls
+
+    def wait_for_attendees(self):
+        """
+        Blocks until the attendee file has been read, then builds the registry and the indexes that depend on it.
+        """
+        if self._attendees is not None:  # Already done
+            return
+        self._loader.join()  # Wait for the loader thread to finish reading
+        if self._load_error:
+            raise self._load_error
+        attendees = AttendeeRegistry(self._loaded_attendees)  # Index the attendees by email and ticket ID
+        self._loaded_attendees = None  # Release the raw list reference
+        if self._stats is None:  # First run, or data saved before the totals existed
+            self._stats = SalesStats.from_data(attendees, self.workshops)  # Count once from the raw data
+            self.dm.save("stats", self._stats)  # Persist so later starts skip the full scan
+        if not self._sales_ready:  # Missing or out of step with the totals
+            self._sales.rebuild(a.ticket for a in attendees if a.ticket)  # Lay the tickets out by purchase date
+            self._sales_ready = True
+        self._holders = HolderIndex.from_attendees(attendees)  # Count the tickets holding each exhibition
+        self._rosters = RosterIndex.from_attendees(attendees)  # List the attendees booked on each workshop
+        highest = max((Ticket.id_number(a.ticket.ticket_id) for a in attendees if a.ticket), default=0)
+        self.ticket_numbers.start = max(self.ticket_numbers.start, highest + 1)  # Never reissue a number in use
+        self._attendees = attendees  # Publish the registry last, so the properties see a complete state
+
+    def create_defaults(self):
+        """
+        Populates the application with initial seed data.
+        This is run only if the data files are missing or corrupted.
+        """
+        # Default Exhibitions
+        self.exhibitions = ExhibitionRegistry([  # Define a list of hardcoded Exhibition objects for the initial setup
+            Exhibition("Climate Tech Innovations",
+                       "Workshops: Intro to Data (10:30), Renewable Energy (12:30), Smart Agri (14:30)"),
+            Exhibition("Green Policy & Governance",
+                       "Workshops: Policy Sim (09:30), Reporting 101 (12:00), Corp Strategy (14:00)"),
+            Exhibition("Community Action & Impact",
+                       "Workshops: Low-Carbon (12:30), Waste Reduction (14:00), Circular Econ (15:30)")
+        ])
+        # Default Workshops
+        self.workshops = WorkshopRegistry([  # Define a list of hardcoded Workshop objects linked to the exhibitions
+            Workshop(101, "Intro to Climate Data Tools", "10:30 AM", 50, "Climate Tech Innovations"),
+            Workshop(102, "Renewable Energy Systems", "12:30 PM", 50, "Climate Tech Innovations"),
+            Workshop(201, "Policy Simulation Lab", "09:30 AM", 50, "Green Policy & Governance"),
+            Workshop(301, "Building Low-Carbon Communities", "12:30 PM", 50, "Community Action & Impact"),
+            Workshop(302, "Circular Economy", "03:30 PM", 50, "Community Action & Impact")
+        ])
+        self.dm.save("exhibitions", self.exhibitions)  # Save the newly created exhibition list to disk
+        self.dm.save("workshops", self.workshops)  # Save the newly created workshop list to disk
+        if hasattr(self, "workshop_ids"):
+            self.workshop_ids.start = max(self.workshop_ids.start, self._next_workshop_id())
+        self._stats = SalesStats.from_data(self.attendees, self.workshops)  # Recount totals for the seed data
+        self.dm.save("stats", self._stats)  # Save the recounted totals
+
+    # --- ATTENDEE OPERATIONS ---
+    def register_user(self, name, email, password, phone):
+        """
+        Registers a new attendee in the system.
+        Returns True if successful, or False if the email is already taken.
+        Raises ValueError with the message to show if a field is missing or invalid (checked for every client).
+        """
+        if not all(isinstance(v, str) for v in (name, email, password, phone)):  # e.g. a list sent as JSON
+            raise ValueError("All fields must be text.")
+        name, phone = name.strip(), phone.strip()  # Remove leading/trailing whitespace
+        # LOGIC FIX: Normalize email to lowercase
+        email_clean = email.strip().lower()  # Remove whitespace and convert email to lowercase for consistent comparisons
+
+        if not (name and email_clean and phone and password):  # Check if any field is empty
+            raise ValueError("All fields are required.")
+        if not re.match(r"^[a-zA-Z\s]+$", name):  # Name: letters and spaces only
+            raise ValueError("Name must contain only letters.")
+        if not (phone.isdigit() and 8 <= len(phone) <= 15):  # Phone: digits only, length 8-15
+            raise ValueError("Phone must be 8-15 digits.")
+        if not re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email_clean):  # Standard email format
+            raise ValueError("Invalid Email Format.")
+        if len(password) < 4:  # Minimum password length
+            raise ValueError("Password must be at least 4 characters long.")
+
+        if self.attendees.find_by_email(email_clean):  # Look up the email index to check for a duplicate
+            return False  # Return False to indicate registration failure due to duplicate email
+
+        new_user = Attendee(name, email_clean, password, phone)  # Create a new Attendee object
+        self.attendees.append(new_user)  # Add it to the list of registered attendees
+        self.dm.put("attendees", self.attendees, new_user)  # Persist only the new attendee record
+        return True  # Return True to indicate successful registration
+
+    def login(self, email, password):
+        """
+        Authenticates a user against the stored records.
+        Returns the Admin or Attendee object on success, or None if the credentials do not match.
+        """
+        # LOGIC FIX: Normalize email to lowercase
+        email_clean = email.strip().lower()  # Clean the input email for consistent matching
+
+        # Admin check (hardcoded)
+        if email_clean == "admin" and password == "admin123":  # specific check for the hardcoded admin credentials
+            return Admin()  # Return a new Admin session user
+
+        u = self.attendees.find_by_email(email_clean)  # Look up the attendee record by email
+        if u and u.password == password:  # Check if the password matches the record
+            return u  # Return the matched attendee
+        return None  # No matching credentials were found
+
+    def update_profile(self, user, name, phone, password=None):
+        """
+        Changes the name, phone and (optionally) password of an attendee and saves the record.
+        """
+        user.name = name  # Update Name
+        user.phone = phone  # Update Phone
+        if password:  # Only update password if a new one was entered
+            user.password = password
+        self.dm.put("attendees", self.attendees, user)  # Save the changed record
+
+    def process_payment(self, user, data):
+        """
+        Finalizes a transaction described by 'data' (the purchase page's transaction dictionary).
+        Handles both creating new tickets and upgrading existing ones.
+        Raises ValueError with the message to show, before anything is charged, if an exhibition being bought
+        no longer exists (e.g. an administrator deleted it after the page was shown).
+        """
+        if data['action'] == 'new_ticket' and data['type'] != "All-Access":  # All-Access covers whatever exists
+            if any(self.exhibitions.bit(name) is None for name in data['access']):
+                raise ValueError("The selected exhibition is no longer available.")
+        new_bit = None
+        if data['action'] == 'upgrade' and data['upgrade_type'] == 'add_exh':
+            new_bit = self.exhibitions.bit(data['new_exh'])  # Bit number of the exhibition being added
+            if new_bit is None:
+                raise ValueError("The selected exhibition is no longer available.")
+
+        if data['action'] == 'new_ticket':  # Check if the transaction is for buying a fresh ticket
+            ticket_id = Ticket.make_id(data['type'], self.ticket_numbers.next())  # Unique, even across processes
+            user.ticket = Ticket(data['type'], data['price'], self.exhibitions.mask_of(data['access']),
+                                 data['type'] == "All-Access", ticket_id)  # Create a new Ticket object and assign it
+            self.attendees.index_ticket(user)  # Make the new ticket ID searchable
+            self.stats.on_ticket_purchase(data['price'])  # Count the sale in the dashboard totals
+            self.sales.add_ticket(user.ticket)  # Append the ticket to the sales columns
+            self.holders.add_ticket(user.ticket)  # Count it for the exhibitions it grants
+
+        elif data['action'] == 'upgrade':  # Check if the transaction is for upgrading an existing ticket
+            old_type = user.ticket.ticket_type  # Remember the type for the sales index
+            self.holders.remove_ticket(user.ticket)  # Uncount the old access, re-added below
+            # Update existing ticket
+            if data['upgrade_type'] == 'all_access':  # If upgrading to the premium All-Access tier
+                user.ticket.ticket_type = "All-Access"  # Update the ticket type string description
+                user.ticket.grant_all()  # Grant access to all exhibitions
+            elif data['upgrade_type'] == 'add_exh':  # If upgrading by adding a single exhibition
+                user.ticket.grant(new_bit)  # Set the exhibition's bit in the mask
+
+            # Update price paid tracker if needed (simplification: just updating object)
+            self.holders.add_ticket(user.ticket)  # Count the new access
+            user.ticket.price += data['price']  # Add the upgrade cost to the total price tracked on the ticket
+            self.stats.on_upgrade(data['price'])  # Add the upgrade payment to the revenue total
+            self.sales.on_upgrade(user.ticket, data['price'], old_type)  # Update its row in the sales columns
+
+        self.dm.put("attendees", self.attendees, user)  # Persist the updated user (and their ticket)
+        self.dm.save("stats", self.stats)  # Persist the updated totals
+        return True  # Return True to indicate the payment logic completed successfully
+
+    def reserve_workshop(self, user, w_id):
+        """
+        Attempts to reserve a workshop seat for 'user'.
+        Performs validation checks for existence, capacity, duplication, and ticket scope.
+        """
+        ws = self.workshops.get(w_id)  # Look up the workshop object by its ID
+        u = user
+
+        if not ws or not u or not u.ticket: return "Error"  # Fail if workshop doesn't exist or user has no ticket
+        if ws.is_full(): return "Workshop Full"  # Fail if the workshop has reached maximum capacity
+        if u.has_reservation(w_id): return "Already Booked"  # Fail if user already reserved this
+        if not u.ticket.allows(self.exhibitions.bit(ws.exhibition_name)): return "Invalid Pass Scope"  # Fail if ticket doesn't cover this topic
+
+        def book():  # Runs once the seat is taken
+            u.add_reservation(w_id)  # Add the workshop ID to the user's list of reservations
+            self.rosters.add(w_id, u)  # Put the user on the workshop's roster
+            self.stats.on_reserve()  # Count the seat in the dashboard totals
+
+        # Check the capacity again and take the seat in one step in the storage layer, so that other
+        # processes sharing the data cannot take the last seat between the check and the increment;
+        # the storage also persists the attendee record and the totals with the seat
+        if not self.dm.book_seat(self.workshops, ws, self.attendees, u, self.stats, book):
+            return "Workshop Full"  # Another kiosk took the last seat
+        return "Success"  # Return success string
+
+    def cancel_workshop(self, user, w_id):
+        """
+        Cancels a user's reservation for a specific workshop.
+        Restores the workshop capacity by decrementing the 'booked' count.
+        """
+        u = user
+        ws = self.workshops.get(w_id)  # Look up the workshop object by ID
+
+        # Safety Check: Ensure workshop and user exist
+        if not ws or not u:
+            return False
+
+        if not u.has_reservation(w_id):  # O(1) membership check
+            return False  # Return failure (reservation not found)
+
+        def cancel():  # Runs once the seat is given back
+            u.remove_reservation(w_id)  # Remove from User's reservation list
+            self.rosters.remove(w_id, u)  # Take the user off the workshop's roster
+            self.stats.on_cancel()  # Release the seat in the dashboard totals
+
+        # The storage layer gives the seat back and persists the attendee record and the totals with it
+        return self.dm.cancel_seat(self.workshops, ws, self.attendees, u, self.stats, cancel)
+
+    # --- ADMIN OPERATIONS ---
+    def comp_upgrade(self, user):
+        """
+        Applies a free All-Access upgrade to an attendee's ticket (administrator tool).
+        Returns False if the attendee has no ticket.
+        """
+        if not user or not user.ticket:
+            return False
+        old_type = user.ticket.ticket_type  # Remember the type for the sales index
+        self.holders.remove_ticket(user.ticket)  # All-Access no longer pins its exhibitions
+        user.ticket.ticket_type = "All-Access"  # Change type
+        user.ticket.grant_all()  # Grant full access
+        self.sales.on_upgrade(user.ticket, 0, old_type)  # Change its type in the sales columns (free of charge)
+        self.dm.put("attendees", self.attendees, user)  # Save the changed record
+        return True
+
+    def save_config(self):
+        self.dm.save("config", self.config)  # Persist the (changed) pricing configuration
+
+    def add_exhibition(self, name, description):
+        self.exhibitions.append(Exhibition(name, description))  # Create object (gets the next free bit number)
+        self.dm.save("exhibitions", self.exhibitions)  # Save
+
+    def exhibition_in_use(self, name):
+        """Returns True if any Exhibition Pass includes the exhibition 'name' (O(1), from the holder index)."""
+        return self.exhibition_holder_count(name) > 0
+
+    def exhibition_holder_count(self, name):
+        bit = self.exhibitions.bit(name)
+        return self.holders.count(bit) if bit is not None else 0  # Tickets that would lose this exhibition
+
+    def exhibition_holders(self, name):
+        """
+        Lists the attendees whose Exhibition Pass includes the exhibition 'name'.
+        This walks the attendees, so it is only run when an administrator asks for the list.
+        """
+        bit = self.exhibitions.bit(name)
+        if bit is None or not self.holders.count(bit):
+            return []
+        return [u for u in self.attendees
+                if u.ticket and not u.ticket.all_access and (u.ticket.access_mask >> bit) & 1]
+
+    def remove_exhibition(self, index):
+        """Removes the exhibition at 'index'. Raises ValueError while an Exhibition Pass still includes it."""
+        name = self.exhibitions[index].name
+        if self.exhibition_in_use(name):  # Its holders would lose access they paid for
+            raise ValueError(f"Cannot delete '{name}': it is active on {self.exhibition_holder_count(name)} ticket(s).")
+        self.exhibitions.pop(index)  # Remove
+        self.dm.save("exhibitions", self.exhibitions)  # Save
+
+    def add_workshop(self, title, time, capacity, exhibition_name):
+        """Creates a new workshop session and saves it. Returns the new Workshop."""
+        return self.add_workshops([(title, time, capacity, exhibition_name)])[0]
+
+    def add_workshops(self, rows):
+        """
+        Creates one workshop per (title, time, capacity, exhibition_name) row with a single ID allocation.
+        Only the new records are written, so sessions other kiosks added meanwhile are kept.
+        Returns the new Workshop objects.
+        """
+        rows = list(rows)
+        added = []
+        for wid, (title, time, capacity, exhibition_name) in zip(self.workshop_ids.take(len(rows)), rows):
+            w = Workshop(wid, title, time, capacity, exhibition_name)  # Create Object with a never-used ID
+            self.workshops.append(w)  # Add to list
+            self.stats.on_workshop_added(w)  # Add its seats to the dashboard totals
+            added.append(w)
+            self.dm.put("workshops", self.workshops, w)  # Save the new record
+        self.dm.save("stats", self.stats)  # Save totals
+        return added
+
+    def import_schedule(self, path):
+        """
+        Adds the sessions listed in a CSV file with the columns title, time, capacity, exhibition
+        (a header row with these names is optional). All rows are checked first, so a bad file adds nothing.
+        Returns the new Workshop objects; raises ValueError describing the first invalid row.
+        """
+        rows = []
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for line_no, record in enumerate(csv.reader(f), 1):
+                if not any(cell.strip() for cell in record):
+                    continue  # Skip blank lines
+                if line_no == 1 and [c.strip().lower() for c in record[:4]] == ["title", "time", "capacity", "exhibition"]:
+                    continue  # Header row
+                if len(record) < 4:
+                    raise ValueError(f"Line {line_no}: expected title, time, capacity, exhibition")
+                title, time, capacity, exhibition = (cell.strip() for cell in record[:4])
+                if not title or not time:
+                    raise ValueError(f"Line {line_no}: title and time are required")
+                if not capacity.isdigit() or int(capacity) <= 0:
+                    raise ValueError(f"Line {line_no}: capacity must be a positive whole number")
+                if not self.exhibitions.get(exhibition):
+                    raise ValueError(f"Line {line_no}: unknown exhibition '{exhibition}'")
+                rows.append((title, time, int(capacity), exhibition))
+        return self.add_workshops(rows)
+
+    def workshop_booking_count(self, w_id):
+        """Returns the number of attendees holding a reservation for workshop 'w_id' (O(1), from the roster index)."""
+        return self.rosters.count(w_id)
+
+    def workshop_roster(self, w_id):
+        return self.rosters.roster(w_id)  # Attendees booked on workshop 'w_id', in booking order
+
+    def export_roster(self, w_id, path):
+        """
+        Writes the roster of workshop 'w_id' to a CSV file (name, email, phone, ticket ID).
+        Returns the number of attendees written.
+        """
+        roster = self.workshop_roster(w_id)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "email", "phone", "ticket_id"])  # Header row
+            writer.writerows([u.name, u.email, u.phone, u.ticket.ticket_id if u.ticket else ""] for u in roster)
+        return len(roster)
+
+    def remove_workshop(self, index):
+        removed = self.workshops.pop(index)  # Remove
+        self.stats.on_workshop_removed(removed)  # Remove its seats from the dashboard totals
+        self.dm.delete("workshops", self.workshops, removed.w_id)  # Save the removal of this record only
+        self.dm.save("stats", self.stats)  # Save totals
+        return removed
+
+    def sales_report(self, start, end=None):
+        """
+        Returns the formatted sales report for the purchase date 'start' (or the range 'start'..'end'),
+        or None when nothing was sold in that period.
+        """
+        if end is not None:
+            sold = self.sales.range(start, end)  # Merged bucket for the whole range
+            title, label = "SALES REPORT", f"{start} to {end}"  # Generic title for multi-day reports
+        else:
+            sold = self.sales.day(start)  # Bucket of a single day
+            title, label = "DAILY SALES REPORT", str(start)
+
+        if not sold or not sold.tickets:  # Nothing was sold
+            return None
+        return format_sales_report(title, label, sold)
@@ -0,0 +1,1303 @@
+import abc
+import array
+import gc
+import glob
+import io
+import marshal
+import pickle
+import os
+import struct
+import sys
+import datetime
+import zlib
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from Model import Workshop, Exhibition, Ticket, Attendee, Config, SalesStats, Registry, ExhibitionRegistry
+
+try:
+    import fcntl  # POSIX file locks
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# =============================================================================
+#                                  STORAGE
+# =============================================================================
+# Everything that reads and writes the data folder: DataManager (snapshots, journal, write-behind thread,
+# group commit, shards and the shared-folder locking), the file format with its codecs and migrations,
+# and the helpers below. The model classes it stores live in Model.py.
+
+class ProgressReader:
+    """
+    Wraps a binary file and reports the percentage read to a callback while pickle consumes it.
+    The callback is only called when the whole-number percentage changes.
+    """
+
+    def __init__(self, f, total, callback):
+        self.f = f  # The underlying file object
+        self.total = max(total, 1)  # File size in bytes (avoid dividing by zero for empty files)
+        self.callback = callback  # Function receiving the percentage
+        self.last = -1  # Last percentage reported
+
+    def _report(self):
+        percent = self.f.tell() * 100 // self.total  # How much of the file has been consumed
+        if percent != self.last:
+            self.last = percent
+            self.callback(percent)
+
+    def read(self, n=-1):
+        data = self.f.read(n)
+        self._report()
+        return data
+
+    def readinto(self, buffer):
+        n = self.f.readinto(buffer)
+        self._report()
+        return n
+
+    def readline(self):
+        data = self.f.readline()
+        self._report()
+        return data
+
+    def peek(self, n=0): return self.f.peek(n)  # Lets the unpickler prefetch in large chunks
+
+
+class FileLock:
+    """
+    Exclusive lock on a file, shared by all processes using the same data folder (e.g. several kiosks).
+    Use it as a context manager; entering blocks until no other process or thread holds the lock.
+    """
+
+    def __init__(self, path):
+        self.path = path  # Lock file (created if missing, its content is never used)
+        self._f = None  # Open handle while the lock is held
+
+    def __enter__(self):
+        self._f = open(self.path, "a+b")  # Each holder opens its own handle, so threads exclude each other too
+        if fcntl:
+            fcntl.flock(self._f.fileno(), fcntl.LOCK_EX)
+        else:
+            self._f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._f.fileno(), msvcrt.LK_LOCK, 1)  # Lock the first byte
+                    break
+                except OSError:  # LK_LOCK gives up after 10 seconds; keep waiting
+                    continue
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl:
+            fcntl.flock(self._f.fileno(), fcntl.LOCK_UN)
+        else:
+            self._f.seek(0)
+            msvcrt.locking(self._f.fileno(), msvcrt.LK_UNLCK, 1)
+        self._f.close()
+        self._f = None
+
+
+# =============================================================================
+#                                FILE FORMAT
+# =============================================================================
+# Every data file is stored in the binary record format below. Older versions (and DataManager(binary=False))
+# wrote pickle files instead: they start with a header tuple (FORMAT_MAGIC, version, count); a list is stored
+# as 'count' records in pickled chunks of up to FORMAT_CHUNK records, any other object (config, stats,
+# sequences) as one pickle with count None. Files written before the header existed hold a single pickle
+# and are version 0.
+# When a file is older than FORMAT_VERSION, every record passes through the steps MIGRATIONS[v][key]
+# of each newer version v as it is read, and the file is rewritten in the current format once.
+# Loading a current file runs no migration code at all.
+
+FORMAT_MAGIC = "GREENWAVE"
+FORMAT_VERSION = 2  # 1: header and chunks, 2: binary records
+FORMAT_CHUNK = 1024  # Records per pickle in list files
+
+
+class FormatError(Exception):
+    """Raised for a data file this version must not read: written by a newer version, with pickle, or damaged."""
+
+
+class MigrationContext:
+    """
+    What migration steps may look up besides the record they convert; loaded on first use.
+    """
+
+    def __init__(self, dm):
+        self.dm = dm  # DataManager being loaded from
+        self._exhibitions = None
+
+    @property
+    def exhibitions(self):
+        """The exhibitions, numbered exactly as ConferenceService numbers them."""
+        if self._exhibitions is None:
+            self._exhibitions = ExhibitionRegistry(self.dm.load("exhibitions", []))
+        return self._exhibitions
+
+
+def _v1_exhibition(e, ctx):
+    """The first release stored exhibitions without a description (they used to be reset to the defaults)."""
+    if not hasattr(e, "description"):
+        e.description = ""  # Keep the exhibition, with an empty description
+    return e
+
+
+def _v1_attendee(a, ctx):
+    """Reservations stored as full Workshop copies become workshop IDs; name lists in tickets become access masks."""
+    if any(hasattr(r, "w_id") for r in a.reservations):
+        a.reservations = [getattr(r, "w_id", r) for r in a.reservations]  # Keep only the IDs
+    t = a.ticket
+    if t and hasattr(t, "legacy_names"):  # Set by Ticket.__setstate__ for the old format
+        t.access_mask = ctx.exhibitions.mask_of(t.legacy_names)  # Names of deleted exhibitions are dropped
+        del t.legacy_names
+    return a
+
+
+MIGRATIONS = {
+    1: {"exhibitions": _v1_exhibition, "attendees": _v1_attendee},  # Version 0 (no header) -> 1
+    2: {},  # Same records, only written in the binary format
+}
+
+# Binary record format: a block is a header (BINARY_MAGIC, format version, record count, section count)
+# followed by length-prefixed sections: a marshal string table (each distinct string stored once, the records
+# refer to it by index) and one little-endian array per field. Reading a block only creates strings, numbers
+# and the model objects themselves, so a data file can never run code when it is loaded.
+# Journal records are tagged b"GP" (put: a block of one record) or b"GD" (delete: the marshalled record ID).
+
+BINARY_MAGIC = b"GWBF"
+_BLOCK_HEADER = struct.Struct("<4sHIH")  # Magic, format version, record count, section count
+_SECTION = struct.Struct("<I")  # Byte length of the following section
+_LOG_RECORD = struct.Struct("<2sI")  # Journal record tag, byte length of the payload
+
+
+def _to_array(typecode, values):
+    column = array.array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()  # Files are little-endian on every platform
+    return column
+
+
+def _from_array(typecode, blob):
+    column = array.array(typecode)
+    column.frombytes(blob)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+class RecordCodec(abc.ABC):
+    """
+    Fixed-schema binary encoding of one record type. Subclasses turn a list of records into columns
+    (arrays of numbers and string-table indexes) and build the records back from them.
+    """
+    sections = 0  # Number of columns written by columns()
+    single = False  # True for a key holding one object instead of a list (stored as a block of one record)
+
+    def write(self, f, records):
+        """Writes 'records' to the binary file 'f' as one block."""
+        table = {}  # String -> position in the string table
+        ref = lambda s: table.setdefault(s, len(table))  # Index of a string, adding it on first use
+        columns = self.columns(records, ref)
+        f.write(_BLOCK_HEADER.pack(BINARY_MAGIC, FORMAT_VERSION, len(records), len(columns)))
+        for section in [marshal.dumps(list(table))] + columns:
+            f.write(_SECTION.pack(len(section)))
+            f.write(section)
+
+    def encode(self, records):
+        out = io.BytesIO()
+        self.write(out, records)
+        return out.getvalue()
+
+    def read(self, f):
+        """Reads one block from the binary file 'f'. Returns (records, format version)."""
+        head = f.read(_BLOCK_HEADER.size)
+        if len(head) != _BLOCK_HEADER.size:
+            raise ValueError("Truncated block header")
+        magic, version, count, sections = _BLOCK_HEADER.unpack(head)
+        if magic != BINARY_MAGIC or sections != self.sections:
+            raise ValueError("Not a block of this record type")
+        if version > FORMAT_VERSION:
+            raise FormatError(f"Block has format version {version}; this version reads up to {FORMAT_VERSION}")
+        blobs = []
+        for _ in range(sections + 1):  # The string table, then the columns
+            size, = _SECTION.unpack(f.read(_SECTION.size))
+            blob = f.read(size)
+            if len(blob) != size:
+                raise ValueError("Truncated block")
+            blobs.append(blob)
+        strings = marshal.loads(blobs[0])
+        if type(strings) is not list:
+            raise ValueError("Bad string table")
+        collecting = gc.isenabled()
+        gc.disable()  # The records hold no reference cycles; skip the collections triggered by creating them
+        try:
+            return self.build(count, strings, blobs[1:]), version
+        finally:
+            if collecting:
+                gc.enable()
+
+    def decode(self, blob):
+        return self.read(io.BytesIO(blob))[0]
+
+    @abc.abstractmethod
+    def columns(self, records, ref):
+        """Returns the sections (bytes) holding 'records'; ref(string) gives a string's table index."""
+
+    @abc.abstractmethod
+    def build(self, count, strings, columns):
+        """Returns the 'count' records held by the sections 'columns'."""
+
+
+class AttendeeCodec(RecordCodec):
+    """Attendees with their ticket and reservations."""
+    sections = 13
+
+    def columns(self, records, ref):
+        # The writer thread encodes records that the UI thread may be changing: read every field of a record
+        # once, in a single pass, so the columns of one block always agree with each other
+        names, emails, passwords, phones, res_counts, res_ids, flags = [], [], [], [], [], [], []
+        types, ticket_ids, prices, ordinals, mask_sizes, masks = [], [], [], [], [], []
+        for a in records:
+            names.append(ref(a.name))
+            emails.append(ref(a.email))
+            passwords.append(ref(a.password))
+            phones.append(ref(a.phone))
+            reservations = list(a.reservations)  # Copy before counting, so the count matches the IDs written
+            res_counts.append(len(reservations))
+            res_ids.extend(reservations)
+            t = a.ticket
+            if not t:
+                flags.append(0)
+                continue
+            price, mask = t.price, t.access_mask
+            flags.append(1 | (2 if t.all_access else 0) | (4 if isinstance(price, float) else 0))
+            types.append(ref(t.ticket_type))
+            ticket_ids.append(ref(t.ticket_id))
+            prices.append(price)
+            ordinals.append(t.purchase_date.toordinal())
+            mask = mask.to_bytes((mask.bit_length() + 7) // 8, "little")  # As many bytes as the mask needs
+            mask_sizes.append(len(mask))
+            masks.append(mask)
+        return [
+            _to_array("I", names).tobytes(),
+            _to_array("I", emails).tobytes(),
+            _to_array("I", passwords).tobytes(),
+            _to_array("I", phones).tobytes(),
+            _to_array("I", res_counts).tobytes(),
+            _to_array("q", res_ids).tobytes(),
+            _to_array("B", flags).tobytes(),
+            _to_array("I", types).tobytes(),
+            _to_array("I", ticket_ids).tobytes(),
+            _to_array("d", prices).tobytes(),
+            _to_array("I", ordinals).tobytes(),
+            _to_array("H", mask_sizes).tobytes(),
+            b"".join(masks),
+        ]
+
+    def build(self, count, strings, columns):
+        names, emails, passwords, phones = ([strings[i] for i in _from_array("I", blob)] for blob in columns[:4])
+        res_counts = _from_array("I", columns[4])
+        res_ids = _from_array("q", columns[5]).tolist()
+        flags = _from_array("B", columns[6])
+        type_refs = _from_array("I", columns[7])
+        shared_types = {i: sys.intern(strings[i]) for i in set(type_refs)}  # One string object per ticket type
+        types = [shared_types[i] for i in type_refs]
+        ticket_ids = [strings[i] for i in _from_array("I", columns[8])]
+        prices = _from_array("d", columns[9]).tolist()
+        ordinals = _from_array("I", columns[10])
+        dates = {o: datetime.date.fromordinal(o) for o in set(ordinals)}  # One date object per purchase day
+        mask_sizes = _from_array("H", columns[11])
+        mask_bytes = columns[12]
+        holders = sum(f & 1 for f in flags)
+        if (any(len(c) != count for c in (names, emails, passwords, phones, res_counts, flags))
+                or sum(res_counts) != len(res_ids) or sum(mask_sizes) != len(mask_bytes)
+                or any(len(c) != holders for c in (types, ticket_ids, prices, ordinals, mask_sizes))):
+            raise FormatError("Inconsistent attendee block: its columns do not have matching lengths")
+
+        records = []
+        new = object.__new__
+        r = t = m = 0  # Positions in the reservation, ticket and mask columns
+        for k in range(count):
+            a = new(Attendee)
+            a.name, a.email, a.password, a.phone = names[k], emails[k], passwords[k], phones[k]
+            n = res_counts[k]
+            a.reservations = res_ids[r:r + n]
+            a.reserved_ids = set(a.reservations)
+            r += n
+            f = flags[k]
+            if f & 1:  # Holds a ticket
+                ticket = new(Ticket)
+                ticket.ticket_type, ticket.ticket_id = types[t], ticket_ids[t]
+                ticket.price = prices[t] if f & 4 else int(prices[t])
+                ticket.purchase_date = dates[ordinals[t]]
+                ticket.all_access = bool(f & 2)
+                size = mask_sizes[t]
+                ticket.access_mask = int.from_bytes(mask_bytes[m:m + size], "little")
+                m += size
+                t += 1
+                a.ticket = ticket
+            else:
+                a.ticket = None
+            records.append(a)
+        return records
+
+
+class WorkshopCodec(RecordCodec):
+    """Workshop sessions."""
+    sections = 6
+
+    def columns(self, records, ref):
+        return [
+            _to_array("q", [w.w_id for w in records]).tobytes(),
+            _to_array("I", [ref(w.title) for w in records]).tobytes(),
+            _to_array("I", [ref(w.time) for w in records]).tobytes(),
+            _to_array("q", [w.capacity for w in records]).tobytes(),
+            _to_array("q", [w.booked for w in records]).tobytes(),
+            _to_array("I", [ref(w.exhibition_name) for w in records]).tobytes(),
+        ]
+
+    def build(self, count, strings, columns):
+        ids, capacities, booked = (_from_array("q", columns[i]) for i in (0, 3, 4))
+        titles, times, exhibitions = ([strings[i] for i in _from_array("I", columns[i])] for i in (1, 2, 5))
+        records = []
+        for k in range(count):
+            w = object.__new__(Workshop)
+            w.w_id, w.title, w.time = ids[k], titles[k], times[k]
+            w.capacity, w.booked = capacities[k], booked[k]
+            w.exhibition_name = sys.intern(exhibitions[k])  # Share the name string with the exhibition
+            records.append(w)
+        return records
+
+
+class ExhibitionCodec(RecordCodec):
+    """Exhibitions with their access bit number."""
+    sections = 3
+
+    def columns(self, records, ref):
+        return [
+            _to_array("I", [ref(e.name) for e in records]).tobytes(),
+            _to_array("I", [ref(e.description) for e in records]).tobytes(),
+            _to_array("q", [-1 if e.bit is None else e.bit for e in records]).tobytes(),  # -1: not numbered yet
+        ]
+
+    def build(self, count, strings, columns):
+        names, descriptions = ([strings[i] for i in _from_array("I", columns[i])] for i in (0, 1))
+        bits = _from_array("q", columns[2])
+        if any(len(c) != count for c in (names, descriptions, bits)):
+            raise FormatError("Inconsistent exhibition block: its columns do not have matching lengths")
+        records = []
+        for k in range(count):
+            e = object.__new__(Exhibition)
+            e.name, e.description = sys.intern(names[k]), descriptions[k]
+            e.bit = bits[k] if bits[k] >= 0 else None
+            records.append(e)
+        return records
+
+
+class StateCodec(RecordCodec):
+    """
+    A single object whose attributes are all numbers (config, dashboard totals), or a dictionary of numbers
+    (the ID sequences) when 'cls' is None: the names go to the string table, the values to one marshal list.
+    """
+    sections = 2
+    single = True
+
+    def __init__(self, cls=None):
+        self.cls = cls  # Class of the stored object (None for a plain dictionary)
+
+    def columns(self, records, ref):
+        state = records[0] if self.cls is None else vars(records[0])
+        names = list(state)
+        return [_to_array("I", [ref(n) for n in names]).tobytes(), marshal.dumps([state[n] for n in names])]
+
+    def build(self, count, strings, columns):
+        names = [strings[i] for i in _from_array("I", columns[0])]
+        values = marshal.loads(columns[1])
+        if (count != 1 or type(values) is not list or len(values) != len(names)
+                or any(type(v) not in (int, float) for v in values)):
+            raise FormatError("Inconsistent block: expected one object of named numbers")
+        if self.cls is None:
+            return [dict(zip(names, values))]
+        obj = self.cls()  # Attributes missing from the file keep their defaults
+        for name, value in zip(names, values):
+            setattr(obj, name, value)
+        return [obj]
+
+
+BINARY_CODECS = {  # Keys stored in the binary format (all of them)
+    "attendees": AttendeeCodec(),
+    "workshops": WorkshopCodec(),
+    "exhibitions": ExhibitionCodec(),
+    "config": StateCodec(Config),
+    "stats": StateCodec(SalesStats),
+    "sequences": StateCodec(),
+}
+SHARDED_KEYS = ("attendees",)  # Keys split over several files by DataManager(shards=N)
+
+
+# =============================================================================
+#                                DATA MANAGER
+# =============================================================================
+
+class DataManager:
+    """
+    Manages the persistence of application data to the local file system (the files of 'data_dir').
+    The optional modes (journal, write-behind, shared folder, shards, group commit) are described on the
+    methods that implement them.
+    """
+
+    def __init__(self, journal=False, snapshot_every=500, write_behind=False, coalesce_window=0.5, data_dir="",
+                 shared=False, binary=True, shards=16, group_commit=False, commit_window=0.002, read_pickle=False):
+        self.files = {
+            "attendees": "attendees.pkl",  # Map the logical key 'attendees' to its physical filename
+            "workshops": "workshops.pkl",  # Map the logical key 'workshops' to its physical filename
+            "exhibitions": "exhibitions.pkl",  # Map the logical key 'exhibitions' to its physical filename
+            "config": "config.pkl",  # Map the logical key 'config' to its physical filename
+            "stats": "stats.pkl",  # Map the logical key 'stats' (dashboard aggregates) to its physical filename
+            "sequences": "sequences.pkl"  # Map the logical key 'sequences' (ID counters) to its physical filename
+        }
+        self.logs = {
+            "attendees": "attendees.log",  # Append-only journal for attendee changes (registration, tickets, bookings)
+            "workshops": "workshops.log"  # Append-only journal for workshop changes (booking counts)
+        }
+        self.data_dir = data_dir  # Folder holding the data files
+        self.files = {key: os.path.join(data_dir, name) for key, name in self.files.items()}  # Place files in data_dir
+        self.logs = {key: os.path.join(data_dir, name) for key, name in self.logs.items()}  # Place logs in data_dir
+        self.shared = shared  # True when other processes use the same data folder
+        self.binary = binary  # True to write the data files without pickle (the file names stay the same)
+        self.read_pickle = read_pickle or not binary  # True to also unpickle data files (trusted files only)
+        self.shards = max(1, shards)  # Number of files the attendees are split over
+        self.dirty = {key: set() for key in SHARDED_KEYS}  # Shards changed since their last write
+        self.lock_path = os.path.join(data_dir, "workshops.lock")  # Serializes workshop and totals access between processes
+        self.attendee_lock = os.path.join(data_dir, "attendees.lock")  # Serializes attendee file access between processes
+        self.sequence_lock = os.path.join(data_dir, "sequences.lock")  # Serializes ID allocation between processes
+        self.record_ids = {
+            "attendees": lambda a: a.email,  # Attendees are identified by their (normalized) email
+            "workshops": lambda w: w.w_id  # Workshops are identified by their numeric ID
+        }
+        self.journal = journal  # When True, put()/delete() append to the log instead of rewriting the snapshot
+        self.snapshot_every = snapshot_every  # Number of log records after which the log is compacted
+        self.log_counts = {key: 0 for key in self.logs}  # Track how many records each log holds since its snapshot
+        self._stats_base = None  # Counters of the totals as last read or written (shared mode, see _merge_stats)
+
+        self.group_commit = group_commit  # When True, writes are fsynced in groups (implies write-behind)
+        self.commit_window = commit_window  # Seconds the writer waits for more writes to join a group
+        self._submitted = 0  # Writes queued so far
+        self._done = 0  # Writes queued so far that the writer has finished with (on disk or failed)
+        self._durable = 0  # Writes queued so far that are on disk
+        self._error = None  # OSError for the first write that could not be saved (reported from then on)
+        self._waiters = []  # (write count, callback) pairs waiting for on_durable()
+        self._committed = threading.Condition()  # Guards the five above and wakes sync() callers
+
+        self.write_behind = write_behind or group_commit  # When True, writes happen on the background writer thread
+        self.coalesce_window = coalesce_window  # Seconds a queued save waits for newer saves of the same key
+        self._queue = queue.Queue()  # Pending write operations for the writer thread
+        self._writer = None  # Background writer thread (only in write-behind mode)
+        if self.write_behind:
+            self._writer = threading.Thread(target=self._run_committer if group_commit else self._run_writer,
+                                            daemon=True)
+            self._writer.start()
+
+    def _is_shared(self, key):
+        """
+        True if 'key' is read and written under a file lock. In shared mode several processes (kiosks) use the
+        same data folder: seats are taken with reserve_seat() on the count stored on disk, each process adds the
+        changes it made to the dashboard totals on disk (see _merge_stats), and changed attendee and workshop
+        records are appended to the journal right away and compacted from the files (see _compact_shared),
+        so no process overwrites the records of another.
+        """
+        return self.shared and key in ("attendees", "workshops", "stats")  # Not config, exhibitions or sequences
+
+    def _lock(self, key):
+        return FileLock(self.attendee_lock if key == "attendees" else self.lock_path)  # See _is_shared()
+
+    def save(self, key, data, shards=None):
+        """
+        Writes the whole data object. For a sharded key, 'shards' limits the write to those shard numbers
+        (their records are taken from 'data'); by default every shard is written.
+        In write-behind mode the write is handed to the background thread, so the caller (the Tk main thread)
+        never waits for the disk; saves of the same key within 'coalesce_window' seconds become one write.
+        """
+        if key in self.log_counts:
+            self.log_counts[key] = 0  # The snapshot will make the current journal redundant
+        if key in self.dirty:
+            self.dirty[key] = set() if shards is None else self.dirty[key] - shards  # About to be written
+        if self._is_shared(key) and key == "attendees":  # Every change is already in the shared journal
+            with self._lock(key):
+                self._compact_shared(key)
+        elif self._is_shared(key):  # Write now, under the lock, keeping the changes made by other processes
+            with self._lock(key):
+                self._merge(key, data)
+                if self._write_snapshot(key, data) and key == "stats":
+                    self._stats_base = dict(vars(data))  # The file now holds these totals
+        elif self.write_behind:
+            self._submit(("save", key, data, shards))  # Let the writer thread pickle and write it
+        else:
+            self._write_snapshot(key, data, shards)  # Write it right away
+
+    def _save_changes(self, key, data):
+        """Writes the records changed through put()/delete(): only the dirty shards of a sharded key."""
+        if self._sharded(key):
+            self.save(key, data, set(self.dirty[key]))
+        else:
+            self.save(key, data)
+
+    # --- SHARDS ---
+    def _sharded(self, key):
+        return key in SHARDED_KEYS and self.shards > 1
+
+    def shard_of(self, item_id):
+        """Shard number of a record ID (a CRC of the normalized email, so it is the same in every process)."""
+        return zlib.crc32(str(item_id).strip().lower().encode()) % self.shards
+
+    def layout(self, key):
+        """
+        The files that hold 'key' with the current settings. With 'shards' above 1 the attendees are split by
+        a hash of their email over that many files (attendees.00-of-16.pkl, ...): a changed record marks its
+        shard dirty, so only dirty shards are rewritten, and the shards are read in parallel at start-up.
+        Files in another layout (the single attendees.pkl or another shard count) are re-split on load.
+        """
+        if not self._sharded(key):
+            return [self.files[key]]
+        base, ext = os.path.splitext(self.files[key])
+        return [f"{base}.{i:02d}-of-{self.shards:02d}{ext}" for i in range(self.shards)]
+
+    def paths(self, key):
+        """The files holding 'key' on disk right now, in any layout."""
+        found = [self.files[key]] if os.path.exists(self.files[key]) else []
+        if key in SHARDED_KEYS:
+            base, ext = os.path.splitext(self.files[key])
+            found += sorted(glob.glob(glob.escape(base) + ".*-of-*" + glob.escape(ext)))
+        return found
+
+    def _partition(self, key, data, shards=None):
+        """Splits 'data' into (file, records) pairs for the given shard numbers (all shards by default)."""
+        layout = self.layout(key)
+        parts = {s: [] for s in (range(self.shards) if shards is None else shards)}
+        get_id = self.record_ids[key]
+        for item in data:
+            part = parts.get(self.shard_of(get_id(item)))
+            if part is not None:
+                part.append(item)
+        return [(layout[s], parts[s]) for s in sorted(parts)]
+
+    def _write_snapshot(self, key, data, shards=None):
+        """
+        Writes the data object atomically (temp file + rename; for a sharded key, the given shards or all
+        of them) and truncates the key's journal.
+        Returns False if a write failed, leaving the journal untouched.
+        """
+        if self._sharded(key):
+            written = all(self._write_file(key, path, part) for path, part in self._partition(key, data, shards))
+        else:
+            written = self._write_file(key, self.files[key], data)
+        if not written:
+            return False  # Keep the journal intact if the snapshot could not be written
+
+        if key in self.logs and os.path.exists(self.logs[key]):  # A full snapshot makes the journal redundant
+            open(self.logs[key], 'wb').close()  # Truncate the log (compaction)
+        return True
+
+    def _write_file(self, key, path, data):
+        temp = path + ".tmp"  # Write next to it first, so a crash never leaves a half-written file
+        try:
+            with open(temp, 'wb') as f:  # Open the temporary file in write-binary mode
+                self._dump(key, data, f)  # Serialize and write the header and the data to the file
+                if self.group_commit:
+                    f.flush()
+                    os.fsync(f.fileno())  # The new contents must be on disk before they replace the old file
+            os.replace(temp, path)  # Atomically swap the new file in place of the old one
+            if self.group_commit:
+                self._sync_dir()  # ... and so must the rename
+            return True
+        except Exception as e:
+            print(f"Save error ({key}): {e}")  # Catch and log any file writing errors to the console
+            return False
+
+    def codec(self, key):
+        return BINARY_CODECS.get(key) if self.binary else None  # Binary codec used to write 'key', if any
+
+    def _dump(self, key, data, f):
+        """Writes 'data' in the current file format (see FILE FORMAT above)."""
+        codec = self.codec(key)
+        if codec:
+            records = [data] if codec.single else list(data)  # Fix the record list (it may still grow on another thread)
+            codec.write(f, records)
+            return
+        pickler = pickle.Pickler(f)  # One pickler, so strings shared between records are written once
+        if isinstance(data, (list, Registry)):
+            records = list(data)  # Fix the record count (the list may still grow on another thread)
+            pickler.dump((FORMAT_MAGIC, FORMAT_VERSION, len(records)))
+            for i in range(0, len(records), FORMAT_CHUNK):
+                pickler.dump(records[i:i + FORMAT_CHUNK])
+        else:
+            pickler.dump((FORMAT_MAGIC, FORMAT_VERSION, None))
+            pickler.dump(data)
+
+    def _sync_dir(self):
+        """Flushes the folder entry of renamed or created files to disk (POSIX only; Windows has no directory fsync)."""
+        if os.name == "nt":
+            return
+        fd = os.open(self.data_dir or ".", os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _append_log(self, key, blob):
+        try:
+            with open(self.logs[key], 'ab') as f:  # Open the journal in append-binary mode
+                f.write(blob)  # Append the single pickled record to the end of the log
+                if self.group_commit:
+                    f.flush()
+                    os.fsync(f.fileno())  # One fsync for the whole group of records in 'blob'
+            return True
+        except Exception as e:
+            print(f"Journal error ({key}): {e}")  # Log the failure; the caller falls back to a full snapshot
+            return False
+
+    def flush(self):
+        """
+        Blocks until every queued write has reached the disk (no-op without write-behind).
+        Raises OSError if a queued write could not be saved: such a write is never reported as on disk, and
+        neither is any later one, since the files may now miss a change. Restart once the cause is fixed.
+        """
+        if self._writer and self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put(("flush", done))  # Ask the writer to write everything pending now
+            done.wait()
+        with self._committed:
+            self._raise_error()
+
+    def _submit(self, op):
+        """Queues a write for the writer thread, numbered so that sync() can wait for it."""
+        with self._committed:
+            self._submitted += 1
+            self._queue.put(op)  # Under the lock, so the queue order matches the numbering
+
+    def sync(self):
+        """
+        Blocks until every write queued so far is on disk (no-op without group commit).
+        With 'group_commit' the writer thread gathers the writes queued within 'commit_window' seconds into
+        one group and makes it durable with one write and fsync per log (see _commit).
+        Call it after a change and before telling anyone the change was made.
+        Raises OSError if one of the writes (or an earlier one) could not be saved.
+        """
+        if not self.group_commit:
+            return
+        with self._committed:
+            target = self._submitted
+            self._committed.wait_for(lambda: self._done >= target or not self._writer.is_alive())
+            self._raise_error()
+
+    def on_durable(self, callback):
+        """
+        Calls callback(error) once the writer has finished every write queued so far: right away if it already
+        has (or without group commit), otherwise on the writer thread, so the callback must only hand the news on.
+        'error' is None when the writes are on disk, or the OSError that kept one of them (or an earlier one) off it.
+        """
+        with self._committed:
+            if self.group_commit and self._done < self._submitted:
+                self._waiters.append((self._submitted, callback))
+                return
+            error = self._error
+        callback(error)
+
+    def _raise_error(self):
+        """Raises the recorded write failure, if any; the caller holds self._committed."""
+        if self._error:
+            raise OSError(str(self._error)) from self._error
+
+    def _fail(self, error):
+        """Records a write that could not be saved (only the first failure is kept)."""
+        with self._committed:
+            if self._error is None:
+                self._error = error
+
+    def _settle(self, count, error=None):
+        """
+        Marks the next 'count' queued writes as finished, on disk or (with 'error') failed,
+        and wakes whoever waits for them.
+        """
+        if error:
+            self._fail(error)
+        with self._committed:
+            self._done += count
+            if not error:
+                self._durable += count
+            failure = self._error
+            ready = [cb for target, cb in self._waiters if target <= self._done]
+            self._waiters = [(target, cb) for target, cb in self._waiters if target > self._done]
+            self._committed.notify_all()
+        for callback in ready:
+            try:
+                callback(failure)
+            except Exception as e:
+                print(f"Commit callback error: {e}")
+
+    def close(self):
+        """
+        Flushes all queued writes and stops the writer thread (call on application exit).
+        Raises OSError if a queued write could not be saved, like flush().
+        """
+        if self._writer and self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put(("stop", done))
+            done.wait()
+            self._writer.join()
+        with self._committed:
+            self._raise_error()
+
+    def _run_writer(self):
+        """
+        Body of the writer thread. Journal records are appended in the order they were queued;
+        snapshot saves wait up to 'coalesce_window' seconds so that newer saves of the same key replace them.
+        """
+        pending = {}  # key -> [data, deadline, attempts, shards] for snapshots waiting to be written
+
+        def write_due(force):
+            now = time.monotonic()
+            for key in [k for k, p in pending.items() if force or p[1] <= now]:
+                data, _, attempts, shards = pending.pop(key)
+                # Pickling here can race with the main thread changing the same list, so retry a few times
+                while not self._write_snapshot(key, data, shards):
+                    attempts += 1
+                    if attempts > 3:  # Give up: flush() reports it from now on
+                        self._fail(OSError(f"Could not save '{key}' to disk"))
+                        break
+                    if not force:  # Try again after another window instead of blocking the queue
+                        pending[key] = [data, now + self.coalesce_window, attempts, shards]
+                        break
+
+        while True:
+            timeout = None  # Sleep until the next operation when nothing is pending
+            if pending:
+                timeout = max(0, min(p[1] for p in pending.values()) - time.monotonic())
+            try:
+                op = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                op = None  # A pending snapshot is due
+
+            if op and op[0] == "save":
+                _, key, data, shards = op
+                if key in pending:
+                    p = pending[key]
+                    p[0] = data  # Coalesce: keep the original deadline, write the newest data
+                    p[3] = None if p[3] is None or shards is None else p[3] | shards  # ... and every shard asked for
+                else:
+                    pending[key] = [data, time.monotonic() + self.coalesce_window, 0, shards]
+            elif op and op[0] == "append":
+                _, key, blob, data, shard = op
+                if not self._append_log(key, blob):  # Journal write failed: fall back to a snapshot now
+                    pending[key] = [data, time.monotonic(), 0, None]
+                elif key in pending and pending[key][3] is not None:
+                    pending[key][3].add(shard)  # The pending snapshot truncates the journal, so it must hold this record
+            elif op:  # "flush" or "stop": write everything that is pending immediately
+                write_due(True)
+                op[1].set()
+                if op[0] == "stop":
+                    return
+                continue
+            write_due(False)
+
+    def _run_committer(self):
+        """
+        Body of the writer thread in group-commit mode. Takes the first queued write, gathers whatever else
+        is queued within 'commit_window' seconds (writes queued while the previous group was being synced
+        join right away) and commits them together.
+        """
+        while True:
+            group = [self._queue.get()]  # Sleep until the next write
+            deadline = time.monotonic() + self.commit_window
+            while group[-1][0] in ("save", "append"):
+                try:
+                    group.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break  # The window is over
+            control = group.pop() if group[-1][0] in ("flush", "stop") else None
+            if group:
+                saved = self._commit(group)
+                self._settle(len(group), None if saved else OSError("Could not write a group of changes to disk"))
+            if control:
+                control[1].set()
+                if control[0] == "stop":
+                    return
+
+    def _commit(self, group):
+        """
+        Writes one group of queued operations durably. Keys with a snapshot in the group get a single
+        snapshot of their newest data (it holds the group's journal records as well, so their shards are
+        included and the records are not appended); the records of every other key are appended to its
+        log in one write. Returns True if every write of the group reached the disk.
+        """
+        saved = True
+        snapshots = {}  # key -> [data, shards]
+        records = {}  # key -> [data, blobs, shards]
+        for op in group:
+            if op[0] == "save":
+                _, key, data, shards = op
+                if key in snapshots:
+                    s = snapshots[key]
+                    s[0] = data  # Newest data
+                    s[1] = None if s[1] is None or shards is None else s[1] | shards  # Every shard asked for
+                else:
+                    snapshots[key] = [data, None if shards is None else set(shards)]
+            else:
+                _, key, blob, data, shard = op
+                r = records.setdefault(key, [data, [], set()])
+                r[0] = data
+                r[1].append(blob)
+                r[2].add(shard)
+
+        for key, (data, blobs, shards) in records.items():
+            if key in snapshots:
+                s = snapshots[key]
+                if s[1] is not None:
+                    s[1] |= shards  # The snapshot truncates the journal, so it must hold these records
+            elif not self._append_log(key, b"".join(blobs)):  # Journal write failed: snapshot instead
+                snapshots[key] = [data, None]
+
+        for key, (data, shards) in snapshots.items():
+            # Pickling here can race with another thread changing the same list, so retry a few times
+            for _ in range(3):
+                if self._write_snapshot(key, data, shards):
+                    break
+            else:
+                saved = False
+        return saved
+
+    def put(self, key, data, item):
+        """
+        Persists a single added or changed record of the list 'data'.
+        In journal mode only the record itself is appended to the log (constant cost); the log is compacted
+        into a fresh snapshot every 'snapshot_every' records and replayed on load.
+        Otherwise this falls back to a full save of the list.
+        """
+        self._write_record(key, data, ("put", item))  # Store the full current state of the record
+
+    def delete(self, key, data, item_id):
+        """
+        Persists the removal of the record identified by 'item_id' from the list 'data'.
+        """
+        self._write_record(key, data, ("del", item_id))  # Store a tombstone for the record
+
+    def _write_record(self, key, data, record):
+        shard = None
+        if key in self.dirty:
+            item_id = self.record_ids[key](record[1]) if record[0] == "put" else record[1]
+            shard = self.shard_of(item_id)
+            self.dirty[key].add(shard)  # Its shard must be rewritten at the next snapshot
+        if key in self.logs and self._is_shared(key):  # Shared records always go to the journal, under the lock
+            with self._lock(key):
+                if key == "workshops" and record[0] == "put":
+                    self._merge_seats([record[1]])  # Never overwrite seats booked by another process
+                self._append_shared(key, record)
+            return
+        if not self.journal or key not in self.logs:  # Journal disabled or not supported for this key
+            self._save_changes(key, data)  # Fall back to rewriting the file (only the changed shards)
+            return
+
+        blob = self._encode_record(key, record)  # Serialize the record now, while it reflects the current state
+        if self.write_behind:
+            self._submit(("append", key, blob, data, shard))  # The writer thread appends it in order
+        elif not self._append_log(key, blob):  # Append the record to the end of the log
+            self._save_changes(key, data)  # Fall back to a snapshot if the journal could not be written
+            return
+
+        self.log_counts[key] += 1  # Count the new record
+        if self.log_counts[key] >= self.snapshot_every:  # The log has grown long enough
+            self._save_changes(key, data)  # Compact it into a fresh snapshot of the changed shards
+
+    def _encode_record(self, key, record):
+        """Serializes one journal record: ("put", item) or ("del", item_id)."""
+        codec = self.codec(key)
+        if not codec:
+            return pickle.dumps(record)
+        op, value = record
+        if op == "put":
+            payload = codec.encode([value])  # A block holding just this record
+            return _LOG_RECORD.pack(b"GP", len(payload)) + payload
+        payload = marshal.dumps(value)  # The ID (email or workshop number)
+        return _LOG_RECORD.pack(b"GD", len(payload)) + payload
+
+    def _read_record(self, key, f):
+        """Reads the next journal record from 'f'; raises EOFError at the end of the log."""
+        first = f.peek(1)[:1]
+        if not first:
+            raise EOFError
+        if first != b"G":  # Written by pickle (before the binary format, or with binary=False)
+            self._check_pickle(key, self.logs[key])
+            return pickle.load(f)
+        head = f.read(_LOG_RECORD.size)
+        if len(head) != _LOG_RECORD.size:
+            raise ValueError("Truncated journal record")
+        tag, size = _LOG_RECORD.unpack(head)
+        payload = f.read(size)
+        if len(payload) != size:
+            raise ValueError("Truncated journal record")
+        if tag == b"GP":
+            return "put", BINARY_CODECS[key].decode(payload)[0]
+        if tag == b"GD":
+            return "del", marshal.loads(payload)
+        raise ValueError(f"Unknown journal record {tag!r}")
+
+    def _append_shared(self, key, record):
+        """Appends a journal record synchronously; the caller holds the key's file lock."""
+        if self._append_log(key, self._encode_record(key, record)):
+            self.log_counts[key] += 1
+            if self.log_counts[key] < self.snapshot_every:
+                return
+            record = None  # Compaction: the record is read back from the journal
+        self._compact_shared(key, record)
+
+    def _compact_shared(self, key, record=None):
+        """
+        Rewrites the snapshot of a shared key from the files and the journal on disk, which hold the records of
+        every process (this process's list may miss records other kiosks added), and empties the journal.
+        'record' is a change the journal could not take; it is applied on top. The caller holds the key's lock.
+        """
+        data, _, stray = self._read_stored(key, [])
+        if record:
+            get_id = self.record_ids[key]
+            op, value = record
+            item_id = get_id(value) if op == "put" else value
+            at = next((i for i, item in enumerate(data) if get_id(item) == item_id), None)
+            if op == "del":
+                if at is not None:
+                    del data[at]
+            elif at is None:
+                data.append(value)
+            else:
+                data[at] = value
+        if self._write_snapshot(key, data):
+            for path in stray:
+                os.remove(path)
+        self.log_counts[key] = 0
+        if key in self.dirty:
+            self.dirty[key] = set()
+
+    def refresh(self, key, data):
+        """
+        Copies the changes other processes saved for 'key' ("workshops" or "stats") into 'data' (shared mode;
+        no-op otherwise). Changes of this process that are not saved yet are kept.
+        """
+        if self._is_shared(key):
+            with self._lock(key):
+                self._merge(key, data)
+
+    def _merge(self, key, data):
+        if key == "stats":
+            self._merge_stats(data)
+        elif key == "workshops":
+            self._merge_seats(data)  # Attendee records are never merged: they are compacted from the journal
+
+    def _merge_stats(self, stats):
+        """
+        Sets every counter of 'stats' to the total stored on disk plus the change this process made since it
+        last read or wrote the file; the caller holds the file lock. Read directly, like _merge_seats().
+        """
+        stored, _ = self._read_file("stats", self.files["stats"], None)
+        if stored is None:
+            return  # Nothing saved yet: this process's totals are the first
+        if self._stats_base is not None:
+            for name, value in vars(stats).items():
+                setattr(stats, name, getattr(stored, name, 0) + value - self._stats_base.get(name, 0))
+        self._stats_base = dict(vars(stored))
+
+    def _merge_seats(self, workshops):
+        """
+        Copies the booking counts stored on disk into 'workshops'; the caller holds the file lock.
+        Reads the workshop file and its journal directly: in shared mode they are written synchronously,
+        so unlike load() this never waits for the writer thread (which may be busy with other keys).
+        """
+        stored, _, _ = self._read_stored("workshops", [])
+        on_disk = {w.w_id: w.booked for w in stored}
+        for w in workshops:
+            w.booked = on_disk.get(w.w_id, w.booked)  # Workshops not saved yet keep their own count
+
+    def allocate(self, name, count=1, start=1):
+        """
+        Reserves 'count' consecutive numbers of the named sequence and returns the first one (never below 'start').
+        The counter is read and written under a file lock and saved before returning, so threads and
+        processes sharing the data folder never receive the same number, even after a restart.
+        The file is read directly, like in _merge_seats(): it is only ever written here, synchronously, so
+        this never waits for the writer thread (and other kiosks never wait for it while the lock is held).
+        """
+        with FileLock(self.sequence_lock):
+            counters, _ = self._read_file("sequences", self.files["sequences"], {})  # name -> next free number
+            first = max(counters.get(name, start), start)
+            counters[name] = first + count
+            if not self._write_snapshot("sequences", counters):  # Written now, not through the writer thread
+                raise OSError(f"Could not save the '{name}' sequence")
+        return first
+
+    def reserve_seat(self, data, workshop):
+        """
+        Takes one seat of 'workshop' (an element of the list 'data') if it is not full and persists it.
+        Returns True if a seat was taken. In shared mode the check and the increment happen under the
+        file lock on the count stored on disk, and workshop.booked is refreshed to that count.
+        """
+        if not self.shared:
+            if workshop.is_full():
+                return False
+            workshop.booked += 1  # Increment the booking counter on the workshop object
+            self.put("workshops", data, workshop)  # Persist the updated booking count
+            return True
+
+        with FileLock(self.lock_path):
+            self._merge_seats([workshop])  # Seats taken by other processes since this one loaded the file
+            if workshop.is_full():
+                return False
+            workshop.booked += 1
+            self._append_shared("workshops", ("put", workshop))
+        return True
+
+    def book_seat(self, workshops, workshop, attendees, attendee, stats, apply):
+        """
+        Takes one seat of 'workshop' for 'attendee' with reserve_seat(), then calls apply() to record the booking
+        in memory and persists the attendee record and the dashboard totals 'stats'. Returns True if a seat was
+        taken (nothing changes otherwise). The three are separate files here; SQLiteDataManager writes them
+        in one transaction.
+        """
+        if not self.reserve_seat(workshops, workshop):
+            return False
+        apply()
+        self.put("attendees", attendees, attendee)
+        self.save("stats", stats)
+        return True
+
+    def cancel_seat(self, workshops, workshop, attendees, attendee, stats, apply):
+        """
+        Gives back the seat of 'workshop' that 'attendee' holds (the reverse of book_seat): calls apply() to
+        record the cancellation in memory, then persists the seat, the attendee record and the totals.
+        Returns True. As in book_seat() these are separate files here.
+        """
+        apply()
+        self.release_seat(workshops, workshop)
+        self.put("attendees", attendees, attendee)
+        self.save("stats", stats)
+        return True
+
+    def release_seat(self, data, workshop):
+        """Gives back one seat of 'workshop' (the reverse of reserve_seat) and persists it."""
+        if not self.shared:
+            workshop.booked -= 1  # Decrease the 'booked' count on the Workshop object
+            self.put("workshops", data, workshop)
+            return
+
+        with FileLock(self.lock_path):
+            self._merge_seats([workshop])
+            workshop.booked = max(workshop.booked - 1, 0)
+            self._append_shared("workshops", ("put", workshop))
+
+    def load(self, key, default, progress=None):
+        """
+        Loads the data stored under 'key', or 'default' if there is none.
+        'progress' is an optional callback that receives the percentage (0-100) of the file read so far.
+        """
+        if self._is_shared(key):
+            with self._lock(key):  # Another process may be appending to the journal right now
+                data = self._load(key, default, progress)
+            if key == "stats" and data is not None:
+                self._stats_base = dict(vars(data))  # Changes made from here on are merged into the file
+            return data
+        return self._load(key, default, progress)
+
+    def _load(self, key, default, progress=None):
+        self.flush()  # Make sure queued writes are on disk before reading
+        data, migrate, stray = self._read_stored(key, default, progress)
+        if migrate or stray:  # Store the upgraded (or re-split) data, so this happens only once
+            if self._write_snapshot(key, data):
+                for path in stray:
+                    os.remove(path)
+            if key in self.log_counts:
+                self.log_counts[key] = 0  # The snapshot holds the replayed journal
+            if key in self.dirty:
+                self.dirty[key] = set()  # ... in every shard
+        return data
+
+    def _read_stored(self, key, default, progress=None):
+        """
+        Reads what is stored for 'key': the snapshot files with any journal replayed on top. Returns
+        (data, migrate, stray), where 'stray' lists the files of another shard layout that were read too.
+        Unlike load() this never waits for the writer thread.
+        """
+        stray = []  # Files of another shard layout, replaced by the current one when the snapshot is written
+        if key in SHARDED_KEYS:
+            layout = self.layout(key)
+            stored = self.paths(key)
+            stray = [p for p in stored if p not in layout]
+            data, migrate = self._read_files(key, stray + [p for p in stored if p in layout], default, progress)
+        else:
+            data, migrate = self._read_file(key, self.files[key], default, progress)
+
+        if key in self.logs and os.path.exists(self.logs[key]):  # Replay any journal left since the last snapshot
+            data = self._replay(key, data, migrate)  # Journal records are as old as the snapshot
+        return data, migrate, stray
+
+    def _read_file(self, key, path, default, progress=None):
+        """Reads one data file. Returns (data, migrate); see _read()."""
+        if not os.path.exists(path):  # Check if the data file exists on the disk
+            return default, None  # First run or missing snapshot
+        try:
+            with open(path, 'rb') as f:  # Open the data file in read-binary mode
+                binary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC  # Binary record format or pickle?
+                f.seek(0)
+                if progress:  # Report how far the reader has got through the file
+                    f = ProgressReader(f, os.path.getsize(path), progress)
+                return self._read(key, f, binary)  # Deserialize (and upgrade) the file content
+        except FormatError:
+            raise  # Never fall back to the default (and later overwrite) a newer file
+        except Exception as e:  # Damaged file: loading the default would overwrite the stored records at the next save
+            raise FormatError(f"{path} could not be read ({e!r}); restore it from a backup or remove it") from e
+
+    def _read_files(self, key, paths, default, progress=None):
+        """
+        Reads the shard files 'paths' on a thread pool and joins their records. Returns (data, migrate),
+        where 'migrate' is set if any shard was older than the current format.
+        """
+        if not paths:
+            return default, None
+        sizes = {path: os.path.getsize(path) for path in paths}
+        total, done = max(sum(sizes.values()), 1), 0
+        with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 4)) as pool:
+            futures = {pool.submit(self._read_file, key, path, []): path for path in paths}
+            for future in as_completed(futures):  # Report progress as the shards finish
+                done += sizes[futures[future]]
+                if progress:
+                    progress(done * 100 // total)
+            results = [future.result() for future in futures]  # In file order
+        data = [record for part, _ in results for record in part]
+        if len(results) > 1 and any(p not in self.layout(key) for p in paths):  # Old and new layout side by side
+            get_id = self.record_ids[key]
+            latest = {get_id(record): record for record in data}  # Files of the current layout come last and win
+            data = list(latest.values())
+        migrate = next((m for _, m in results if m), None)
+        return data, migrate
+
+    def _migration(self, key, version):
+        """
+        Returns a function converting one record of 'key' from file version 'version' to the current one,
+        or None when nothing needs converting. Every file older than the current version gets one,
+        so it is rewritten in the current format.
+        """
+        if version > FORMAT_VERSION:
+            raise FormatError(f"{self.files[key]} has format version {version}; "
+                              f"this version of the application reads up to {FORMAT_VERSION}")
+        if version == FORMAT_VERSION:
+            return None
+        steps = [MIGRATIONS[v][key] for v in range(version + 1, FORMAT_VERSION + 1) if key in MIGRATIONS.get(v, {})]
+        ctx = MigrationContext(self)
+
+        def migrate(record):
+            for step in steps:
+                record = step(record, ctx)
+            return record
+        return migrate
+
+    def _read(self, key, f, binary=False):
+        """
+        Reads one data file. Returns (data, migrate), where 'migrate' is the record conversion that was
+        applied (None if the file was current). List records are converted chunk by chunk as they are read,
+        so two copies of the list are never held.
+        """
+        if binary:
+            codec = BINARY_CODECS[key]
+            records, version = codec.read(f)
+            migrate = self._migration(key, version)
+            if migrate:
+                for i, record in enumerate(records):  # Convert in place
+                    records[i] = migrate(record)
+            return (records[0] if codec.single else records), migrate
+
+        self._check_pickle(key, self.files[key])
+        unpickler = pickle.Unpickler(f)
+        header = unpickler.load()
+        if not (isinstance(header, tuple) and len(header) == 3 and header[0] == FORMAT_MAGIC):
+            data, version, count = header, 0, None  # Version 0: the whole object was the only pickle
+        else:
+            _, version, count = header
+            data = None
+        migrate = self._migration(key, version)
+
+        if count is not None:  # Stream the records
+            records = []
+            while len(records) < count:
+                chunk = unpickler.load()
+                records.extend(map(migrate, chunk) if migrate else chunk)
+            return records, migrate
+        if data is None:
+            data = unpickler.load()  # Single object after the header
+        if migrate:
+            if isinstance(data, list):  # Version 0 list: convert in place
+                for i, record in enumerate(data):
+                    data[i] = migrate(record)
+            else:
+                data = migrate(data)
+        return data, migrate
+
+    def _check_pickle(self, key, path):
+        """
+        Refuses to unpickle a data file unless binary=False or read_pickle=True: unpickling a planted file
+        runs code. ConvertData.py converts such files to the binary format once.
+        """
+        if key in BINARY_CODECS and not self.read_pickle:
+            raise FormatError(f"{path} was written with pickle, which is not loaded by default because it can run "
+                              f"code; if the file is trusted, convert it once with: python ConvertData.py --to binary")
+
+    def _replay(self, key, data, migrate=None):
+        """
+        Applies the journal records for 'key' on top of the loaded snapshot, converting each stored
+        record with 'migrate' when the snapshot was older than the current format.
+        A torn record at the end of the log (e.g. from a crash mid-write) is cut off.
+        The shards of replayed records are marked dirty: the next compaction truncates the whole log,
+        so it must rewrite them too.
+        """
+        get_id = self.record_ids[key]  # Function that extracts the identity of a record
+        dirty = self.dirty.get(key)  # Shards whose records live only in the journal (sharded keys)
+        index = {get_id(item): i for i, item in enumerate(data)}  # Position of every record in the snapshot
+        count = 0  # Number of valid records replayed
+        good_end = 0  # File offset right after the last valid record
+
+        with open(self.logs[key], 'rb') as f:
+            while True:
+                try:
+                    op, value = self._read_record(key, f)  # Read the next record
+                except EOFError:
+                    break  # Reached the end of the log
+                except FormatError:
+                    raise  # Not torn: a record that must not be read (the log is kept as it is)
+                except Exception as e:
+                    print(f"Journal replay stopped ({key}): {e}")  # Torn or corrupt tail
+                    break
+                good_end = f.tell()  # Remember where the last complete record ends
+                count += 1
+
+                if op == "put":  # Record added or changed
+                    if migrate:
+                        value = migrate(value)
+                    if dirty is not None:
+                        dirty.add(self.shard_of(get_id(value)))
+                    i = index.get(get_id(value))
+                    if i is None:  # New record: append it
+                        index[get_id(value)] = len(data)
+                        data.append(value)
+                    else:  # Existing record: replace it with the newer state
+                        data[i] = value
+                elif op == "del":  # Record removed: leave a hole and filter it out below
+                    if dirty is not None:
+                        dirty.add(self.shard_of(value))
+                    i = index.pop(value, None)
+                    if i is not None:
+                        data[i] = None
+
+            torn = f.seek(0, os.SEEK_END) != good_end  # Check for leftover bytes after the last valid record
+
+        if torn:  # Drop the torn tail so new records are not appended after it
+            with open(self.logs[key], 'r+b') as f:
+                f.truncate(good_end)
+
+        self.log_counts[key] = count  # Compaction continues counting from the replayed records
+        return [item for item in data if item is not None]  # Remove deleted records
@@ -0,0 +1,94 @@
+import argparse
+import multiprocessing
+import shutil
+import sys
+import tempfile
+from Model import Workshop
+from Storage import DataManager
+from Database import SQLiteDataManager
+
+# =============================================================================
+#                               BOOKING STRESS TEST
+# =============================================================================
+# Starts several processes that all book seats of the same workshops in one shared data folder,
+# like kiosks running Main.py --shared (or --sqlite), and checks that no workshop is ever overbooked:
+#
+#     python StressBooking.py --processes 8 --attempts 300 --capacity 500
+#     python StressBooking.py --sqlite
+
+
+def open_storage(data_dir, sqlite):
+    if sqlite:
+        return SQLiteDataManager(data_dir=data_dir)
+    return DataManager(journal=True, data_dir=data_dir, shared=True)
+
+
+def kiosk(data_dir, sqlite, attempts, cancel_every, results):
+    """
+    One kiosk process: loads the workshops once (so its copy goes stale, like a real kiosk) and then
+    tries to book 'attempts' seats, giving one back every 'cancel_every' bookings.
+    """
+    dm = open_storage(data_dir, sqlite)
+    workshops = dm.load("workshops", [])
+    taken = released = 0
+    for i in range(attempts):
+        w = workshops[i % len(workshops)]
+        if dm.reserve_seat(workshops, w):
+            taken += 1
+            if cancel_every and taken % cancel_every == 0:
+                dm.release_seat(workshops, w)
+                released += 1
+    dm.close()
+    results.put((taken, released))
+
+
+def run(processes, attempts, capacity, n_workshops, cancel_every, sqlite):
+    data_dir = tempfile.mkdtemp(prefix="greenwave-stress-")
+    try:
+        dm = open_storage(data_dir, sqlite)
+        dm.save("workshops", [Workshop(101 + i, f"Workshop {i}", "10:00 AM", capacity, "Stress Test")
+                              for i in range(n_workshops)])
+        dm.close()
+
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=kiosk, args=(data_dir, sqlite, attempts, cancel_every, results))
+                   for _ in range(processes)]
+        for p in workers:
+            p.start()
+        counts = [results.get() for _ in workers]
+        for p in workers:
+            p.join()
+
+        taken = sum(t for t, _ in counts)
+        released = sum(r for _, r in counts)
+        dm = open_storage(data_dir, sqlite)
+        final = dm.load("workshops", [])
+        dm.close()
+        booked = sum(w.booked for w in final)
+
+        print(f"storage        : {'sqlite' if sqlite else 'pickle + file lock'}")
+        print(f"attempts       : {processes} process(es) x {attempts}")
+        print(f"capacity       : {n_workshops} workshop(s) x {capacity} seat(s)")
+        print(f"seats taken    : {taken} (released {released})")
+        print(f"booked on disk : {booked} " + str([w.booked for w in final]))
+
+        ok = booked == taken - released and all(w.booked <= w.capacity for w in final)
+        if not cancel_every and processes * attempts >= n_workshops * capacity:  # Demand exceeds supply
+            ok = ok and all(w.booked == w.capacity for w in final)  # ... so every seat must end up taken
+        print("result         : " + ("OK, no overbooking and no lost updates" if ok else "FAILED"))
+        return ok
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent booking stress test.")
+    parser.add_argument("--processes", type=int, default=8, help="number of concurrent kiosk processes")
+    parser.add_argument("--attempts", type=int, default=300, help="booking attempts per process")
+    parser.add_argument("--capacity", type=int, default=500, help="seats per workshop")
+    parser.add_argument("--workshops", type=int, default=3, help="number of workshops")
+    parser.add_argument("--cancel-every", type=int, default=7, help="give back one seat every N bookings (0: never)")
+    parser.add_argument("--sqlite", action="store_true", help="use the SQLite backend instead of the pickle files")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.processes, args.attempts, args.capacity, args.workshops, args.cancel_every,
+                      args.sqlite) else 1)
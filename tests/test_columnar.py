@@ -0,0 +1,98 @@
+import datetime
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Model import Ticket
+from Columnar import TicketColumns
+
+# =============================================================================
+#                              COLUMNAR TESTS
+# =============================================================================
+# The ticket column file as several kiosks see it: two TicketColumns objects mapping the same file
+# stand in for two processes sharing the data folder.
+
+
+def ticket(number, ticket_type="Exhibition Pass", price=100):
+    t = Ticket(ticket_type, price, 1, ticket_type == "All-Access", Ticket.make_id(ticket_type, number))
+    t.purchase_date = datetime.date(2026, 1, 1)
+    return t
+
+
+class SharedColumnsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tickets.col")
+        self.lock = os.path.join(self.tmp.name, "tickets.lock")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_two_kiosks_append_without_overwriting(self):
+        a = TicketColumns(self.path, capacity=2, lock_path=self.lock)
+        b = TicketColumns(self.path, capacity=2, lock_path=self.lock)
+        for n in range(10000, 10003):
+            a.add_ticket(ticket(n))
+        b.add_ticket(ticket(10003))  # Past the capacity a started with: a grew (replaced) the file
+        a.add_ticket(ticket(10004))
+
+        day = a.day(datetime.date(2026, 1, 1))
+        self.assertEqual(sorted(t.ticket_id for t in day.tickets), [f"GW-EXH-{n}" for n in range(10000, 10005)])
+        self.assertEqual(b.day(datetime.date(2026, 1, 1)).revenue, 500)
+        a.close()
+        b.close()
+
+    def test_upgrade_seen_by_the_other_kiosk(self):
+        a = TicketColumns(self.path, lock_path=self.lock)
+        b = TicketColumns(self.path, lock_path=self.lock)
+        t = ticket(10000)
+        a.add_ticket(t)
+        t.ticket_type, t.price = "All-Access", 250
+        b.on_upgrade(t, 150, "Exhibition Pass")
+        self.assertEqual(a.day(datetime.date(2026, 1, 1)).count("All-Access"), 1)
+        self.assertEqual(a.revenue_total(), 250)
+        a.close()
+        b.close()
+
+
+class RepeatedIdTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.columns = TicketColumns(os.path.join(self.tmp.name, "tickets.col"))
+
+    def tearDown(self):
+        self.columns.close()
+        self.tmp.cleanup()
+
+    def test_upgrade_changes_the_row_of_the_upgraded_ticket(self):
+        first, second = ticket(1234), ticket(1234)  # Same timestamp ID, bought on different days
+        second.purchase_date = datetime.date(2026, 1, 2)
+        self.columns.add_ticket(first)
+        self.columns.add_ticket(second)
+
+        second.ticket_type, second.price = "All-Access", 250
+        self.columns.on_upgrade(second, 150, "Exhibition Pass")
+        self.assertEqual(self.columns.day(datetime.date(2026, 1, 1)).count("All-Access"), 0)
+        self.assertEqual(self.columns.day(datetime.date(2026, 1, 2)).revenue, 250)
+
+    def test_unmatched_repeat_is_left_for_the_rebuild(self):
+        first, second = ticket(1234), ticket(1234)
+        self.columns.add_ticket(first)
+        self.columns.add_ticket(second)
+        second.price = 175  # Its stored row says 100: neither row can be told apart as the one upgraded
+        self.columns.on_upgrade(second, 50, "Exhibition Pass")
+        self.assertEqual(self.columns.revenue_total(), 200)
+
+    def test_unknown_type_is_refused(self):
+        self.columns.add_ticket(ticket(1000))
+        with self.assertRaises(ValueError):
+            self.columns.add_ticket(ticket(1001, ticket_type="Day Pass"))
+        self.assertEqual(self.columns.rows, 1)  # Nothing of the refused ticket was stored
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ConvertData
+from Storage import DataManager, FormatError
+from Service import ConferenceService
+
+# =============================================================================
+#                              MIGRATION TESTS
+# =============================================================================
+# Loads the data folder in fixtures/baseline, written by the first release of the application (pickle files
+# without a header: reservations as Workshop copies, tickets with a list of exhibition names), after converting
+# it the way an administrator upgrades an existing installation:
+#
+#     python ConvertData.py --to binary
+#
+#     python -m pytest tests
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "baseline")
+
+
+class BaselineFolderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmp.name, "data")
+        shutil.copytree(FIXTURE, self.data_dir)  # The fixture itself is never rewritten
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self):
+        return ConferenceService(DataManager(journal=True, write_behind=True, data_dir=self.data_dir))
+
+    def close(self, service):
+        service.dm.close()
+        service._sales.close()
+
+    def test_pickle_folder_is_refused_until_converted(self):
+        with self.assertRaises(FormatError):
+            self.open()
+
+    def test_converted_folder_keeps_every_record(self):
+        self.assertTrue(ConvertData.convert(self.data_dir, True))
+        service = self.open()
+        ana = service.attendees.find_by_email("ana@test.example")
+        ben = service.attendees.find_by_email("ben@test.example")
+        cai = service.attendees.find_by_email("cai@test.example")
+
+        self.assertEqual((ana.reservations, ben.reservations, cai.reservations), ([101, 301], [201, 301], []))
+        self.assertEqual((ana.ticket.ticket_id, ana.ticket.ticket_type, ana.ticket.price), ("GW-EXH-0042", "Exhibition Pass", 400))
+        self.assertEqual(service.exhibitions.names_for(ana.ticket), ["Climate Tech Innovations", "Community Action & Impact"])
+        self.assertFalse(ana.ticket.allows(service.exhibitions.bit("Green Policy & Governance")))
+        self.assertTrue(ben.ticket.all_access)
+        self.assertIsNone(cai.ticket)
+        self.assertIs(service.attendees.find_by_ticket("GW-ALL-0077"), ben)
+
+        self.assertEqual([(w.w_id, w.booked, w.capacity) for w in service.workshops], [(101, 1, 50), (201, 1, 50), (301, 2, 2)])
+        self.assertEqual(service.workshop_roster(301), [ana, ben])
+        self.assertEqual([(e.name, e.description) for e in service.exhibitions],
+                         [("Climate Tech Innovations", "Tech talks"), ("Green Policy & Governance", "Policy"),
+                          ("Community Action & Impact", "Community")])
+        self.assertEqual(service.config.price_exhibition, 250)
+        self.assertEqual((service.stats.tickets_sold, service.stats.revenue, service.stats.total_booked), (2, 900, 4))
+        self.assertEqual(service.verify_stats(), {})
+
+        self.assertEqual(service.reserve_workshop(ana, 101), "Already Booked")
+        self.assertEqual(service.reserve_workshop(cai, 301), "Error")  # No ticket
+        self.assertEqual(service.reserve_workshop(ana, 201), "Invalid Pass Scope")
+        self.assertTrue(service.cancel_workshop(ana, 301))
+        self.close(service)
+
+        service = self.open()  # The migrated files and the journal read back without pickle
+        self.assertEqual(service.attendees.find_by_email("ana@test.example").reservations, [101])
+        self.assertEqual(service.workshops.get(301).booked, 1)
+        self.close(service)
+
+
+if __name__ == "__main__":
+    unittest.main()
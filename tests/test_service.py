@@ -0,0 +1,231 @@
+import datetime
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Storage import DataManager
+from Database import SQLiteDataManager
+from Service import ConferenceService
+
+# =============================================================================
+#                              SERVICE TESTS
+# =============================================================================
+# ConferenceService on a fresh data folder (seeded with the default exhibitions and workshops), the way the
+# GUI and the server use it. Restarts close the DataManager and open a new service on the same files.
+#
+#     python -m pytest tests
+
+
+class ServiceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.services = []
+
+    def tearDown(self):
+        for service in self.services:
+            service.dm.close()
+            service._sales.close()
+        self.tmp.cleanup()
+
+    def open(self, sqlite=False):
+        if sqlite:
+            dm = SQLiteDataManager(data_dir=self.tmp.name)
+        else:
+            dm = DataManager(journal=True, write_behind=True, data_dir=self.tmp.name)
+        service = ConferenceService(dm)
+        self.services.append(service)
+        return service
+
+    def restart(self, service):
+        self.services.remove(service)
+        service.dm.close()
+        service._sales.close()
+        return self.open(isinstance(service.dm, SQLiteDataManager))  # Same backend
+
+    @staticmethod
+    def attendee(service, email):
+        service.register_user("Test Attendee", email, "pass", "0500000000")
+        return service.attendees.find_by_email(email)
+
+    @staticmethod
+    def buy(service, user, exhibition="Climate Tech Innovations"):
+        service.process_payment(user, {'action': 'new_ticket', 'type': "Exhibition Pass",
+                                       'price': service.config.price_exhibition, 'access': [exhibition]})
+
+
+class VerifyStatsTest(ServiceTestCase):
+
+    def test_corrupted_total_is_reported_and_repaired(self):
+        service = self.open()
+        self.buy(service, self.attendee(service, "a@test.example"))
+        revenue = service.stats.revenue
+        service.stats.revenue += 999  # A running total that no longer matches the tickets
+        self.assertEqual(service.verify_stats(), {"revenue": (revenue + 999, revenue)})
+        self.assertEqual(service.stats.revenue, revenue + 999)  # Only reported
+
+        service.verify_stats(repair=True)
+        service = self.restart(service)
+        self.assertEqual(service.stats.revenue, revenue)
+        self.assertEqual(service.verify_stats(), {})
+
+
+
+class ReservationTest(ServiceTestCase):
+
+    def check_reserve_and_cancel(self, sqlite):
+        service = self.open(sqlite)
+        user = self.attendee(service, "a@test.example")
+        self.buy(service, user)  # Climate Tech Innovations: workshops 101 and 102
+        self.assertEqual(service.reserve_workshop(user, 101), "Success")
+        self.assertEqual(service.reserve_workshop(user, 101), "Already Booked")
+        self.assertEqual(service.reserve_workshop(user, 201), "Invalid Pass Scope")
+        self.assertEqual(service.reserve_workshop(user, 102), "Success")
+        self.assertTrue(service.cancel_workshop(user, 102))
+        self.assertFalse(service.cancel_workshop(user, 102))
+
+        service = self.restart(service)
+        user = service.attendees.find_by_email("a@test.example")
+        self.assertEqual(user.reservations, [101])
+        self.assertEqual((service.workshops.get(101).booked, service.workshops.get(102).booked), (1, 0))
+        self.assertEqual(service.stats.total_booked, 1)
+
+    def test_reserve_and_cancel_with_files(self):
+        self.check_reserve_and_cancel(sqlite=False)
+
+    def test_reserve_and_cancel_with_sqlite(self):
+        self.check_reserve_and_cancel(sqlite=True)
+
+    def test_failed_booking_transaction_leaves_memory_unchanged(self):
+        service = self.open(sqlite=True)
+        user = self.attendee(service, "a@test.example")
+        self.buy(service, user)
+        with service.dm.conn:  # A row the booking will collide with
+            service.dm.conn.execute("INSERT INTO reservations VALUES (?, ?)", (user.email, 101))
+        with self.assertRaises(Exception):
+            service.reserve_workshop(user, 101)
+        self.assertEqual((user.reservations, service.workshops.get(101).booked, service.stats.total_booked),
+                         ([], 0, 0))
+        self.assertEqual(service.dm.conn.execute("SELECT booked FROM workshops WHERE w_id = 101").fetchone()[0], 0)
+
+
+class IndexTest(ServiceTestCase):
+    """The exhibition holder counts and workshop rosters kept next to the attendees."""
+
+    def test_exhibition_holders_block_removal(self):
+        service = self.open()
+        user = self.attendee(service, "a@test.example")
+        self.buy(service, user, "Green Policy & Governance")
+        self.buy(service, self.attendee(service, "b@test.example"), "Green Policy & Governance")
+        self.assertEqual(service.exhibition_holder_count("Green Policy & Governance"), 2)
+        self.assertFalse(service.exhibition_in_use("Climate Tech Innovations"))
+        with self.assertRaises(ValueError):
+            service.remove_exhibition(1)  # Green Policy & Governance
+
+        service.comp_upgrade(user)  # All-Access no longer pins the exhibition
+        service = self.restart(service)  # The counts are rebuilt from the stored tickets
+        self.assertEqual(service.exhibition_holder_count("Green Policy & Governance"), 1)
+        self.assertEqual([u.email for u in service.exhibition_holders("Green Policy & Governance")], ["b@test.example"])
+        service.remove_exhibition(0)  # Climate Tech Innovations: no holders
+        self.assertIsNone(service.exhibitions.get("Climate Tech Innovations"))
+
+    def test_roster_follows_reservations(self):
+        service = self.open()
+        a, b = self.attendee(service, "a@test.example"), self.attendee(service, "b@test.example")
+        for user in (a, b):
+            self.buy(service, user)
+            service.reserve_workshop(user, 101)
+        service.cancel_workshop(a, 101)
+        self.assertEqual(service.workshop_roster(101), [b])
+
+        service = self.restart(service)
+        self.assertEqual([u.email for u in service.workshop_roster(101)], ["b@test.example"])
+        self.assertEqual((service.workshop_booking_count(101), service.workshop_booking_count(102)), (1, 0))
+
+
+class IdAllocationTest(ServiceTestCase):
+
+    def test_ticket_ids_are_unique_across_kiosks(self):
+        a, b = self.open(sqlite=True), self.open(sqlite=True)
+        ids = []
+        for i in range(3):
+            for service in (a, b):
+                user = self.attendee(service, f"user{len(ids)}@test.example")
+                self.buy(service, user)
+                ids.append(user.ticket.ticket_id)
+        self.assertEqual(len(set(ids)), 6)
+        self.assertIs(a.attendees.find_by_ticket(ids[0]).ticket, a.attendees.find_by_email("user0@test.example").ticket)
+
+    def test_ticket_numbers_continue_after_a_restart(self):
+        service = self.open()
+        first = self.attendee(service, "a@test.example")
+        self.buy(service, first)
+        service = self.restart(service)
+        second = self.attendee(service, "b@test.example")
+        self.buy(service, second)
+        self.assertNotEqual(first.ticket.ticket_id, second.ticket.ticket_id)
+
+    def test_workshop_ids_are_never_reused(self):
+        service = self.open()
+        added = service.add_workshop("Extra Session", "04:00 PM", 10, "Climate Tech Innovations")
+        self.assertGreater(added.w_id, 302)
+        service.remove_workshop(len(service.workshops) - 1)
+        service = self.restart(service)
+        self.assertGreater(service.add_workshop("Another Session", "05:00 PM", 10, "Climate Tech Innovations").w_id,
+                           added.w_id)
+
+
+class AccessMaskTest(ServiceTestCase):
+
+    def test_added_exhibition_grants_its_bit(self):
+        service = self.open()
+        user = self.attendee(service, "a@test.example")
+        self.buy(service, user)
+        policy = service.exhibitions.bit("Green Policy & Governance")
+        self.assertFalse(user.ticket.allows(policy))
+        service.process_payment(user, {'action': 'upgrade', 'upgrade_type': 'add_exh',
+                                       'new_exh': "Green Policy & Governance", 'price': 150})
+        self.assertTrue(user.ticket.allows(policy))
+        self.assertEqual(service.reserve_workshop(user, 201), "Success")
+
+        service.add_exhibition("Ocean Science", "")
+        service = self.restart(service)
+        user = service.attendees.find_by_email("a@test.example")
+        self.assertEqual(service.exhibitions.names_for(user.ticket), ["Climate Tech Innovations", "Green Policy & Governance"])
+        self.assertFalse(user.ticket.allows(service.exhibitions.bit("Ocean Science")))  # A new bit, granted to nobody
+
+
+class SharedDatabaseTest(ServiceTestCase):
+    """Two kiosks on one SQLite database."""
+
+    def test_both_kiosks_tickets_reach_the_sales_columns(self):
+        a, b = self.open(sqlite=True), self.open(sqlite=True)
+        self.buy(a, self.attendee(a, "a@test.example"))
+        self.buy(b, self.attendee(b, "b@test.example"))
+        self.assertEqual(len(a.sales.day(datetime.date.today()).tickets), 2)
+
+    def test_dashboard_counts_both_kiosks_sales(self):
+        a, b = self.open(sqlite=True), self.open(sqlite=True)
+        price = a.config.price_exhibition
+        self.buy(a, self.attendee(a, "a@test.example"))
+        self.buy(b, self.attendee(b, "b@test.example"))
+        self.assertEqual(b.reserve_workshop(b.attendees.find_by_email("b@test.example"), 101), "Success")
+        for service in (a, b):
+            stats = service.dashboard_stats()
+            self.assertEqual((stats.tickets_sold, stats.revenue, stats.total_booked), (2, 2 * price, 1))
+
+    def test_workshop_changes_keep_the_other_kiosks_sessions(self):
+        a, b = self.open(sqlite=True), self.open(sqlite=True)
+        added_a = a.add_workshop("Kiosk A Session", "10:00 AM", 20, "Climate Tech Innovations")
+        added_b = b.add_workshop("Kiosk B Session", "11:00 AM", 20, "Climate Tech Innovations")
+        self.assertEqual(a.remove_workshop(0).w_id, 101)
+        titles = [w.title for w in self.open(sqlite=True).workshops]
+        self.assertIn(added_a.title, titles)
+        self.assertIn(added_b.title, titles)
+        self.assertNotIn("Intro to Climate Data Tools", titles)  # Workshop 101
+
+
+if __name__ == "__main__":
+    unittest.main()
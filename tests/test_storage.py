@@ -0,0 +1,261 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Model import Attendee, Ticket, Config, SalesStats, Exhibition
+from Storage import DataManager, AttendeeCodec, FormatError
+
+# =============================================================================
+#                              STORAGE TESTS
+# =============================================================================
+# Restart tests for DataManager: every session ends with close() and the next one starts from the files.
+#
+#     python -m pytest tests
+
+
+class JournalReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self, **options):
+        """A DataManager with the application's settings (journal, write-behind, 16 shards)."""
+        return DataManager(journal=True, write_behind=True, data_dir=self.data_dir, **options)
+
+    def restart(self, dm, **options):
+        dm.close()
+        return self.open(**options)
+
+    def test_compaction_keeps_records_replayed_from_the_last_session(self):
+        dm = self.open()
+        attendees = dm.load("attendees", [])
+        for i in range(20):  # Registered in the first session: only in the journal
+            a = Attendee(f"User {i}", f"user{i}@test.example", "pw", "0500000000")
+            attendees.append(a)
+            dm.put("attendees", attendees, a)
+
+        dm = self.restart(dm)
+        attendees = dm.load("attendees", [])
+        user = attendees[0]
+        for i in range(dm.snapshot_every):  # Enough changes of one record to compact the journal
+            user.phone = f"05{i:08d}"
+            dm.put("attendees", attendees, user)
+
+        dm = self.restart(dm)
+        attendees = dm.load("attendees", [])
+        dm.close()
+        self.assertEqual(sorted(a.email for a in attendees), sorted(f"user{i}@test.example" for i in range(20)))
+        self.assertEqual(next(a for a in attendees if a.email == user.email).phone, user.phone)
+
+    def test_compaction_keeps_deletions_replayed_from_the_last_session(self):
+        dm = self.open()
+        attendees = [Attendee(f"User {i}", f"user{i}@test.example", "pw", "0500000000") for i in range(20)]
+        dm.save("attendees", attendees)
+        dm.flush()  # The snapshot holds all 20; the deletions below are only in the journal
+        for a in attendees[10:]:
+            dm.delete("attendees", attendees, a.email)
+        del attendees[10:]
+
+        dm = self.restart(dm, snapshot_every=5)
+        attendees = dm.load("attendees", [])
+        for _ in range(5):
+            dm.put("attendees", attendees, attendees[0])
+
+        dm = self.restart(dm)
+        self.assertEqual(len(dm.load("attendees", [])), 10)
+        dm.close()
+
+    def test_replay_survives_a_change_of_shard_count(self):
+        dm = self.open()
+        attendees = []
+        for i in range(20):
+            a = Attendee(f"User {i}", f"user{i}@test.example", "pw", "0500000000")
+            attendees.append(a)
+            dm.put("attendees", attendees, a)
+
+        dm = self.restart(dm, shards=4)  # Re-split on load
+        self.assertEqual(len(dm.load("attendees", [])), 20)
+        dm = self.restart(dm, shards=1)
+        self.assertEqual(len(dm.load("attendees", [])), 20)
+        dm.close()
+
+    def test_damaged_shard_is_not_loaded_as_empty(self):
+        dm = self.open()
+        attendees = [Attendee(f"User {i}", f"user{i}@test.example", "pw", "0500000000") for i in range(20)]
+        dm.save("attendees", attendees)
+        dm = self.restart(dm)
+        path = dm.layout("attendees")[dm.shard_of(attendees[0].email)]
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) // 2)  # Cut off the end of the shard
+        damaged = open(path, "rb").read()
+        with self.assertRaises(FormatError):
+            dm.load("attendees", [])
+        dm.close()
+        self.assertEqual(open(path, "rb").read(), damaged)  # Left as it was for recovery
+
+
+class GroupCommitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dm = DataManager(journal=True, data_dir=self.tmp.name, group_commit=True)
+
+    def tearDown(self):
+        if self.dm:
+            self.dm.close()
+        self.tmp.cleanup()
+
+    def test_failed_write_is_not_reported_durable(self):
+        self.dm.save("config", Config())
+        self.dm.sync()  # Written
+        self.dm._write_snapshot = lambda *args, **kwargs: False  # The disk refuses every snapshot from now on
+        self.dm.save("config", Config())
+        with self.assertRaises(OSError):
+            self.dm.sync()
+        reported = []
+        self.dm.on_durable(reported.append)
+        self.assertIsInstance(reported[0], OSError)
+        with self.assertRaises(OSError):
+            self.dm.flush()
+        with self.assertRaises(OSError):  # Still reported when the application exits
+            self.dm.close()
+        self.dm = None
+
+
+class SharedStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def kiosk(self):
+        dm = DataManager(journal=True, data_dir=self.tmp.name, shared=True)
+        return dm, dm.load("stats", None) or SalesStats()
+
+    def test_kiosks_add_to_the_same_totals(self):
+        dm_a, a = self.kiosk()
+        dm_a.save("stats", a)
+        dm_b, b = self.kiosk()
+        a.on_ticket_purchase(200)
+        dm_a.save("stats", a)
+        b.on_ticket_purchase(500)
+        b.on_reserve()
+        dm_b.save("stats", b)
+        self.assertEqual((b.tickets_sold, b.revenue, b.total_booked), (2, 700, 1))
+        a.on_cancel()  # Not saved yet: kept by the refresh, and merged when saved
+        dm_a.refresh("stats", a)
+        self.assertEqual((a.tickets_sold, a.revenue, a.total_booked), (2, 700, 0))
+        dm_a.save("stats", a)
+        stored = self.kiosk()[1]
+        self.assertEqual((stored.tickets_sold, stored.revenue, stored.total_booked), (2, 700, 0))
+
+
+class SharedAttendeesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def kiosk(self):
+        dm = DataManager(journal=True, data_dir=self.tmp.name, shared=True, snapshot_every=4)
+        return dm, dm.load("attendees", [])
+
+    def register(self, dm, attendees, i):
+        a = Attendee(f"User {i}", f"user{i}@test.example", "pw", "0500000000")
+        attendees.append(a)
+        dm.put("attendees", attendees, a)
+        return a
+
+    def test_compaction_keeps_the_attendees_of_other_kiosks(self):
+        dm_a, a = self.kiosk()
+        dm_b, b = self.kiosk()
+        booked = self.register(dm_b, b, 0)
+        booked.add_reservation(101)
+        dm_b.put("attendees", b, booked)
+        for i in range(1, 9):  # Kiosk A compacts the journal twice without ever loading B's records
+            self.register(dm_a, a, i)
+        dm_b.delete("attendees", b, "user0@test.example")
+        dm_b.put("attendees", b, booked)  # Back again after the compaction
+        dm_a.save("attendees", a)
+
+        stored = {u.email: u for u in self.kiosk()[1]}
+        self.assertEqual(sorted(stored), sorted(f"user{i}@test.example" for i in range(9)))
+        self.assertEqual(stored["user0@test.example"].reservations, [101])
+        dm_a.close()
+        dm_b.close()
+
+
+class AttendeeCodecTest(unittest.TestCase):
+
+    def encode_columns(self, attendees, strings):
+        return AttendeeCodec().columns(attendees, lambda s: strings.setdefault(s, len(strings)))
+
+    def test_round_trip(self):
+        a = Attendee("User", "user@test.example", "pw", "0500000000")
+        a.ticket = Ticket("Exhibition Pass", 200, 0b101, False, "GW-EXH-10000")
+        a.add_reservation(101)
+        b = AttendeeCodec().decode(AttendeeCodec().encode([a]))[0]
+        self.assertEqual((b.email, b.ticket.ticket_id, b.ticket.access_mask, b.reservations),
+                         (a.email, "GW-EXH-10000", 0b101, [101]))
+
+    def test_columns_that_disagree_are_refused(self):
+        a = Attendee("User", "user@test.example", "pw", "0500000000")
+        strings = {}
+        without_ticket = self.encode_columns([a], strings)
+        a.ticket = Ticket("Exhibition Pass", 200, 1, False, "GW-EXH-10000")
+        a.add_reservation(101)
+        with_ticket = self.encode_columns([a], strings)
+        torn = without_ticket[:6] + with_ticket[6:7] + without_ticket[7:]  # A ticket flag but no ticket fields
+        with self.assertRaises(FormatError):
+            AttendeeCodec().build(1, list(strings), torn)
+        torn = without_ticket[:4] + with_ticket[4:5] + without_ticket[5:]  # A reservation count but no IDs
+        with self.assertRaises(FormatError):
+            AttendeeCodec().build(1, list(strings), torn)
+
+
+class DataOnlyFormatTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_small_keys_round_trip_without_pickle(self):
+        dm = DataManager(data_dir=self.tmp.name)
+        config = Config()
+        config.price_exhibition = 250.5
+        exhibitions = [Exhibition("Climate Tech", "Talks"), Exhibition("Policy", "")]
+        exhibitions[0].bit = 3
+        dm.save("config", config)
+        dm.save("exhibitions", exhibitions)
+        dm.save("sequences", {"ticket": 10007, "workshop": 105})
+        for name in ("config.pkl", "exhibitions.pkl", "sequences.pkl"):
+            with open(os.path.join(self.tmp.name, name), "rb") as f:
+                self.assertEqual(f.read(4), b"GWBF")
+
+        dm = DataManager(data_dir=self.tmp.name)
+        self.assertEqual(vars(dm.load("config", None)), vars(config))
+        self.assertEqual([(e.name, e.description, e.bit) for e in dm.load("exhibitions", [])],
+                         [("Climate Tech", "Talks", 3), ("Policy", "", None)])
+        self.assertEqual(dm.load("sequences", {}), {"ticket": 10007, "workshop": 105})
+
+    def test_pickled_config_is_not_loaded(self):
+        DataManager(data_dir=self.tmp.name, binary=False).save("config", Config())  # As older versions wrote it
+        with self.assertRaises(FormatError):
+            DataManager(data_dir=self.tmp.name).load("config", None)
+        self.assertIsInstance(DataManager(data_dir=self.tmp.name, read_pickle=True).load("config", None), Config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,8 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import messagebox, ttk, filedialog
 import pickle
 import os
 import datetime
-from Model import Exhibition, Workshop
 import re
 
 # =============================================================================
@@ -55,6 +54,13 @@ class StartPage(BaseFrame):
         tk.Button(btn_frame, text="LOGIN", width=15, height=2, bg="#87CEEB",
                   command=lambda: controller.show_frame("LoginPage")).pack(side="left", padx=20)  # Login Button
 
+        self.lbl_loading = tk.Label(self, text="", font=("Arial", 9), fg="gray")  # Attendee data loading status
+        self.lbl_loading.pack()  # Pack below the buttons
+
+    def show_load_progress(self, percent, done):
+        """Called by the controller while the attendee records are loaded in the background."""
+        self.lbl_loading.config(text="" if done else f"Loading attendee records... {percent}%")  # Hide when finished
+
 
 # --- STEP 2: AUTH ---
 class RegisterPage(BaseFrame):
@@ -142,34 +148,18 @@ class RegisterPage(BaseFrame):
             messagebox.showerror("Error", "All fields are required.")  # Show error popup
             return  # Stop execution
 
-        # 2. Validate Name (Letters/Spaces only)
-        if not re.match(r"^[a-zA-Z\s]+$", name):  # Use regex to ensure name contains only letters and spaces
-            messagebox.showerror("Error", "Name must contain only letters.")  # Show error popup
-            return  # Stop execution
-
-        # 3. Validate Phone (Digits only, length 8-15)
-        if not (phone.isdigit() and 8 <= len(phone) <= 15):  # Check if phone is numeric and within length range
-            messagebox.showerror("Error", "Phone must be 8-15 digits.")  # Show error popup
-            return  # Stop execution
-
-        # 4. Validate Email Format
-        if not re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email):  # Use regex to validate standard email format
-            messagebox.showerror("Error", "Invalid Email Format.")  # Show error popup
-            return  # Stop execution
-
-        # --- NEW CHECK: PASSWORD LENGTH ---
-        if len(pwd) < 4:  # Check if password is too short
-            messagebox.showerror("Error", "Password must be at least 4 characters long.")  # Show error popup
-            return  # Stop execution
-
-        # 5. Password Match
+        # 2. Password Match
         if pwd != conf:  # Check if password and confirmation match exactly
             messagebox.showerror("Error", "Passwords do not match!")  # Show error popup
             return  # Stop execution
 
-        # 6. Attempt Registration
-        if self.controller.register_user(name, email, pwd,
-                                         phone):  # Call controller to register; returns True if successful
+        # 3. Attempt Registration (the service checks the name, phone, email and password rules)
+        try:
+            registered = self.controller.register_user(name, email, pwd, phone)  # True if successful
+        except ValueError as e:  # A field broke one of the rules
+            messagebox.showerror("Error", str(e))  # Show the service's message
+            return  # Stop execution
+        if registered:
             messagebox.showinfo("Success", "Account created successfully!")  # Show success popup
             self.controller.show_frame("LoginPage")  # Navigate to Login Page
         else:
@@ -611,7 +601,12 @@ class PaymentPage(BaseFrame):
             messagebox.showerror("Error", "Invalid Expiry Date.\nFormat must be MM/YY (e.g., 04/26)")  # Error popup
             return  # Stop execution
 
-        if self.controller.process_payment():  # Execute payment logic in controller; returns True on success
+        try:
+            paid = self.controller.process_payment()  # Execute payment logic in controller; returns True on success
+        except ValueError as e:  # e.g. the exhibition was deleted meanwhile; nothing was charged
+            messagebox.showerror("Error", str(e))  # Error popup
+            return  # Stop execution
+        if paid:
             messagebox.showinfo("Approved", "Transaction Successful.\nYour pass has been updated.")  # Success popup
             self.controller.show_frame("AttendeeDashboard")  # Return to Dashboard
 
@@ -707,8 +702,8 @@ class ManageWorkshopsPage(BaseFrame):
         u = self.controller.current_user  # Get current user
         if not u or not u.ticket: return  # If no user/ticket, do nothing
 
-        for w in self.controller.workshops:  # Iterate through all workshops
-            booked = any(r.w_id == w.w_id for r in u.reservations)  # Check if user booked this specific workshop
+        for w in self.controller.service.live_workshops():  # Iterate through all workshops (current seat counts)
+            booked = u.has_reservation(w.w_id)  # Check if user booked this specific workshop
 
             # Status Text Logic
             if booked:  # If user has booked this
@@ -719,7 +714,7 @@ class ManageWorkshopsPage(BaseFrame):
                 status = f"{w.booked}/{w.capacity} Open"  # Show availability count
 
             # Show if allowed (or if booked, so they can see it to cancel)
-            if w.exhibition_name in u.ticket.exhibitions_allowed or booked:  # Check permission based on ticket
+            if u.ticket.allows(self.controller.exhibitions.bit(w.exhibition_name)) or booked:  # Check permission based on ticket
                 self.tree.insert("", "end", values=(w.title, w.time, status), tags=(str(w.w_id),))  # Insert row
 
     def reserve(self):
@@ -827,7 +822,7 @@ class UpgradeTicketPage(BaseFrame):
         t = u.ticket  # Get ticket object
 
         # Display Current
-        status_text = f"• Type: {t.ticket_type}\n• Access: {len(t.exhibitions_allowed)} Exhibition(s)"  # Format status
+        status_text = f"• Type: {t.ticket_type}\n• Access: {len(self.controller.exhibitions.names_for(t))} Exhibition(s)"  # Format status
         self.lbl_current.config(text=status_text, fg="#333")  # Update label
 
         # Logic
@@ -990,12 +985,13 @@ class HistoryPage(BaseFrame):
         self.lbl_date.config(text=str(t.purchase_date))  # Set Purchase Date
 
         # Exhibitions List
-        exh_list = "\n".join([f"• {e}" for e in t.exhibitions_allowed])  # Create bulleted list
+        exh_list = "\n".join([f"• {e}" for e in self.controller.exhibitions.names_for(t)])  # Create bulleted list
         self.lbl_exh.config(text=exh_list)  # Set Text
 
         # Workshops List
-        if u.reservations:  # Check reservations
-            ws_list = "\n".join([f"• {r.title}" for r in u.reservations])  # Create bulleted list
+        reserved = self.controller.workshops.resolve(u.reservations)  # Look up the live workshop records
+        if reserved:  # Check reservations
+            ws_list = "\n".join([f"• {r.title}" for r in reserved])  # Create bulleted list
         else:
             ws_list = "(No reservations)"  # Fallback text
         self.lbl_ws.config(text=ws_list)  # Set Text
@@ -1100,12 +1096,8 @@ class UpdateProfilePage(BaseFrame):
 
         # 5. Save Changes
         u = self.controller.current_user  # Get Current User Object
-        u.name = new_name  # Update Name
-        u.phone = new_phone  # Update Phone
-        if new_pass:  # Only update password if user entered a new one
-            u.password = new_pass  # Update Password
-
-        self.controller.dm.save("attendees", self.controller.attendees)  # Save to File
+        self.controller.service.update_profile(u, new_name, new_phone,
+                                               new_pass)  # Update and save (password only if one was entered)
         messagebox.showinfo("Success", "Profile Updated Successfully.")  # Success
 
 # =============================================================================
@@ -1211,18 +1203,12 @@ class AdminDashboard(BaseFrame):
         """
         Refreshes the dashboard statistics (Sales, Revenue) in real-time.
         """
-        # Calculate Stats
-        attendees = self.controller.attendees  # Get list of all users
-        sold = sum(1 for a in attendees if a.ticket)  # Count users who have a ticket
-        revenue = sum(a.ticket.price for a in attendees if a.ticket)  # Sum the price of all sold tickets
-
-        total_cap = sum(w.capacity for w in self.controller.workshops)  # Calculate total workshop seats available
-        total_booked = sum(w.booked for w in self.controller.workshops)  # Calculate total seats currently taken
-        avg_load = int((total_booked / total_cap) * 100) if total_cap > 0 else 0  # Calculate percentage load
+        # Read the running totals (kept up to date by the controller, no scan needed)
+        stats = self.controller.stats  # Get the aggregates object
 
-        self.lbl_sold.config(text=str(sold))  # Update Sales Label
-        self.lbl_rev.config(text=f"AED {revenue}")  # Update Revenue Label
-        self.lbl_cap.config(text=f"{avg_load}%")  # Update Load Label
+        self.lbl_sold.config(text=str(stats.tickets_sold))  # Update Sales Label
+        self.lbl_rev.config(text=f"AED {stats.revenue}")  # Update Revenue Label
+        self.lbl_cap.config(text=f"{stats.load_percent()}%")  # Update Load Label
 
 class AdminSalesPage(BaseFrame):
     """
@@ -1262,6 +1248,10 @@ class AdminSalesPage(BaseFrame):
         self.e_date.insert(0, str(datetime.date.today()))  # Default to Today's date
         self.e_date.pack(side="left", padx=10)  # Pack Entry
 
+        tk.Label(control_frame, text="To (optional):", font=("Arial", 10), bg="white").pack(side="left")  # Range Label
+        self.e_end = tk.Entry(control_frame, font=("Arial", 10), width=15, bd=1, relief="solid")  # End Date Entry
+        self.e_end.pack(side="left", padx=10)  # Pack Entry
+
         tk.Button(control_frame, text="Generate", font=("Arial", 9, "bold"), width=12,
                   bg="#e1e1e1", relief="raised", bd=2, command=self.gen).pack(side="left")  # Generate Button
 
@@ -1278,64 +1268,39 @@ class AdminSalesPage(BaseFrame):
 
     def gen(self):
         """
-        Filters attendees by the selected purchase date and generates a formatted text report.
+        Looks up the selected purchase date (or date range) in the sales index and generates a formatted text report.
         """
         date_str = self.e_date.get().strip()  # Get Date Input
+        end_str = self.e_end.get().strip()  # Get optional End Date Input
 
         # 1. Validate Date Format (YYYY-MM-DD)
-        if not re.match(r"^\d{4}-\d{2}-\d{2}$", date_str):  # Regex check for date format
+        try:
+            if not re.match(r"^\d{4}-\d{2}-\d{2}$", date_str) or (
+                    end_str and not re.match(r"^\d{4}-\d{2}-\d{2}$", end_str)):  # Regex check for date format
+                raise ValueError
+            start = datetime.date.fromisoformat(date_str)  # Convert to a date (rejects e.g. month 13)
+            end = datetime.date.fromisoformat(end_str) if end_str else start  # Single day when no end date
+        except ValueError:
             messagebox.showerror("Format Error", "Invalid Date Format.\nPlease use YYYY-MM-DD (e.g., 2026-04-15).")  # Error Popup
             return  # Stop
 
-        # 2. Filter Logic
-        sold = [a for a in self.controller.attendees if a.ticket and str(a.ticket.purchase_date) == date_str]  # Filter List
+        # 2. Index Lookup (only the tickets of the requested days are touched)
+        report = self.controller.service.sales_report(start, end if end_str else None)  # Formatted text or None
+        label = f"{date_str} to {end_str}" if end_str else date_str  # Period label for the 'No Data' message
 
         self.txt_report.delete("1.0", tk.END)  # Clear previous report
 
-        if not sold:  # If list is empty
-            self.txt_report.insert(tk.END, f"\n   NO RECORDS FOUND FOR DATE: {date_str}\n")  # Show 'No Data' message
+        if report is None:  # If nothing was sold
+            self.txt_report.insert(tk.END, f"\n   NO RECORDS FOUND FOR DATE: {label}\n")  # Show 'No Data' message
             return  # Stop
 
-        # Stats Calculation
-        rev = sum(a.ticket.price for a in sold)  # Sum revenue
-        count_exh = sum(1 for a in sold if a.ticket.ticket_type == "Exhibition Pass")  # Count standard tickets
-        count_all = sum(1 for a in sold if a.ticket.ticket_type == "All-Access")  # Count premium tickets
-
-        # Layout Construction
-        sep = "=" * 60  # Separator line
-        thin = "-" * 60  # Thin separator line
-
-
-        report = (
-            f"{sep}\n"
-            f" GREENWAVE CONFERENCE - DAILY SALES REPORT\n"
-            f" Date: {date_str}\n"
-            f"{sep}\n\n"
-            f" SUMMARY:\n"
-            f" {thin}\n"
-            f" Total Transactions   : {len(sold)}\n"
-            f" Total Revenue        : AED {rev}\n"
-            f" Exhibition Passes    : {count_exh}\n"
-            f" All-Access Passes    : {count_all}\n"
-            f" {thin}\n\n"
-            f" LOG:\n"
-            f" {thin}\n"
-            f" {'TICKET ID':<20} | {'TYPE':<15} | {'PRICE'}\n"
-            f" {thin}\n"
-        )  # Build the header string
-
-        for a in sold:  # Loop through sold tickets
-            t_type = "Exhibition" if a.ticket.ticket_type == "Exhibition Pass" else "All-Access"  # Shorten type name
-            report += f" {a.ticket.ticket_id:<20} | {t_type:<15} | AED {a.ticket.price}\n"  # Append row
-
-        report += f" {thin}\n"  # Append footer line
-
         self.txt_report.insert(tk.END, report)  # Insert generated text into the widget
 
     def update_data(self):
         """Resets date to today and clears previous reports."""
         self.e_date.delete(0, tk.END)
         self.e_date.insert(0, str(datetime.date.today()))
+        self.e_end.delete(0, tk.END)
         self.txt_report.delete("1.0", tk.END)
 
 
@@ -1447,7 +1412,7 @@ class AdminPricingPage(BaseFrame):
 
             # Save if changes were made
             if changed:  # If anything changed
-                self.controller.dm.save("config", c)  # Save to file
+                self.controller.service.save_config()  # Save to file
                 messagebox.showinfo("Success", "Prices Updated Successfully")  # Success
                 self.update_data()  # Refresh UI
             else:
@@ -1530,8 +1495,7 @@ class AdminExhibitionsPage(BaseFrame):
         """
         n, d = self.e_name.get().strip(), self.e_desc.get().strip()  # Get Inputs
         if n and d:  # Check valid
-            self.controller.exhibitions.append(Exhibition(n, d))  # Create object
-            self.controller.dm.save("exhibitions", self.controller.exhibitions)  # Save
+            self.controller.service.add_exhibition(n, d)  # Create and save
             self.update_data()  # Refresh
             self.e_name.delete(0, tk.END)  # Clear field
             self.e_desc.delete(0, tk.END)  # Clear field
@@ -1552,18 +1516,31 @@ class AdminExhibitionsPage(BaseFrame):
 
         # --- SAFETY CHECK ---
         # Check if any user holds a ticket for this exhibition
-        for user in self.controller.attendees:  # Loop users
-            if user.ticket and name in user.ticket.exhibitions_allowed:  # Check usage
-                messagebox.showerror("Action Denied",
-                                     f"Cannot delete '{name}'.\n\nIt is currently active on user tickets.\nYou must refund or upgrade those users first.")  # Error
-                return  # Stop
+        count = self.controller.service.exhibition_holder_count(name)  # Tickets holding it (O(1))
+        if count:  # In use
+            if messagebox.askyesno("Action Denied",
+                                   f"Cannot delete '{name}'.\n\nIt is currently active on {count} user ticket(s).\nYou must refund or upgrade those users first.\n\nShow the affected attendees?"):  # Error
+                self.show_holders(name)  # List them on demand
+            return  # Stop
         # --------------------
 
         if messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete '{name}'?"):  # Confirm
-            self.controller.exhibitions.pop(index)  # Remove
-            self.controller.dm.save("exhibitions", self.controller.exhibitions)  # Save
+            try:
+                self.controller.service.remove_exhibition(index)  # Remove and save
+            except ValueError as e:  # A pass was bought for it in the meantime
+                messagebox.showerror("Action Denied", str(e))
             self.update_data()  # Refresh
 
+    def show_holders(self, name, limit=30):
+        """
+        Shows the attendees whose ticket includes the exhibition 'name' (the first 'limit' of them).
+        """
+        holders = self.controller.service.exhibition_holders(name)  # Walk the attendees once
+        lines = [f"{u.name} <{u.email}> - {u.ticket.ticket_id}" for u in holders[:limit]]  # One line each
+        if len(holders) > limit:
+            lines.append(f"... and {len(holders) - limit} more")
+        messagebox.showinfo(f"Ticket Holders - {name}", "\n".join(lines) or "No ticket holders.")  # Show list
+
 
 class AdminWorkshopsPage(BaseFrame):
     """
@@ -1624,8 +1601,14 @@ class AdminWorkshopsPage(BaseFrame):
         self.lst.pack(side="left", fill="both", expand=True)  # Pack Listbox
         scrollbar.config(command=self.lst.yview)  # Link Scrollbar
 
-        tk.Button(content, text="Delete Selected", bg="#e1e1e1", relief="raised", bd=2,
-                  command=self.rem).pack(anchor="e", pady=5)  # Delete Button
+        btn_row = tk.Frame(content, bg="white")  # Buttons under the list
+        btn_row.pack(fill="x", pady=5)  # Pack Button Row
+        tk.Button(btn_row, text="Delete Selected", bg="#e1e1e1", relief="raised", bd=2,
+                  command=self.rem).pack(side="right")  # Delete Button
+        tk.Button(btn_row, text="Import CSV...", bg="#e1e1e1", relief="raised", bd=2,
+                  command=self.import_csv).pack(side="right", padx=5)  # Bulk Import Button
+        tk.Button(btn_row, text="Export Roster...", bg="#e1e1e1", relief="raised", bd=2,
+                  command=self.export_roster).pack(side="left")  # Roster Export Button
 
         # ==========================
         # SECTION 2: ADD NEW (Compact)
@@ -1690,10 +1673,7 @@ class AdminWorkshopsPage(BaseFrame):
         try:
             t, ti, cap = self.e_t.get(), self.e_ti.get(), self.e_c.get()  # Get Inputs
             if t and ti and cap:  # Check valid
-                wid = len(self.controller.workshops) + 101  # Generate ID
-                w = Workshop(wid, t, ti, int(cap), self.exh_var.get())  # Create Object
-                self.controller.workshops.append(w)  # Add to list
-                self.controller.dm.save("workshops", self.controller.workshops)  # Save
+                self.controller.service.add_workshop(t, ti, int(cap), self.exh_var.get())  # Create and save
                 self.update_data()  # Refresh
                 self.e_t.delete(0, tk.END);  # Clear Field
                 self.e_ti.delete(0, tk.END);  # Clear Field
@@ -1703,6 +1683,44 @@ class AdminWorkshopsPage(BaseFrame):
         except ValueError:
             messagebox.showerror("Error", "Capacity must be a number")  # Error
 
+    def import_csv(self):
+        """
+        Adds a whole schedule from a CSV file (columns: title, time, capacity, exhibition).
+        """
+        path = filedialog.askopenfilename(title="Import Schedule",
+                                          filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])  # Pick File
+        if not path:  # Cancelled
+            return  # Stop
+        try:
+            added = self.controller.service.import_schedule(path)  # Validate and add all sessions
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import Error", str(e))  # Error
+            return  # Stop
+        messagebox.showinfo("Import", f"{len(added)} session(s) added.")  # Success
+        self.update_data()  # Refresh
+
+    def export_roster(self):
+        """
+        Saves the list of attendees booked on the selected workshop as a CSV file.
+        """
+        sel = self.lst.curselection()  # Get selection
+        if not sel:  # Check selection
+            messagebox.showwarning("Selection Error", "Please select a workshop.")  # Warning
+            return  # Stop
+
+        w = self.controller.workshops[sel[0]]  # Get object
+        path = filedialog.asksaveasfilename(title="Export Roster", defaultextension=".csv",
+                                            initialfile=f"roster_{w.w_id}.csv",
+                                            filetypes=[("CSV files", "*.csv")])  # Pick File
+        if not path:  # Cancelled
+            return  # Stop
+        try:
+            count = self.controller.service.export_roster(w.w_id, path)  # Write the file
+        except OSError as e:
+            messagebox.showerror("Export Error", str(e))  # Error
+            return  # Stop
+        messagebox.showinfo("Export", f"{count} attendee(s) written to\n{path}")  # Success
+
     def rem(self):
         """
         Removes a workshop, blocking deletion if bookings exist.
@@ -1718,25 +1736,20 @@ class AdminWorkshopsPage(BaseFrame):
             target_w = self.controller.workshops[wid_index]  # Get object
 
             # Check usage
-            active_users = 0  # Counter
-            for u in self.controller.attendees:  # Loop users
-                for r in u.reservations:  # Loop reservations
-                    if r.w_id == target_w.w_id:  # Check ID
-                        active_users += 1  # Increment
+            active_users = self.controller.service.workshop_booking_count(target_w.w_id)  # Count bookings
 
             if active_users > 0:  # If used
                 messagebox.showerror("Action Denied", f"Cannot delete.\n{active_users} user(s) have booked this.")  # Error
                 return  # Stop
 
             if messagebox.askyesno("Confirm", "Delete this workshop?"):  # Confirm
-                self.controller.workshops.pop(wid_index)  # Remove
-                self.controller.dm.save("workshops", self.controller.workshops)  # Save
+                self.controller.service.remove_workshop(wid_index)  # Remove and save
                 self.update_data()  # Refresh
 
 
 class AdminUserUpgradePage(BaseFrame):
     """
-    Administrator tool to search for a user by email and manually apply a VIP upgrade.
+    Administrator tool to search for a user by email or ticket ID and manually apply a VIP upgrade.
     Useful for customer support or complimentary upgrades.
     """
     def __init__(self, parent, controller):
@@ -1766,7 +1779,7 @@ class AdminUserUpgradePage(BaseFrame):
         f_s = tk.Frame(grp_search, bg="white", padx=10, pady=10)  # Inner Frame
         f_s.pack(fill="x")  # Pack Inner Frame
 
-        tk.Label(f_s, text="Email Address:", bg="white").pack(side="left")  # Label
+        tk.Label(f_s, text="Email or Ticket ID:", bg="white").pack(side="left")  # Label
         self.e_mail = tk.Entry(f_s, width=30, bd=1, relief="solid")  # Entry
         self.e_mail.pack(side="left", padx=10)  # Pack Entry
         tk.Button(f_s, text="Find", bg="#e1e1e1", width=8, relief="raised", bd=2, command=self.search).pack(
@@ -1781,7 +1794,7 @@ class AdminUserUpgradePage(BaseFrame):
         self.res_content = tk.Frame(self.grp_result, bg="white")  # Dynamic Content Frame
         self.res_content.pack(fill="both", expand=True, padx=20, pady=10)  # Pack Content Frame
 
-        self.lbl_info = tk.Label(self.res_content, text="Enter an email above to search.", bg="white",
+        self.lbl_info = tk.Label(self.res_content, text="Enter an email or ticket ID above to search.", bg="white",
                                  fg="#555")  # Info Label
         self.lbl_info.pack()  # Pack Label
 
@@ -1797,11 +1810,12 @@ class AdminUserUpgradePage(BaseFrame):
 
     def search(self):
         """
-        Finds a user by email and displays their current ticket status.
+        Finds a user by email or ticket ID and displays their current ticket status.
         """
         self.btn_upgrade.pack_forget()  # Hide button
-        email = self.e_mail.get()  # Get email
-        self.target_user = next((u for u in self.controller.attendees if u.email == email), None)  # Search user
+        query = self.e_mail.get()  # Get email or ticket ID
+        attendees = self.controller.attendees
+        self.target_user = attendees.find_by_email(query) or attendees.find_by_ticket(query)  # Look up both indexes
 
         if not self.target_user:  # Check found
             self.lbl_info.config(text="User not found.")  # Update text
@@ -1810,7 +1824,7 @@ class AdminUserUpgradePage(BaseFrame):
         # Show info
         t_status = "No Ticket"  # Default status
         if self.target_user.ticket:  # Check ticket
-            t_status = self.target_user.ticket.ticket_type  # Get type
+            t_status = f"{self.target_user.ticket.ticket_type} ({self.target_user.ticket.ticket_id})"  # Get type and ID
 
         info = f"Name: {self.target_user.name}\nEmail: {self.target_user.email}\nCurrent Pass: {t_status}"  # Format info
         self.lbl_info.config(text=info)  # Update label
@@ -1825,19 +1839,14 @@ class AdminUserUpgradePage(BaseFrame):
         """
         Applies the All-Access upgrade to the found user.
         """
-        if self.target_user and self.target_user.ticket:  # Validate
-            self.target_user.ticket.ticket_type = "All-Access"  # Change type
-            # Grant full access
-            self.target_user.ticket.exhibitions_allowed = [e.name for e in self.controller.exhibitions]  # Update scope
-
-            self.controller.dm.save("attendees", self.controller.attendees)  # Save
+        if self.controller.service.comp_upgrade(self.target_user):  # Upgrade and save (False without a ticket)
             messagebox.showinfo("Success", "User upgraded successfully.")  # Success
             self.search()  # Refresh
 
     def update_data(self):
         """Resets the search form when the page is opened."""
         self.e_mail.delete(0, tk.END)
-        self.lbl_info.config(text="Enter an email above to search.")
+        self.lbl_info.config(text="Enter an email or ticket ID above to search.")
         self.btn_upgrade.pack_forget()
         self.target_user = None
 